@@ -0,0 +1,80 @@
+"""
+Compare per-call latency of one-shot requests against the pooled OpenDicClient session.
+
+A local stand-in server answers the OAuth token call and a small GET listing, so the
+numbers only reflect connection handling on this machine (no TLS).
+
+Usage:
+    uv run python benchmarks/bench_connection_pool.py [n_calls]
+"""
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from pyspark_opendic.client import OpenDicClient
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    disable_nagle_algorithm = True  # Headers and body are written separately
+
+    def _reply(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply({"access_token": "bench_token", "expires_in": 3600})
+
+    def do_GET(self):
+        self._reply([{"type": "function", "name": f"f{i}"} for i in range(10)])
+
+    def log_message(self, *args):
+        pass
+
+
+def timed(fn, n_calls: int) -> list[float]:
+    samples = []
+    for _ in range(n_calls):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<12} mean={statistics.mean(samples):.3f}ms p50={statistics.median(samples):.3f}ms p95={p95:.3f}ms")
+
+
+def main(n_calls: int = 500) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        url = api_url + "/opendic/v1/objects/function"
+        one_shot = timed(lambda: requests.get(url, headers={"Authorization": "Bearer bench_token"}).json(), n_calls)
+
+        with OpenDicClient(api_url, "bench:bench") as client:
+            pooled = timed(lambda: client.get("/objects/function"), n_calls)
+
+        print(f"{n_calls} GET calls against {api_url}")
+        report("one-shot", one_shot)
+        report("pooled", pooled)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
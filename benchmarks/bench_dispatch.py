@@ -0,0 +1,56 @@
+"""
+Microbenchmark of statement dispatch in OpenDicCatalog.sql: the old sequential scan over all
+compiled OpenDic patterns versus OpenDicParser, which rejects native SQL from its leading keywords
+and parses OpenDic commands in one pass, decoding the embedded JSON as well.
+
+Usage:
+    uv run python benchmarks/bench_dispatch.py [n_iterations]
+"""
+import sys
+import timeit
+
+from pyspark_opendic.patterns.opendic_parser import OpenDicParser
+from pyspark_opendic.patterns.opendic_patterns import OpenDicPatterns
+
+STATEMENTS = {
+    "native select": "SELECT id, name FROM sales.orders WHERE amount > 100 ORDER BY id",
+    "native create": "CREATE TABLE IF NOT EXISTS sales.orders (id INT, name STRING) USING parquet",
+    "create": 'CREATE OPEN function my_function PROPS { "language": "sql", "definition": "SELECT 1" }',
+    "create_batch": 'CREATE OPEN BATCH function OBJECTS [{ "name": "f1", "definition": "SELECT 1" }]',
+    "alter": 'ALTER OPEN function my_function PROPS { "version": "2.0" }',
+    "show_types": "SHOW OPEN TYPES",
+    "show_platforms_all": "SHOW OPEN PLATFORMS",
+    "show_mappings_for_platform": "SHOW OPEN MAPPINGS FOR spark",
+    "drop_mapping_for_platform": "DROP OPEN MAPPING FOR spark",
+    "show": "SHOW OPEN function",
+    "show_mapping_for_object_and_platform": "SHOW OPEN MAPPING function PLATFORM spark",
+    "show_platforms_for_object": "SHOW OPEN PLATFORMS FOR function",
+    "sync_all": "SYNC OPEN OBJECTS FOR spark",
+    "sync": "SYNC OPEN function FOR spark",
+    "define": 'DEFINE OPEN function PROPS { "language": "string", "definition": "string" }',
+    "drop": "DROP OPEN function",
+    "add_mapping": 'ADD OPEN MAPPING function PLATFORM spark SYNTAX { "CREATE FUNCTION {name}" } PROPS { "def": {"propType": "string", "format": "<value>", "delimiter": ""} }',
+}
+
+
+def sequential(patterns, sql_cleaned):
+    for command_type, pattern in patterns:
+        match = pattern.match(sql_cleaned)
+        if match:
+            return command_type, match
+    return None
+
+
+def main(n_iterations: int = 20000) -> None:
+    patterns = OpenDicPatterns.compiled_patterns()
+    parser = OpenDicParser()
+
+    print(f"{'statement':<38} {'sequential':>12} {'parser':>12} {'speedup':>8}")
+    for label, statement in STATEMENTS.items():
+        old = timeit.timeit(lambda: sequential(patterns, statement), number=n_iterations) / n_iterations * 1e6
+        new = timeit.timeit(lambda: parser.parse(statement), number=n_iterations) / n_iterations * 1e6
+        print(f"{label:<38} {old:>10.2f}us {new:>10.2f}us {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,51 @@
+"""
+Benchmark of building payloads and reading pull responses for many objects: one pydantic model per
+item (the old path) versus one cached TypeAdapter call for the whole list, and the trusted path that
+builds the Udo dicts without pydantic. Pulled statements come from the server, so they have no trusted path.
+
+Usage:
+    uv run python benchmarks/bench_models.py [n_objects]
+"""
+import sys
+import time
+
+from pyspark_opendic.model.adapters import statements_from, udo_dicts
+from pyspark_opendic.model.openapi_models import Statement, Udo
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main(n_objects: int = 100_000) -> None:
+    named_props = [(f"f{i}", {"language": "sql", "definition": f"SELECT {i}", "args": {"x": "int"}}) for i in range(n_objects)]
+    pulled = [{"definition": f"CREATE OR REPLACE FUNCTION f{i}(x INT) RETURN x + {i}"} for i in range(n_objects)]
+
+    cases = {
+        "Udo payloads": (
+            lambda: [Udo(type="function", name=name, props=props).model_dump() for name, props in named_props],
+            lambda: udo_dicts("function", named_props),
+            lambda: udo_dicts("function", named_props, trusted=True),
+        ),
+        "pulled statements": (
+            lambda: [Statement.model_validate(item) for item in pulled],
+            lambda: statements_from(pulled),
+            None,
+        ),
+    }
+
+    print(f"{n_objects} objects")
+    print(f"{'':<20} {'per item':>10} {'adapter':>10} {'speedup':>8} {'trusted':>10} {'speedup':>8}")
+    for label, (per_item, adapter, trusted) in cases.items():
+        old, new = timed(per_item), timed(adapter)
+        line = f"{label:<20} {old * 1000:>8.1f}ms {new * 1000:>8.1f}ms {old / new:>7.1f}x"
+        if trusted is not None:
+            fast = timed(trusted)
+            line += f" {fast * 1000:>8.1f}ms {old / fast:>7.1f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
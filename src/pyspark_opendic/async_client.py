@@ -0,0 +1,63 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from pyspark_opendic.client import OpenDicClient
+
+T = TypeVar("T")
+
+
+class AsyncOpenDicClient:
+    """
+    asyncio front-end for OpenDicClient.
+
+    Requests run on a bounded thread pool over the wrapped client's keep-alive session, so up to
+    `max_in_flight` requests are on the wire at once while they share the client's token manager,
+    retry policy and caches. Awaiting many calls with asyncio.gather() pipelines them.
+    """
+
+    def __init__(self, client: OpenDicClient, max_in_flight: int = 8):
+        """
+        Args:
+            client (OpenDicClient): The client requests are sent through.
+            max_in_flight (int): Maximum number of concurrent requests.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.client = client
+        self.max_in_flight = max_in_flight
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="opendic")
+
+    @classmethod
+    def create(cls, api_url: str, credentials: str, max_in_flight: int = 8, **client_options) -> "AsyncOpenDicClient":
+        """Build the wrapped OpenDicClient with a connection pool large enough for max_in_flight."""
+        client_options.setdefault("pool_maxsize", max(10, max_in_flight))
+        return cls(OpenDicClient(api_url, credentials, **client_options), max_in_flight)
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking callable on the client's thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def get(self, endpoint: str):
+        return await self.run(self.client.get, endpoint)
+
+    async def post(self, endpoint: str, data: dict, replay_safe: bool = False) -> dict[str, Any]:
+        return await self.run(self.client.post, endpoint, data, replay_safe=replay_safe)
+
+    async def put(self, endpoint: str, data: dict) -> dict[str, Any]:
+        return await self.run(self.client.put, endpoint, data)
+
+    async def delete(self, endpoint: str) -> dict[str, Any]:
+        return await self.run(self.client.delete, endpoint)
+
+    def close(self) -> None:
+        """Stop the thread pool. The wrapped client stays open."""
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "AsyncOpenDicClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,165 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+from pyspark_opendic.client import OpenDicClient
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def bounded_map(fn: Callable[[T], R], items: Iterable[T], max_in_flight: int) -> Iterator[tuple[T, Optional[R], Optional[Exception]]]:
+    """
+    Apply `fn` to every item on a thread pool and yield (item, result, error) as calls complete.
+
+    Items are pulled from the iterable only when a slot frees up, so at most `max_in_flight` items
+    are held (and sent) at once no matter how long the input is. Exceptions are yielded, not raised.
+    """
+    def outcome(item, future):
+        error = future.exception()
+        return item, (None if error else future.result()), error
+
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="opendic-batch") as executor:
+        pending = {}
+        for item in items:
+            if len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield outcome(pending.pop(future), future)
+            pending[executor.submit(fn, item)] = item
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield outcome(pending.pop(future), future)
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Split an iterable into lists of at most `size` items, consuming it lazily."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+@dataclass
+class ObjectResult:
+    name: str
+    status: str  # "succeeded", "failed" or "rejected" (invalid locally, never sent)
+    response: Any = None
+    error: Optional[Exception] = None
+
+
+def send_each(fn: Callable[[T], Any], named_items: Iterable[tuple[str, T]], max_in_flight: int) -> list[ObjectResult]:
+    """
+    Send one request per object with `fn`, up to `max_in_flight` at a time.
+
+    Returns:
+        list[ObjectResult]: One result per (name, item), in input order. A failed request does not stop the others.
+    """
+    indexed = ((position, name, item) for position, (name, item) in enumerate(named_items))
+    results = {}
+    for (position, name, _), response, error in bounded_map(lambda entry: fn(entry[2]), indexed, max_in_flight):
+        results[position] = ObjectResult(name, "failed" if error else "succeeded", response=response, error=error)
+    return [results[position] for position in sorted(results)]
+
+
+@dataclass
+class ChunkResult:
+    index: int
+    names: list[str]
+    status: str  # "succeeded" or "failed"
+    response: Any = None
+    error: Optional[Exception] = None
+    # Payloads are only kept for failed chunks, so they can be retried without holding the whole batch
+    objects: Optional[list[dict[str, Any]]] = None
+
+
+@dataclass
+class BatchReport:
+    object_type: str
+    chunks: list[ChunkResult] = field(default_factory=list)
+    # Set if reading the input failed part-way; the chunks read before that were still sent
+    source_error: Optional[Exception] = None
+    # Objects left out of the chunks because they failed validation before sending
+    rejected: list[ObjectResult] = field(default_factory=list)
+
+    @property
+    def failed_chunks(self) -> list[ChunkResult]:
+        return [chunk for chunk in self.chunks if chunk.status == "failed"]
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.failed_chunks and self.source_error is None and not self.rejected
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "chunks": len(self.chunks),
+            "failed_chunks": len(self.failed_chunks),
+            "objects": sum(len(chunk.names) for chunk in self.chunks),
+            "failed_objects": sum(len(chunk.names) for chunk in self.failed_chunks),
+            "rejected_objects": len(self.rejected),
+        }
+
+    def object_rows(self) -> list[dict[str, Any]]:
+        """One row per object with the outcome of the chunk it was sent in, then the rejected objects."""
+        return [
+            {"name": name, "chunk": chunk.index, "status": chunk.status, "error": str(chunk.error) if chunk.error else None}
+            for chunk in self.chunks
+            for name in chunk.names
+        ] + [{"name": result.name, "chunk": None, "status": result.status, "error": str(result.error)} for result in self.rejected]
+
+
+class BatchUploader:
+    """
+    Uploads CREATE OPEN BATCH payloads in chunks of `chunk_size` objects, with up to `max_in_flight`
+    chunk requests running concurrently. One failing chunk does not fail the others; the returned
+    BatchReport records the outcome of every chunk and can be passed to `retry_failed`.
+    """
+
+    def __init__(self, client: OpenDicClient, chunk_size: int = 500, max_in_flight: int = 4):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.client = client
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+
+    def upload(self, object_type: str, udo_payloads: Iterable[dict[str, Any]]) -> BatchReport:
+        """
+        Args:
+            object_type (str): Type of all objects in the batch.
+            udo_payloads (Iterable[dict]): Serialized Udo objects - consumed lazily, chunk by chunk.
+
+        Returns:
+            BatchReport: Per-chunk outcomes, ordered by chunk index.
+        """
+        return self._send(object_type, enumerate(chunked(udo_payloads, self.chunk_size)))
+
+    def retry_failed(self, report: BatchReport) -> BatchReport:
+        """Resend only the failed chunks of a report and return the report with their new outcomes."""
+        retried = self._send(report.object_type, ((chunk.index, chunk.objects) for chunk in report.failed_chunks))
+        by_index = {chunk.index: chunk for chunk in report.chunks}
+        by_index.update({chunk.index: chunk for chunk in retried.chunks})
+        return BatchReport(report.object_type, [by_index[index] for index in sorted(by_index)], rejected=report.rejected)
+
+    def _send(self, object_type: str, indexed_chunks: Iterable[tuple[int, list[dict[str, Any]]]]) -> BatchReport:
+        endpoint = f"/objects/{object_type}/batch"
+        post_chunk = lambda indexed_chunk: self.client.post(endpoint, indexed_chunk[1])
+
+        report = BatchReport(object_type)
+
+        def guarded(chunks):
+            try:
+                yield from chunks
+            except Exception as e:
+                report.source_error = e
+
+        for (index, objects), response, error in bounded_map(post_chunk, guarded(indexed_chunks), self.max_in_flight):
+            names = [udo["name"] for udo in objects]
+            if error is None:
+                report.chunks.append(ChunkResult(index, names, "succeeded", response=response))
+            else:
+                report.chunks.append(ChunkResult(index, names, "failed", error=error, objects=objects))
+
+        report.chunks.sort(key=lambda chunk: chunk.index)
+        return report
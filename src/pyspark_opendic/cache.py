@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional
+
+import requests
+
+# Returned by cache lookups on a miss, since None (or an empty list) is a valid cached value
+MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU mapping that keeps hit/miss statistics."""
+
+    def __init__(self, maxsize: int = 256):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value (marking it most recently used) or MISSING."""
+        with self._lock:
+            value = self._data.get(key, MISSING)
+            if value is MISSING or not self._is_fresh(key, value):
+                self._data.pop(key, None)
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._unwrap(value)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = self._wrap(key, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key matches the predicate and return how many were removed."""
+        with self._lock:
+            stale = [key for key in self._data if predicate(key)]
+            for key in stale:
+                del self._data[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+    # Hooks for subclasses that store extra bookkeeping next to the value
+    def _wrap(self, key: Hashable, value: Any) -> Any:
+        return value
+
+    def _unwrap(self, value: Any) -> Any:
+        return value
+
+    def _is_fresh(self, key: Hashable, value: Any) -> bool:
+        return True
+
+
+class ResponseCache(LRUCache):
+    """
+    TTL + LRU cache for OpenDicClient GET responses, keyed by endpoint.
+
+    TTLs are chosen per endpoint by the longest matching path prefix in `ttls`
+    (e.g. {"/objects": 300, "/objects/function/platforms": 60}), falling back to `default_ttl`.
+    A TTL of 0 disables caching for that prefix. Writes invalidate the affected listings through
+    `invalidate_for_write`. Cached responses are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int = 256, default_ttl: float = 30.0,
+                 ttls: Optional[dict[str, float]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize (int): Maximum number of cached endpoints.
+            default_ttl (float): Seconds a response stays valid when no prefix in `ttls` matches.
+            ttls (dict, optional): Per-endpoint-prefix TTL overrides in seconds.
+            clock (Callable): Monotonic clock, replaceable in tests.
+        """
+        super().__init__(maxsize)
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.clock = clock
+
+    @staticmethod
+    def _matches_prefix(endpoint: str, prefix: str) -> bool:
+        return endpoint == prefix or endpoint.startswith(prefix.rstrip("/") + "/")
+
+    def ttl_for(self, endpoint: str) -> float:
+        matching = [prefix for prefix in self.ttls if self._matches_prefix(endpoint, prefix)]
+        if not matching:
+            return self.default_ttl
+        return self.ttls[max(matching, key=len)]
+
+    def put(self, endpoint: str, value: Any) -> None:
+        if self.ttl_for(endpoint) > 0:
+            super().put(endpoint, value)
+
+    def _wrap(self, endpoint: str, value: Any) -> Any:
+        return (self.clock() + self.ttl_for(endpoint), value)
+
+    def _unwrap(self, value: Any) -> Any:
+        return value[1]
+
+    def _is_fresh(self, endpoint: str, value: Any) -> bool:
+        return self.clock() < value[0]
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """Remove the endpoint `prefix` and everything below it."""
+        return self.invalidate(lambda endpoint: self._matches_prefix(endpoint, prefix))
+
+    def invalidate_for_write(self, endpoint: str) -> int:
+        """
+        Drop every cached response a POST/PUT/DELETE to `endpoint` may have changed:
+            /objects[/...]                     -> the type listing (/objects) and every /pull of every platform
+            /objects/{type}                    -> also every platform listing and mapping (dropping a type drops
+                                                  its mappings), and everything under /objects/{type}
+            /objects/{type}/...                -> everything under /objects/{type}
+            /objects/{type}/platforms/{p}[/..] -> also /platforms and everything under /platforms/{p}
+            /platforms/{p}[/...]               -> every platform listing and mapping, for all types
+        """
+        parts = endpoint.strip("/").split("/")
+        removed = 0
+
+        if parts[0] == "objects":
+            # Pulls render the objects of every type, so any object write can change them
+            removed += self.invalidate(lambda key: key == "/objects" or key.rstrip("/").endswith("/pull"))
+            if len(parts) == 2:
+                removed += self.invalidate_prefix("/platforms")
+            if len(parts) >= 2:
+                removed += self.invalidate_prefix(f"/objects/{parts[1]}")
+            if len(parts) >= 4 and parts[2] == "platforms":
+                removed += self.invalidate(lambda key: key == "/platforms")
+                removed += self.invalidate_prefix(f"/platforms/{parts[3]}")
+
+        elif parts[0] == "platforms":
+            # Platform-wide mapping changes are visible under /objects/{type}/platforms as well
+            removed += self.invalidate(lambda key: "platforms" in key.strip("/").split("/"))
+
+        return removed
+
+
+class ValidatedResponse(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: Any  # Decoded JSON, served again on a 304
+    size: int  # Size of the original response body in bytes
+
+
+class ValidatorCache(LRUCache):
+    """
+    Stores the ETag / Last-Modified validators of GET responses so OpenDicClient can send
+    conditional requests (If-None-Match / If-Modified-Since) and serve the stored body on a 304.
+
+    Unlike ResponseCache every read still reaches the server, so results are never stale; a
+    304 only saves the transfer and decoding of the body. `bytes_saved` counts those bytes.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        super().__init__(maxsize)
+        self.not_modified = 0
+        self.bytes_saved = 0
+
+    def conditional_headers(self, entry: Optional[ValidatedResponse]) -> dict[str, str]:
+        headers = {}
+        if entry is not None and entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(self, endpoint: str, response: requests.Response, body: Any) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag is None and last_modified is None:
+            return
+        self.put(endpoint, ValidatedResponse(etag, last_modified, body, len(response.content or b"")))
+
+    def record_not_modified(self, entry: ValidatedResponse, response: requests.Response) -> Any:
+        with self._lock:
+            self.not_modified += 1
+            self.bytes_saved += max(entry.size - len(response.content or b""), 0)
+        return entry.body
+
+    def stats(self) -> dict[str, int]:
+        return {**super().stats(), "not_modified": self.not_modified, "bytes_saved": self.bytes_saved}
@@ -1,7 +1,9 @@
 import json
-import re
 import textwrap
-from typing import Any
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional, Sequence, Union
 import ast
 
 import pandas as pd
@@ -10,216 +12,355 @@ from pydantic import ValidationError
 from pyspark.sql import SparkSession
 from pyspark.sql.catalog import Catalog
 
+from pyspark_opendic.async_client import AsyncOpenDicClient
+from pyspark_opendic.batch import BatchReport, BatchUploader, ObjectResult, bounded_map, send_each
+from pyspark_opendic.cache import MISSING, LRUCache
 from pyspark_opendic.client import OpenDicClient
-from pyspark_opendic.model.openapi_models import (
-    CreatePlatformMappingRequest,
-    CreateUdoRequest,
-    DefineUdoRequest,
-    PlatformMapping,
-    Statement,
-    Udo,
+from pyspark_opendic.execution import APPLIED, StatementPolicy, execution_summary, parse_definition, run_statements
+from pyspark_opendic.model.adapters import statements_from
+from pyspark_opendic.model.openapi_models import Statement
+from pyspark_opendic.patterns.opendic_dispatcher import opendic_head
+from pyspark_opendic.patterns.opendic_parser import (
+    AddMappingCommand,
+    AlterBatchCommand,
+    AlterCommand,
+    CreateBatchCommand,
+    CreateCommand,
+    DefineCommand,
+    DropBatchCommand,
+    DropCommand,
+    DropMappingForPlatformCommand,
+    OpenDicCommand,
+    OpenDicParser,
+    OpenDicSyntaxError,
+    ShowCommand,
+    ShowMappingCommand,
+    ShowMappingsForPlatformCommand,
+    ShowPlatformsCommand,
+    ShowPlatformsForObjectCommand,
+    ShowTypesCommand,
+    SyncAllCommand,
+    SyncCommand,
+    SyncManyCommand,
 )
-from pyspark_opendic.patterns.opendic_patterns import OpenDicPatterns
 from pyspark_opendic.prettyResponse import PrettyResponse
+from pyspark_opendic.planning import CREATE, NO_OP, REPLACE, SyncPlan, plan_statements
+from pyspark_opendic.rendering import MappingCache
+from pyspark_opendic.results import (
+    ARROW, LAZY, PANDAS, RESULT_MODES, SPARK, LazyResult, arrow_to_spark, configure_pandas_display, frame_to_arrow,
+    require_pyarrow, rows_to_arrow, rows_to_spark,
+)
+from pyspark_opendic.schemas import PropsError, SchemaCache, TypeSchema
+from pyspark_opendic.sources import RecordSource, iter_records, records_to_udos
+from pyspark_opendic.sync_state import SyncState, is_session_scoped, statement_hash
+from pyspark_opendic.upsert import ObjectUpserter, UpsertReport
+
+# Statements longer than this are parsed every time instead of being kept in the command cache
+_COMMAND_CACHE_MAX_CHARS = 64 * 1024
+
+# Pulled statements for this platform are executed in the local Spark session
+LOCAL_PLATFORM = "spark"
 
 
 class OpenDicCatalog(Catalog):
-    def __init__(self, sparkSession: SparkSession, api_url: str):
+    def __init__(self, sparkSession: SparkSession, api_url: str, max_in_flight: int = 8, command_cache_size: int = 256,
+                 batch_chunk_size: int = 500, dump_parallelism: int = 1, sync_state_dir: Optional[str] = None,
+                 streaming_pull: bool = False, statement_policy: Optional[StatementPolicy] = None, result_mode: str = PANDAS,
+                 trust_payloads: bool = False, **client_options):
+        """
+        Args:
+            sparkSession (SparkSession): The Spark session native SQL is forwarded to.
+            api_url (str): Base URL of the Polaris server.
+            max_in_flight (int): Maximum number of commands sql_async/sql_many run concurrently.
+            command_cache_size (int): Number of parsed and validated statements kept for reuse, 0 disables the cache.
+            batch_chunk_size (int): Number of objects sent per request by CREATE OPEN BATCH.
+            dump_parallelism (int): Number of synced statements executed at once by Spark, 1 runs them in order.
+            sync_state_dir (str, optional): Directory for SYNC watermarks. When set, SYNC only re-executes statements
+                that changed since the last sync of the same type and platform (SYNC ... FULL re-executes all).
+            streaming_pull (bool): Decode SYNC pull responses while they download and start executing statements
+                right away, instead of loading the whole response first.
+            statement_policy (StatementPolicy, optional): Retries of transient Spark errors and fail-fast behaviour
+                for executed statements - by default each statement runs once and failures do not stop the others.
+            result_mode (str): How tabular results are returned - "pandas" (a pandas DataFrame), "spark" (a Spark
+                DataFrame built through Arrow), "arrow" (a pyarrow.Table, these two require pyarrow) or "lazy"
+                (a LazyResult that builds any of them only when it is used).
+            trust_payloads (bool): Build the object payloads of create_objects_from, upsert_objects and alter_objects
+                as plain dicts instead of validating every object through the pydantic models.
+            **client_options: Passed on to OpenDicClient (e.g. pool_maxsize, timeout).
+        """
         self.sparkSession = sparkSession
+        if result_mode not in RESULT_MODES:
+            raise ValueError(f"Unknown result_mode '{result_mode}' - expected one of {', '.join(RESULT_MODES)}")
+        if result_mode in (SPARK, ARROW):
+            require_pyarrow(result_mode)
+        self.result_mode = result_mode
+        self.trust_payloads = trust_payloads
 
         self.credentials = sparkSession.conf.get("spark.sql.catalog.polaris.credential")
         if self.credentials is None:
             raise ValueError("spark.sql.catalog.polaris.credential is not set")
         self.api_url = api_url
-        self.client = OpenDicClient(api_url, self.credentials)
-        self.opendic_patterns = OpenDicPatterns.compiled_patterns()
+        client_options.setdefault("pool_maxsize", max(10, max_in_flight))
+        self.client = OpenDicClient(api_url, self.credentials, **client_options)
+        self.max_in_flight = max_in_flight
+        self.dump_parallelism = dump_parallelism
+        self.streaming_pull = streaming_pull
+        self.statement_policy = statement_policy or StatementPolicy()
+        self.last_sync_statements: dict[tuple[Optional[str], str], list[str]] = {}
+        self.mappings = MappingCache(self.client)
+        self.type_schemas = SchemaCache(self.client)
+        self.last_sync_plans: list[SyncPlan] = []
+        self.sync_state: Optional[SyncState] = SyncState(sync_state_dir, api_url) if sync_state_dir else None
+        self._async_client: Optional[AsyncOpenDicClient] = None
+        self.batch_uploader = BatchUploader(self.client, chunk_size=batch_chunk_size, max_in_flight=max_in_flight)
+        self.last_batch_report: Optional[BatchReport] = None
+        self.upserter = ObjectUpserter(self.client, self.batch_uploader, max_in_flight=max_in_flight)
+        self.parser = OpenDicParser()
+        self.command_cache: Optional[LRUCache] = LRUCache(command_cache_size) if command_cache_size > 0 else None
 
     def sql(self, sql_text: str):
         sql_cleaned = sql_text.strip()
-        
-        for command_type, pattern in self.opendic_patterns:
-            match = pattern.match(sql_cleaned)
-            if match:
-                return self._handle_opendic_command(command_type, match, sql_text)
+
+        # Single pass over the statement: native SQL is recognised from its leading keywords, OpenDic
+        # statements are parsed into a typed command with their JSON already decoded
+        try:
+            command = self._parse(sql_cleaned)
+        except json.JSONDecodeError as e:
+            return self.pretty_print_result({
+                "error": "Invalid JSON syntax in properties",
+                "details": {"sql": "", "exception_message": str(e)}
+            })
+        except OpenDicSyntaxError as e:
+            return self.pretty_print_result({
+                "error": "Invalid OpenDic syntax",
+                "details": {"line": e.line, "column": e.column, "position": e.position, "exception_message": str(e)}
+            })
+
+        if command is not None:
+            return self._handle_opendic_command(command)
 
         # Fallback to native Spark SQL if no OpenDic match
         return self.sparkSession.sql(sql_text)
 
-    def _handle_opendic_command(self, command_type: str, match: re.Match, sql_text: str):
-        try:
-            # Syntax: CREATE [OR REPLACE] [TEMPORARY] OPEN <object_type> <name> [IF NOT EXISTS] [AS <alias>] [PROPS { <properties> }]
-            if command_type == "create":
-                object_type = match.group("object_type")
-                name = match.group("name")
-                alias = match.group("alias")
-                properties = match.group("properties")
+    def _parse(self, sql_cleaned: str) -> Optional[OpenDicCommand]:
+        # Native SQL is told apart from its first words alone; caching it would only evict OpenDic commands
+        if opendic_head(sql_cleaned) is None:
+            return None
+
+        # Huge statements (e.g. batches) are not worth pinning in memory and are rarely repeated verbatim
+        if self.command_cache is None or len(sql_cleaned) > _COMMAND_CACHE_MAX_CHARS:
+            return self.parser.parse(sql_cleaned)
+
+        command = self.command_cache.get(sql_cleaned)
+        if command is MISSING:
+            command = self.parser.parse(sql_cleaned)
+            self.command_cache.put(sql_cleaned, command)
+        return command
+
+    def command_cache_info(self) -> dict[str, int]:
+        """Hit/miss statistics of the parsed-command cache."""
+        if self.command_cache is None:
+            return {"hits": 0, "misses": 0, "size": 0, "maxsize": 0}
+        return self.command_cache.stats()
+
+    @property
+    def async_client(self) -> AsyncOpenDicClient:
+        """Async front-end sharing this catalog's client, created on first use."""
+        if self._async_client is None:
+            self._async_client = AsyncOpenDicClient(self.client, self.max_in_flight)
+        return self._async_client
+
+    async def sql_async(self, sql_text: str):
+        """
+        Awaitable version of sql(). Commands awaited together (e.g. with asyncio.gather) run
+        concurrently, at most max_in_flight at a time. Errors are returned as results, not raised.
+        """
+        return await self.async_client.run(self._sql_or_error, sql_text)
 
-                # Parse props as JSON - this serves as a basic syntax check on the JSON input and default to None so we can catch Pydantic Error
-                create_props: dict[str, str] = json.loads(properties) if properties else None
+    def sql_many(self, sql_texts: Iterable[str], max_in_flight: Optional[int] = None) -> list:
+        """
+        Run independent commands concurrently and return their results in input order.
 
-                # Build Udo and CreateUdoRequest Pydantic models
-                udo_object = Udo(type=object_type, name=name, alias=alias, props=create_props)
-                create_request = CreateUdoRequest(udo=udo_object)
+        A command that fails does not affect the others; its slot holds an error result instead.
+        Use this instead of sql_async from code that is already inside a running event loop (e.g. notebooks).
 
-                # Serialize to JSON
-                payload = create_request.model_dump()
+        Args:
+            sql_texts (Iterable[str]): The commands to run.
+            max_in_flight (int, optional): Concurrency limit, defaults to the catalog's max_in_flight.
+
+        Returns:
+            list: One result per command, in the order they were given.
+        """
+        with ThreadPoolExecutor(max_workers=max_in_flight or self.max_in_flight, thread_name_prefix="opendic-sql") as executor:
+            return list(executor.map(self._sql_or_error, sql_texts))
+
+    def _sql_or_error(self, sql_text: str):
+        try:
+            return self.sql(sql_text)
+        except Exception as e:
+            # OpenDic commands report their own errors, so this is mostly native Spark SQL failing
+            return self.pretty_print_result({
+                "error": "Command failed",
+                "details": {"sql": sql_text, "exception_message": str(e)}
+            })
+
+    def _handle_opendic_command(self, command: OpenDicCommand):
+        try:
+            # Syntax: CREATE [OR REPLACE] [TEMPORARY] OPEN <object_type> <name> [IF NOT EXISTS] [AS <alias>] [PROPS { <properties> }]
+            if isinstance(command, CreateCommand):
+                object_type = command.object_type
+
+                # Udo / CreateUdoRequest payload, validated once per (cached) command - props default to None so we can catch Pydantic Error
+                payload = command.payload
+                self._check_props(object_type, command.name, command.properties)
 
                 # Send Request
                 response = self.client.post(f"/objects/{object_type}", payload)
 
                 return self.pretty_print_result({"success": "Object created successfully", "response": response})
-           
-            elif command_type == "create_batch":
-                object_type = match.group("object_type")
-                properties_list = json.loads(match.group("properties"))  # Already a list of dicts
 
-                udo_objects: list[dict[str, Any]] = []
-                for item in properties_list:
-                    name = item.pop("name")
-                    udo_object = Udo(type=object_type, name=name, props=item).model_dump()
-                    udo_objects.append(udo_object)
+            elif isinstance(command, CreateBatchCommand):
+                rejected: list[ObjectResult] = []
+                udo_objects = self._valid_objects(command.object_type, command.payload, rejected)
 
-                response = self.client.post(f"/objects/{object_type}/batch", udo_objects)
-                return self.pretty_print_result({"success": "Batch created", "response": response})
+                # Syntax: CREATE OR REPLACE OPEN BATCH ... - writes only what differs from the server
+                if command.upsert:
+                    upsert_report = self.upserter.upsert(command.object_type, udo_objects)
+                    upsert_report.rejected = rejected
+                    return self._upsert_result(upsert_report)
 
-            # Syntax: ALTER OPEN <object_type> <name> [PROPS { <properties> }]
-            elif command_type == "alter":
-                object_type = match.group("object_type")
-                name = match.group("name")
-                properties = match.group("properties")
+                # Sent in chunks of batch_chunk_size, max_in_flight chunks at a time
+                report = self.batch_uploader.upload(command.object_type, udo_objects)
+                report.rejected = rejected
+                return self._batch_result(report, "Batch created")
 
-                alter_props: dict[str, str] = json.loads(properties) if properties else None
-
-                # Build Udo and CreateUdoRequest Pydantic models            
-                udo_object = Udo(type=object_type, name=name, props=alter_props)
-                alter_request = CreateUdoRequest(udo=udo_object)
+            # Syntax: ALTER OPEN <object_type> <name> [PROPS { <properties> }]
+            elif isinstance(command, AlterCommand):
+                object_type = command.object_type
+                name = command.name
 
-                # Serialize to JSON
-                payload = alter_request.model_dump()
+                # Udo / CreateUdoRequest payload, validated once per (cached) command
+                payload = command.payload
+                self._check_props(object_type, name, command.properties)
 
                 # Send Request
                 response = self.client.put(f"/objects/{object_type}/{name}", payload)
 
                 return self.pretty_print_result({"success": "Object altered successfully", "response": response})
 
+            # Syntax: ALTER OPEN BATCH <object_type> OBJECT[S] [ { "name": ..., <properties> }, ... ]
+            elif isinstance(command, AlterBatchCommand):
+                results = self._alter_each(command.object_type, command.payload)
+                return self._object_results(results, "Objects altered")
+
             # Syntax: SHOW OPEN TYPES
-            elif command_type == "show_types":
+            elif isinstance(command, ShowTypesCommand):
                 response = self.client.get("/objects")
                 return self.pretty_print_result({"success": "Object types retrieved successfully", "response": response})
 
             # Syntax: SHOW OPEN PLATFORMS
-            elif command_type == "show_platforms_all":
+            elif isinstance(command, ShowPlatformsCommand):
                 response = self.client.get("/platforms")
                 return self.pretty_print_result({"success": "Platforms retrieved successfully", "response": response})
 
             # Syntax: SHOW OPEN MAPPINGS FOR <platform>
-            elif command_type == "show_mappings_for_platform":
-                platform = match.group("platform")
-                response = self.client.get(f"/platforms/{platform}")
+            elif isinstance(command, ShowMappingsForPlatformCommand):
+                response = self.client.get(f"/platforms/{command.platform}")
                 return self.pretty_print_result({"success": "Mappings for platform retrieved successfully", "response": response})
 
             # Syntax: DROP OPEN MAPPING[S] FOR <platform>
-            elif command_type == "drop_mapping_for_platform":
-                platform = match.group("platform")
-                response = self.client.delete(f"/platforms/{platform}")
+            elif isinstance(command, DropMappingForPlatformCommand):
+                response = self.client.delete(f"/platforms/{command.platform}")
+                self.mappings.invalidate(command.platform)
                 return self.pretty_print_result({"success": "Platform's mappings dropped successfully", "response": response})
 
             # Syntax: SHOW OPEN <object_type>[s]
-            elif command_type == "show":
-                object_type = match.group("object_type")
-                response = self.client.get(f"/objects/{object_type}")
+            elif isinstance(command, ShowCommand):
+                response = self.client.get(f"/objects/{command.object_type}")
+                schema = self.type_schemas.get(command.object_type)
+                if schema is not None:
+                    # Flat, typed columns instead of a nested props column
+                    objects = response.get("objects", []) if isinstance(response, dict) else response
+                    if isinstance(objects, list):
+                        return self._typed_result(objects, schema)
                 return self.pretty_print_result({"success": "Objects retrieved successfully", "response": response})
 
             # Syntax: SHOW OPEN MAPPING <object_type> PLATFORM <platform>
-            elif command_type == "show_mapping_for_object_and_platform":
-                object_type = match.group("object_type")
-                platform = match.group("platform")
-                response = self.client.get(f"/objects/{object_type}/platforms/{platform}")
+            elif isinstance(command, ShowMappingCommand):
+                response = self.client.get(f"/objects/{command.object_type}/platforms/{command.platform}")
                 return self.pretty_print_result({"success": "Mapping retrieved successfully", "response": response})
 
             # Syntax: SHOW OPEN PLATFORMS FOR <object_type>
-            elif command_type == "show_platforms_for_object":
-                object_type = match.group("object_type")
-                response = self.client.get(f"/objects/{object_type}/platforms")
+            elif isinstance(command, ShowPlatformsForObjectCommand):
+                response = self.client.get(f"/objects/{command.object_type}/platforms")
                 return self.pretty_print_result({"success": "Platforms retrieved successfully", "response": response})
 
-            # Syntax: SYNC OPEN <object_type> FOR <platform>
-            elif command_type == "sync":
-                object_type = match.group("object_type")
-                platform: str = match.group("platform").lower()
-                response = self.client.get(f"/objects/{object_type}/platforms/{platform}/pull")
-                statements = [Statement.model_validate(item) for item in response]
-                return self.dump_handler(statements)
-            
-            # Syntax: SYNC OPEN OBJECTS FOR <platform>
-            elif command_type == "sync_all":
-                platform: str = match.group("platform").lower()
-                response = self.client.get(f"/platforms/{platform}/pull")
-                statements = [Statement.model_validate(item) for item in response]
-                return self.dump_handler(statements)
+            # Syntax: SYNC OPEN <object_type> FOR <platform> [FULL] [PLAN]
+            elif isinstance(command, SyncCommand):
+                platform: str = command.platform.lower()
+                if command.plan:
+                    return self.plan_sync(platform, command.object_type, command.full)
+                statements = self._pull(f"/objects/{command.object_type}/platforms/{platform}/pull")
+                return self._sync_statements(statements, command.object_type, platform, command.full)
+
+            # Syntax: SYNC OPEN OBJECTS FOR <platform> [FULL] [PLAN]
+            elif isinstance(command, SyncAllCommand):
+                platform: str = command.platform.lower()
+                if command.plan:
+                    return self.plan_sync(platform, None, command.full)
+                statements = self._pull(f"/platforms/{platform}/pull")
+                return self._sync_statements(statements, None, platform, command.full)
+
+            # Syntax: SYNC OPEN <object_type|OBJECTS>[, ...] FOR <platform>, <platform>[, ...] [FULL] [PLAN]
+            elif isinstance(command, SyncManyCommand):
+                return self._sync_many(command.object_types, command.platforms, command.full, command.plan)
 
             # Syntax: DEFINE OPEN <udoType> PROPS { <properties> }
-            elif command_type == "define":
-                udoType = match.group("udoType")
-                properties = match.group("properties")
-                define_props: dict[str, str] = json.loads(properties) if properties else None
-                define_request = DefineUdoRequest(udoType=udoType, properties=define_props)
-                self.validate_data_type(define_props)
-                payload = define_request.model_dump()
+            elif isinstance(command, DefineCommand):
+                payload = command.payload
+                self.validate_data_type(command.properties)
                 response = self.client.post("/objects", payload)
+                self.type_schemas.add(command.udo_type, command.properties or {})
                 return self.pretty_print_result({"success": "Object defined successfully", "response": response})
 
             # Syntax: DROP OPEN <object_type>
-            elif command_type == "drop":
-                object_type = match.group("object_type")
-                response = self.client.delete(f"/objects/{object_type}")
+            elif isinstance(command, DropCommand):
+                response = self.client.delete(f"/objects/{command.object_type}")
+                self.type_schemas.invalidate(command.object_type)
                 return self.pretty_print_result({"success": "Object dropped successfully", "response": response})
 
+            # Syntax: DROP OPEN BATCH <object_type> OBJECT[S] [ "<name>", ... ]
+            elif isinstance(command, DropBatchCommand):
+                results = self._drop_each(command.object_type, command.names)
+                return self._object_results(results, "Objects dropped")
+
             # Syntax: ADD OPEN MAPPING <object_type> PLATFORM <platform> SYNTAX { ... } PROPS { ... }
-            elif command_type == "add_mapping":
-                object_type = match.group("object_type")
-                platform = match.group("platform")
-                syntax = match.group("syntax").strip()
-                properties = match.group("props")
-
-                # Remove outer quotes if present - this is a workaround for the fact that the regex captures the outer quotes (or everything inside curly braces)
-                if syntax.startswith('"') and syntax.endswith('"'):
-                    syntax = syntax[1:-1]
+            elif isinstance(command, AddMappingCommand):
+                object_type = command.object_type
+                platform = command.platform
+
                 # Props is expected to be a JSON-encoded dict of dicts (e.g., "args": {"propType": "map", ...})
-                object_dump_map: dict[str, dict[str, Any]] = json.loads(properties)
-
-                mapping_request = CreatePlatformMappingRequest(
-                    platformMapping=PlatformMapping(
-                        typeName=object_type,
-                        platformName=platform,
-                        syntax=syntax.strip(),
-                        objectDumpMap=object_dump_map,
-                    )
-                )
-                response = self.client.post(f"/objects/{object_type}/platforms/{platform}", mapping_request.model_dump())
+                response = self.client.post(f"/objects/{object_type}/platforms/{platform}", command.payload)
+                self.mappings.invalidate(platform)
                 return self.pretty_print_result({"success": "Mapping added successfully", "response": response})
 
-        except json.JSONDecodeError as e:
-            return self.pretty_print_result({
-                "error": "Invalid JSON syntax in properties",
-                "details": {"sql": "", "exception_message": str(e)}
-            })
         except requests.exceptions.HTTPError as e:
-            # Check if httpcode is 401
-            if e.response.status_code == 401:
-                self.client.refresh_oauth_token(self.credentials)
-                self.sql(sql_text)
-            else:
-                return self.pretty_print_result({
-                    "error": "HTTP Error",
-                    "details": str(e),
-                    "Catalog Response": e.response.json() if e.response else None}
-                )
+            # The client has already re-authenticated on a 401 and retried transient errors per its RetryPolicy
+            return self.pretty_print_result({
+                "error": "HTTP Error",
+                "details": str(e),
+                "Catalog Response": e.response.json() if e.response else None}
+            )
         except ValidationError as e:
             return self.pretty_print_result({
                 "error": "Validation error",
                 "exception message": str(e)
             })
+        except PropsError as e:
+            return self.pretty_print_result({
+                "error": "Invalid props",
+                "details": e.errors
+            })
         except ValueError as e:
             return self.pretty_print_result({
                 "error": "Invalid type for DEFINE statement",
@@ -227,36 +368,510 @@ class OpenDicCatalog(Catalog):
             })
 
 
+    def create_objects_from(self, source: RecordSource, object_type: str, name_col: str = "name",
+                            props_cols: Optional[list[str]] = None, chunk_size: Optional[int] = None):
+        """
+        Bulk-register objects from a Spark DataFrame, a pandas DataFrame or a JSONL/Parquet file.
+
+        Rows are streamed, turned into Udo payloads and uploaded chunk by chunk (see CREATE OPEN BATCH),
+        so memory stays flat regardless of the number of rows.
+
+        Args:
+            source: Spark/pandas DataFrame, path to a .jsonl/.ndjson/.parquet file, or an iterable of dicts.
+            object_type (str): Type of the created objects.
+            name_col (str): Column holding the object name.
+            props_cols (list[str], optional): Columns sent as props - defaults to every other column.
+            chunk_size (int, optional): Objects per request, defaults to the catalog's batch_chunk_size.
+
+        Returns:
+            One row per object with the outcome of its chunk.
+        """
+        uploader = self.batch_uploader
+        if chunk_size is not None:
+            uploader = BatchUploader(self.client, chunk_size=chunk_size, max_in_flight=self.max_in_flight)
+
+        # Reading errors (bad rows, unreadable files) end the upload early and are reported in the result
+        udo_payloads = records_to_udos(iter_records(source), object_type, name_col=name_col, props_cols=props_cols,
+                                       trusted=self.trust_payloads)
+        rejected: list[ObjectResult] = []
+        report = self.last_batch_report = uploader.upload(object_type, self._valid_objects(object_type, udo_payloads, rejected))
+        report.rejected = rejected
+        return self._batch_result(report, "Objects created", single_request=False)
+
+    def upsert_objects(self, source: RecordSource, object_type: str, name_col: str = "name",
+                       props_cols: Optional[list[str]] = None, dry_run: bool = False):
+        """
+        Create or update objects so the server matches `source`, skipping objects whose props are unchanged.
+
+        The current objects are read once; only missing objects are created (in chunks) and only
+        objects with different props are updated, so re-running a pipeline writes nothing new.
+
+        Args:
+            source: Same as for create_objects_from().
+            object_type (str): Type of the objects.
+            name_col (str): Column holding the object name.
+            props_cols (list[str], optional): Columns sent as props - defaults to every other column.
+            dry_run (bool): Only report which objects would be created or updated.
+
+        Returns:
+            One row per object with its action (create/update/none) and status.
+        """
+        try:
+            udo_payloads = records_to_udos(iter_records(source), object_type, name_col=name_col, props_cols=props_cols,
+                                           trusted=self.trust_payloads)
+            rejected: list[ObjectResult] = []
+            plan = self.upserter.plan(object_type, self._valid_objects(object_type, udo_payloads, rejected))
+            if dry_run:
+                rows = ([{"name": udo["name"], "action": "create"} for udo in plan.creates]
+                        + [{"name": name, "action": "update"} for name, _ in plan.updates]
+                        + [{"name": name, "action": "none"} for name in plan.unchanged]
+                        + [{"name": result.name, "action": "reject", "error": str(result.error)} for result in rejected])
+                return self.pretty_print_result({"success": "Upsert planned", "response": rows})
+            report = self.upserter.apply(plan)
+            report.rejected = rejected
+            return self._upsert_result(report)
+        except requests.exceptions.HTTPError as e:
+            return self.pretty_print_result({"error": "HTTP Error", "details": str(e)})
+        except (ValueError, ValidationError, OSError) as e:
+            return self.pretty_print_result({"error": "Could not read objects", "exception message": str(e)})
+
+    def alter_objects(self, source: RecordSource, object_type: str, name_col: str = "name",
+                      props_cols: Optional[list[str]] = None):
+        """
+        Update many objects, with up to max_in_flight PUT requests at a time (see ALTER OPEN BATCH).
+
+        Args:
+            source: Same as for create_objects_from(). Rows are read as the requests go out.
+            object_type (str): Type of the objects.
+            name_col (str): Column holding the object name.
+            props_cols (list[str], optional): Columns sent as props - defaults to every other column.
+
+        Returns:
+            One row per object with its status.
+        """
+        udo_payloads = records_to_udos(iter_records(source), object_type, name_col=name_col, props_cols=props_cols,
+                                       trusted=self.trust_payloads)
+        # The payloads are serialized Udos already, so they are wrapped as a CreateUdoRequest without validating them again
+        put_payloads = ((udo["name"], {"udo": udo}) for udo in udo_payloads)
+        try:
+            return self._object_results(self._alter_each(object_type, put_payloads), "Objects altered")
+        except (ValueError, ValidationError, OSError) as e:
+            return self.pretty_print_result({
+                "error": "Could not read objects - rows before the failing one may already be altered",
+                "exception message": str(e)
+            })
+
+    def drop_objects(self, object_type: str, names: Iterable[str]):
+        """
+        Drop individual objects, with up to max_in_flight DELETE requests at a time (see DROP OPEN BATCH).
+
+        Returns:
+            One row per object with its status.
+        """
+        return self._object_results(self._drop_each(object_type, names), "Objects dropped")
+
+    def _alter_each(self, object_type: str, payloads: Iterable[tuple[str, dict[str, Any]]]) -> list[ObjectResult]:
+        # Objects with invalid props are reported after the ones that were sent
+        rejected: list[ObjectResult] = []
+        payloads = self._valid_objects(object_type, payloads, rejected, udo_of=lambda item: item[1]["udo"])
+        results = send_each(lambda payload: self.client.put(f"/objects/{object_type}/{payload[0]}", payload[1]),
+                            ((name, (name, payload)) for name, payload in payloads), self.max_in_flight)
+        return results + rejected
+
+    def _check_props(self, object_type: str, name: str, props: Optional[dict[str, Any]]) -> None:
+        """Raise PropsError if the props do not match the cached schema of the type. Types without one are not checked."""
+        schema = self.type_schemas.get(object_type)
+        if schema is not None:
+            problems = schema.check(props)
+            if problems:
+                raise PropsError(object_type, {name: problems})
+
+    def _valid_objects(self, object_type: str, items: Iterable[Any], rejected: list[ObjectResult],
+                       udo_of: Callable[[Any], dict[str, Any]] = lambda item: item) -> Iterable[Any]:
+        """
+        The items whose props match the cached schema of the type, read lazily. The others are not sent:
+        each one is appended to `rejected` as it is read, with the problems found.
+        """
+        schema = self.type_schemas.get(object_type)
+        if schema is None:
+            return items
+
+        def valid():
+            for item in items:
+                udo = udo_of(item)
+                problems = schema.check(udo.get("props"))
+                if problems:
+                    rejected.append(ObjectResult(udo["name"], "rejected", error=PropsError(object_type, {udo["name"]: problems})))
+                else:
+                    yield item
+        return valid()
+
+    def _drop_each(self, object_type: str, names: Iterable[str]) -> list[ObjectResult]:
+        return send_each(lambda name: self.client.delete(f"/objects/{object_type}/{name}"),
+                         ((name, name) for name in names), self.max_in_flight)
+
+    def _object_results(self, results: list[ObjectResult], message: str):
+        failed = sum(result.status != "succeeded" for result in results)
+        outcome = {"error": f"{message} with {failed} failures"} if failed else {"success": message}
+        rows = [
+            {"name": result.name, "status": result.status, "error": str(result.error) if result.error else None}
+            for result in results
+        ]
+        return self.pretty_print_result({**outcome, "summary": {"objects": len(results), "failed_objects": failed}, "response": rows})
+
+    def _upsert_result(self, report: UpsertReport):
+        if report.created is not None:
+            self.last_batch_report = report.created
+        outcome = {"success": "Objects upserted"} if report.succeeded else {"error": "Objects upserted with failures"}
+        return self.pretty_print_result({**outcome, "summary": report.summary(), "response": report.object_rows()})
+
+    def retry_failed_batch(self, report: Optional[BatchReport] = None):
+        """
+        Resend only the chunks that failed in a batch upload.
+
+        Args:
+            report (BatchReport, optional): The report to retry, defaults to the last CREATE OPEN BATCH.
+        """
+        report = report or self.last_batch_report
+        if report is None:
+            return self.pretty_print_result({"error": "No batch to retry"})
+        return self._batch_result(self.batch_uploader.retry_failed(report), "Batch retried", single_request=False)
+
+    def _batch_result(self, report: BatchReport, message: str, single_request: bool = True):
+        self.last_batch_report = report
+
+        # A batch that fit in a single chunk behaves like a single request: the server response, or its error
+        if single_request and len(report.chunks) == 1 and not report.rejected:
+            chunk = report.chunks[0]
+            if chunk.error is not None:
+                raise chunk.error
+            return self.pretty_print_result({"success": message, "response": chunk.response})
+
+        summary = report.summary()
+        if report.source_error is not None:
+            # Surface the reading error itself - per-object outcomes stay available on last_batch_report
+            return self.pretty_print_result({"error": f"{message} until reading the input failed",
+                                             "exception message": str(report.source_error), "summary": summary})
+
+        if report.failed_chunks:
+            outcome = {"error": f"{message} with failed chunks - use retry_failed_batch()"}
+        elif report.rejected:
+            outcome = {"error": f"{message} except {len(report.rejected)} objects with invalid props"}
+        else:
+            outcome = {"success": message}
+        return self.pretty_print_result({**outcome, "summary": summary, "response": report.object_rows()})
+
     # Helper method to extract SQL statements from Polaris response and execute
-    def dump_handler(self, response: list[Statement]):
+    def dump_handler(self, response: Iterable[Statement], parallelism: Optional[int] = None):
         """
         Extracts SQL statements from the Polaris response and executes them using Spark.
 
         Args:
-            response (list): List of Statement objects.
+            response (Iterable): Statement objects - a stream is executed while it is still being read
+                (when parallelism is 1).
+            parallelism (int, optional): Statements run at once, defaults to the catalog's dump_parallelism.
+                Above 1, statements that reference each other run in dependency waves.
 
         Returns:
-            dict: Execution result with status.
+            dict: Execution result with status, in the order of the statements.
         """
-        if not response:
+        execution_results, read_error = self._execute_statements(response, parallelism)
+        return self._executions_result(execution_results, read_error)
+
+    def _execute_statements(self, response: Iterable[Statement], parallelism: Optional[int] = None,
+                            unchanged: Optional[Callable[[str], bool]] = None) -> tuple[list[dict[str, Any]], Optional[Exception]]:
+        """Run the statements and return their results, plus the error that cut a streamed response short (if any)."""
+        read_errors: list[Exception] = []
+
+        def formatted_sqls():
+            try:
+                for statement in response:
+                    yield self._normalize(statement.definition)
+            except (ValueError, requests.exceptions.RequestException) as e:
+                # Keep the results of the statements read so far instead of losing them with the exception
+                read_errors.append(e)
+
+        execution_results = run_statements(self.sparkSession.sql, formatted_sqls(), parallelism or self.dump_parallelism,
+                                           unchanged=unchanged, policy=self.statement_policy)
+        return execution_results, (read_errors[0] if read_errors else None)
+
+    @staticmethod
+    def _normalize(definition: str) -> str:
+        # Normalizes indentation (keep relative indents! - should work with the initial indentation of the SQL statement we discussed)
+        return textwrap.dedent(definition).strip()
+
+    def _executions_result(self, execution_results: list[dict[str, Any]], read_error: Optional[Exception]):
+        # The summary (counts, p50/p95 timings, slowest statements) is structured data on the result, e.g. result.data["summary"]
+        if read_error is not None:
+            return self.pretty_print_result({
+                "error": "The pulled statements could not be read completely",
+                "exception message": str(read_error),
+                "executions": execution_results,
+                "summary": execution_summary(execution_results),
+            })
+        if not execution_results:
             return self.pretty_print_result({"error": "No statements found in response"})
+        return self.pretty_print_result({"executions": execution_results, "summary": execution_summary(execution_results)})
 
-        execution_results = []
+    def _pull(self, endpoint: str) -> Iterable[Statement]:
+        """The statements of a /pull endpoint - streamed one by one if streaming_pull is set."""
+        if self.streaming_pull:
+            return (Statement.model_validate(item) for item in self.client.stream_get(endpoint))
+        return statements_from(self.client.get(endpoint, fresh=True))
 
-        for statement in response:
-            sql_text = statement.definition
+    def _sync_statements(self, response: Iterable[Statement], object_type: Optional[str], platform: str, full: bool = False):
+        execution_results, read_error = self._apply_sync(response, object_type, platform, full)
+        return self._executions_result(execution_results, read_error)
 
-            # Normalizes indentation (keep relative indents! - should work with the initial indentation of the SQL statement we discussed)
-            formatted_sql = textwrap.dedent(sql_text).strip()
+    def _apply_sync(self, response: Iterable[Statement], object_type: Optional[str], platform: str,
+                    full: bool = False) -> tuple[list[dict[str, Any]], Optional[Exception]]:
+        """
+        Execute pulled statements. With a sync_state_dir, only statements that changed since the last
+        sync of this (object_type, platform) are executed - unless `full` is set - and the watermark is
+        updated with every statement that is now applied.
+        """
+        if self.sync_state is None:
+            return self._execute_statements(response)
 
-            try:
-                # Execute the SQL statement using Spark
-                self.sparkSession.sql(formatted_sql)
-                execution_results.append({"sql": formatted_sql, "status": "executed"})
-            except Exception as e:
-                execution_results.append({"sql": formatted_sql, "status": "failed", "error": str(e)})
+        execution_results, read_error = self._execute_statements(response, unchanged=self._watermark_filter(object_type, platform, full))
+
+        # Statements no longer in the pull drop out of the watermark; failed ones are retried next time.
+        # An incomplete pull leaves the watermark as it was, so nothing is wrongly considered applied.
+        if execution_results and read_error is None:
+            self.sync_state.save(object_type, platform, {
+                statement_hash(result["sql"]) for result in execution_results if result["status"] in APPLIED
+            })
+        return execution_results, read_error
+
+    def _watermark_filter(self, object_type: Optional[str], platform: str, full: bool = False) -> Optional[Callable[[str], bool]]:
+        """Predicate for statements the last sync already applied, or None without a sync_state_dir."""
+        if self.sync_state is None:
+            return None
+        applied = set() if full else self.sync_state.load(object_type, platform)
+
+        # Session-scoped (TEMPORARY) objects are gone in a new session, so they always run. So does a
+        # statement whose object is missing from Spark's catalog, e.g. in a session without a metastore.
+        def unchanged(sql_text: str) -> bool:
+            return (statement_hash(sql_text) in applied and not is_session_scoped(sql_text)
+                    and self._defines_existing(sql_text))
+
+        return unchanged
+
+    def _defines_existing(self, sql_text: str) -> bool:
+        """Whether the object a CREATE statement defines is in Spark's catalog. True for any other statement."""
+        definition = parse_definition(sql_text)
+        if definition is None:
+            return True
+        catalog = self.sparkSession.catalog
+        if definition.kind == "function":
+            return bool(catalog.functionExists(definition.name))
+        return bool(catalog.tableExists(definition.name))
+
+    def sync(self, platforms: Union[str, Sequence[str]], object_types: Optional[Sequence[str]] = None, full: bool = False,
+             dry_run: bool = False):
+        """
+        Sync several platforms and/or object types at once (see SYNC OPEN ... FOR <p1>, <p2>).
+
+        All pulls are fetched concurrently, up to max_in_flight at a time. Statements for Spark are executed
+        here as their pull arrives; statements for other platforms are kept in last_sync_statements,
+        keyed by (object_type, platform), for the engines they target.
+
+        Args:
+            platforms (str or list[str]): Platforms to sync.
+            object_types (list[str], optional): Object types to sync - defaults to every type (SYNC OPEN OBJECTS).
+            full (bool): Ignore the sync watermark and re-execute every statement.
+            dry_run (bool): Execute nothing and return the plan for the Spark statements instead (see plan_sync).
 
-        return self.pretty_print_result({"executions": execution_results})
+        Returns:
+            One row per (platform, object type) with statement counts and pull/execution timings.
+        """
+        platforms = [platforms] if isinstance(platforms, str) else list(platforms)
+        return self._sync_many(tuple(object_types) if object_types else (None,), platforms, full, dry_run)
+
+    def plan_sync(self, platform: str = LOCAL_PLATFORM, object_type: Optional[str] = None, full: bool = False):
+        """
+        Dry run of a SYNC (see SYNC ... PLAN): pull and normalize the statements, drop repeated definitions
+        and compare them with Spark's catalog. Nothing is executed; apply_sync_plan() then runs only the delta.
+
+        Args:
+            platform (str): Platform to pull for.
+            object_type (str, optional): Object type to pull - defaults to every type (SYNC OPEN OBJECTS).
+            full (bool): Ignore the sync watermark, so already applied statements are planned again.
+
+        Returns:
+            One row per statement with its action (create, replace or no-op) and the reason.
+        """
+        endpoint = f"/objects/{object_type}/platforms/{platform.lower()}/pull" if object_type else f"/platforms/{platform.lower()}/pull"
+        try:
+            statements = statements_from(self.client.get(endpoint, fresh=True))
+        except requests.exceptions.HTTPError as e:
+            return self.pretty_print_result({"error": "HTTP Error", "details": str(e)})
+        return self._plan_result([self._plan(statements, object_type, platform.lower(), full)])
+
+    def apply_sync_plan(self, plans: Optional[Sequence[SyncPlan]] = None):
+        """
+        Execute the creates and replaces of planned syncs, skipping their no-ops.
+
+        Args:
+            plans (list[SyncPlan], optional): Plans to apply, defaults to those of the last dry run.
+        """
+        plans = list(plans) if plans is not None else self.last_sync_plans
+        if not plans:
+            return self.pretty_print_result({"error": "No sync plan to apply"})
+
+        execution_results = []
+        for plan in plans:
+            results = run_statements(self.sparkSession.sql, plan.delta, self.dump_parallelism, policy=self.statement_policy)
+            if self.sync_state is not None:
+                executed = {result["sql"] for result in results if result["status"] in APPLIED}
+                self.sync_state.save(plan.object_type, plan.platform, {
+                    statement_hash(statement.sql) for statement in plan.statements if statement.action == NO_OP or statement.sql in executed
+                })
+            execution_results.extend(results)
+
+        if not execution_results:
+            return self.pretty_print_result({"success": "Nothing to execute - every planned statement is a no-op"})
+        return self._executions_result(execution_results, None)
+
+    def _plan(self, statements: list[Statement], object_type: Optional[str], platform: str, full: bool = False) -> SyncPlan:
+        normalized = [self._normalize(statement.definition) for statement in statements]
+        return plan_statements(normalized, self._existing_objects, object_type, platform, self._watermark_filter(object_type, platform, full))
+
+    def _existing_objects(self, kind: str) -> set[str]:
+        """Lower-cased names of the functions (kind "function") or tables and views in the Spark catalog."""
+        catalog = self.sparkSession.catalog
+        listing = catalog.listFunctions() if kind == "function" else catalog.listTables()
+        return {item.name.lower() for item in listing}
+
+    def _plan_result(self, plans: list[SyncPlan]):
+        self.last_sync_plans = plans
+        summary = {"statements": 0, CREATE: 0, REPLACE: 0, NO_OP: 0}
+        for plan in plans:
+            for key, count in plan.summary().items():
+                summary[key] += count
+        rows = [{"platform": plan.platform, "object_type": plan.object_type or "*", **row} for plan in plans for row in plan.rows()]
+        return self.pretty_print_result({"success": "Sync planned - apply_sync_plan() executes the creates and replaces",
+                                         "summary": summary, "response": rows})
+
+    def render_statements(self, object_type: str, platform: str, objects: Optional[Iterable[dict[str, Any]]] = None) -> list[Statement]:
+        """
+        Render statements on the client from the cached platform mapping, instead of through /pull.
+
+        Args:
+            object_type (str): Type of the objects.
+            platform (str): Platform whose mapping is used.
+            objects (Iterable[dict], optional): Serialized Udo objects held locally - fetched with
+                GET /objects/<object_type> if not given.
+        """
+        renderer = self.mappings.renderer(object_type, platform)
+        if objects is None:
+            response = self.client.get(f"/objects/{object_type}")
+            objects = response.get("objects", []) if isinstance(response, dict) else response
+        return renderer.render_all(objects)
+
+    def sync_local(self, object_type: str, platform: str = LOCAL_PLATFORM, objects: Optional[Iterable[dict[str, Any]]] = None,
+                   full: bool = False, verify: bool = False):
+        """
+        SYNC with statements rendered on the client (see render_statements). With cached mappings and
+        locally held objects this needs no server round trip at all.
+
+        Args:
+            object_type (str): Type of the objects.
+            platform (str): Target platform - statements are only executed for Spark, and returned otherwise.
+            objects (Iterable[dict], optional): Serialized Udo objects, fetched from the server if not given.
+            full (bool): Ignore the sync watermark and re-execute every statement.
+            verify (bool): Execute nothing; compare the local rendering with the server's /pull output
+                and list the statements that differ.
+        """
+        try:
+            statements = self.render_statements(object_type, platform, objects)
+            if verify:
+                return self._verify_rendering(statements, object_type, platform)
+        except KeyError as e:
+            return self.pretty_print_result({"error": "Mapping not available", "exception message": str(e.args[0])})
+        except requests.exceptions.HTTPError as e:
+            return self.pretty_print_result({"error": "HTTP Error", "details": str(e)})
+
+        if platform.lower() != LOCAL_PLATFORM:
+            return self.pretty_print_result({"success": "Statements rendered", "response": [statement.model_dump() for statement in statements]})
+        return self._sync_statements(statements, object_type, platform.lower(), full)
+
+    def _verify_rendering(self, statements: list[Statement], object_type: str, platform: str):
+        def normalized(definitions: Iterable[str]) -> Counter:
+            return Counter(self._normalize(definition) for definition in definitions)
+
+        local = normalized(statement.definition for statement in statements)
+        server = normalized(item["definition"] for item in self.client.get(f"/objects/{object_type}/platforms/{platform.lower()}/pull", fresh=True))
+
+        # Order-insensitive: a statement differs if it is rendered a different number of times on each side
+        differences = [
+            {"definition": definition, "local": local[definition], "server": server[definition],
+             "difference": "only local" if not server[definition] else "only on server" if not local[definition] else "count differs"}
+            for definition in sorted(local.keys() | server.keys())
+            if local[definition] != server[definition]
+        ]
+        summary = {"local": sum(local.values()), "server": sum(server.values()), "differences": len(differences)}
+        if differences:
+            return self.pretty_print_result({"error": "Local rendering differs from the server", "summary": summary, "response": differences})
+        return self.pretty_print_result({"success": "Local rendering matches the server", "summary": summary})
+
+    def _sync_many(self, object_types: Sequence[Optional[str]], platforms: Sequence[str], full: bool = False, dry_run: bool = False):
+        targets = [(object_type, platform.lower()) for platform in platforms for object_type in object_types]
+
+        def pull(target: tuple[Optional[str], str]) -> tuple[list[Statement], float]:
+            object_type, platform = target
+            endpoint = f"/objects/{object_type}/platforms/{platform}/pull" if object_type else f"/platforms/{platform}/pull"
+            started = time.perf_counter()
+            statements = statements_from(self.client.get(endpoint, fresh=True))
+            return statements, time.perf_counter() - started
+
+        rows: dict[tuple[Optional[str], str], dict[str, Any]] = {}
+        plans: dict[tuple[Optional[str], str], SyncPlan] = {}
+        self.last_sync_statements = {}
+
+        # Pulls complete in any order; Spark statements run while the remaining pulls are still in flight
+        for target, pulled, error in bounded_map(pull, targets, self.max_in_flight):
+            object_type, platform = target
+            row = rows[target] = {
+                "platform": platform, "object_type": object_type or "*", "statements": 0, "executed": 0, "unchanged": 0,
+                "failed": 0, "pull_seconds": None, "execute_seconds": None, "error": None,
+            }
+            if error is not None:
+                row["error"] = str(error)
+                continue
+
+            statements, row["pull_seconds"] = pulled
+            row["statements"] = len(statements)
+            if platform != LOCAL_PLATFORM:
+                self.last_sync_statements[target] = [statement.definition for statement in statements]
+                continue
+
+            if dry_run:
+                plans[target] = self._plan(statements, object_type, platform, full)
+                continue
+
+            started = time.perf_counter()
+            execution_results, _ = self._apply_sync(statements, object_type, platform, full)
+            row["execute_seconds"] = time.perf_counter() - started
+            for result in execution_results:
+                status = "failed" if result["status"] == "skipped" else result["status"]
+                row[status] += 1
+
+        if dry_run:
+            pull_errors = [f"{platform} {object_type or '*'}: {rows[(object_type, platform)]['error']}"
+                           for object_type, platform in targets if rows[(object_type, platform)]["error"]]
+            if pull_errors:
+                return self.pretty_print_result({"error": "Some pulls failed", "details": pull_errors})
+            return self._plan_result([plans[target] for target in targets if target in plans])
+
+        ordered_rows = [rows[target] for target in targets]
+        for row in ordered_rows:
+            # A failed pull or any failed statement fails the target - the status column says so in every result mode
+            row["status"] = "failed" if row["error"] or row["failed"] else "succeeded"
+        failed = sum(row["status"] == "failed" for row in ordered_rows)
+        outcome = {"error": f"Sync finished with errors on {failed} of {len(ordered_rows)} targets"} if failed else {"success": "Sync finished"}
+        summary = {"targets": len(ordered_rows), "failed_targets": failed}
+        return self.pretty_print_result({**outcome, "summary": summary, "response": ordered_rows})
 
     def validate_data_type(self, props: dict[str, str]) -> dict[str, str]:
         """
@@ -293,20 +908,54 @@ class OpenDicCatalog(Catalog):
     def pretty_print_result(self, result: dict):
         """
         Pretty print the result in a readable format.
-        """
-        pd.set_option("display.width", None)  # Auto-detect terminal width
-        pd.set_option("display.max_colwidth", None)  # Show full content of each cell
-        pd.set_option("display.max_rows", None)  # Show all rows
-        pd.set_option("display.expand_frame_repr", False)  # Don't wrap to multiple lines
 
+        Objects and lists of objects are returned as a table in the catalog's result_mode, with the rest of the
+        result (the success message, a summary) in the table's attrs. Failures - any result with an "error" -
+        and everything else (messages etc.) are returned as a PrettyResponse, so per-object rows of a partly
+        failed command are shown next to the error and its summary instead of as a table that looks like success.
+        """
         response = result.get("response")
 
+        if "error" in result:
+            return PrettyResponse(result)
+
         # Polaris-spec-compliant "good" responses, so objects or lists of objects
         if isinstance(response, list) and all(isinstance(item, dict) for item in response):
-            return pd.DataFrame(response)
+            return self._with_outcome(self._result_table(response), result)
 
         elif isinstance(response, dict):
-            return pd.DataFrame([response])
+            return self._with_outcome(self._result_table([response]), result)
 
-        # Everything else — errors, messages, etc.
+        # Everything else — messages etc.
         return PrettyResponse(result)
+
+    def _with_outcome(self, table, result: dict):
+        """Attach the result's message and summary to the table: attrs of a pandas frame or LazyResult, schema metadata of a pyarrow.Table."""
+        outcome = {key: value for key, value in result.items() if key != "response"}
+        if isinstance(table, LazyResult) or self.result_mode == PANDAS:
+            table.attrs.update(outcome)
+        elif self.result_mode == ARROW:
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"opendic": json.dumps(outcome, default=str)})
+        # A Spark DataFrame has no place for it - the table is returned as is
+        return table
+
+    def _result_table(self, rows: list[dict[str, Any]]):
+        if self.result_mode == LAZY:
+            return LazyResult(rows, self.sparkSession)
+        if self.result_mode == SPARK:
+            return rows_to_spark(self.sparkSession, rows)
+        if self.result_mode == ARROW:
+            return rows_to_arrow(rows)
+        configure_pandas_display()
+        return pd.DataFrame(rows)
+
+    def _typed_result(self, objects: list[dict[str, Any]], schema: TypeSchema):
+        if self.result_mode == LAZY:
+            return LazyResult(objects, self.sparkSession, build_frame=lambda: schema.project(objects))
+        frame = schema.project(objects)
+        if self.result_mode == SPARK:
+            return arrow_to_spark(self.sparkSession, frame_to_arrow(frame))
+        if self.result_mode == ARROW:
+            return frame_to_arrow(frame)
+        configure_pandas_display()
+        return frame
@@ -1,42 +1,220 @@
-from typing import Any
+from typing import Any, Callable, Iterator, Optional, Union
 import requests
+from requests.adapters import HTTPAdapter
+
+from pyspark_opendic.cache import MISSING, ResponseCache, ValidatorCache
+from pyspark_opendic.retry import RetryPolicy
+from pyspark_opendic.streaming import iter_json_array
+from pyspark_opendic.token_manager import TokenManager
 
 
 class OpenDicClient:
-    def __init__(self, api_url : str, credentials : str) -> None:
+    def __init__(self, api_url : str, credentials : str,
+                 pool_connections : int = 10,
+                 pool_maxsize : int = 10,
+                 pool_block : bool = False,
+                 timeout : Union[float, tuple[float, float]] = (5.0, 30.0),
+                 share_token : bool = True,
+                 token_cache_dir : Optional[str] = None,
+                 token_refresh_margin : float = 60.0,
+                 retry_policy : Optional[RetryPolicy] = None,
+                 cache : Optional[ResponseCache] = None,
+                 validators : Optional[ValidatorCache] = None) -> None:
+        """
+        REST client for the OpenDic Polaris extension.
+
+        All verbs and the OAuth token call share one keep-alive connection pool, so repeated
+        commands reuse the same TCP/TLS connection instead of handshaking on every request.
+
+        Args:
+            api_url (str): Base URL of the Polaris server.
+            credentials (str): "<client_id>:<client_secret>".
+            pool_connections (int): Number of distinct hosts to keep a connection pool for.
+            pool_maxsize (int): Maximum number of kept-alive connections per host.
+            pool_block (bool): Block when all connections to a host are busy instead of opening throwaway ones.
+            timeout (float | tuple): Request timeout in seconds, or a (connect, read) tuple.
+            share_token (bool): Reuse one token manager for all clients with the same credentials in this process.
+            token_cache_dir (str, optional): Directory for an on-disk token cache shared across processes.
+            token_refresh_margin (float): Seconds before expiry at which the token is refreshed in the background.
+            retry_policy (RetryPolicy, optional): Backoff/retry behaviour, defaults to RetryPolicy().
+            cache (ResponseCache, optional): Opt-in TTL cache for GET responses, invalidated by writes through this client.
+            validators (ValidatorCache, optional): Opt-in ETag/Last-Modified store used to send conditional GETs.
+
+        The OAuth token is fetched lazily on the first request (or reused from the shared cache).
+        """
         self.api_url : str = api_url
         self.credentials : str = credentials
-        self.oauth_token : str = self.get_polaris_oauth_token(credentials)
-    
-    def post(self, endpoint : str, data : dict) -> dict[str, Any]:
+        self.timeout : Union[float, tuple[float, float]] = timeout
+        self.retry_policy : RetryPolicy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.cache : Optional[ResponseCache] = cache
+        self.validators : Optional[ValidatorCache] = validators
+        self.session : requests.Session = self._build_session(pool_connections, pool_maxsize, pool_block)
+
+        if share_token:
+            # The shared manager outlives this client, so it fetches through its own token-only client
+            fetch_token = _token_fetcher(api_url, credentials, timeout, self.retry_policy)
+            self.token_manager : TokenManager = TokenManager.shared(api_url, credentials, fetch_token, token_cache_dir=token_cache_dir, refresh_margin=token_refresh_margin)
+        else:
+            fetch_token = lambda: self.request_oauth_token(credentials)
+            client_id, credentials_hash = TokenManager.credentials_key(api_url, credentials)
+            self.token_manager = TokenManager(fetch_token, refresh_margin=token_refresh_margin,
+                                              cache_file=TokenManager.cache_file_for(token_cache_dir, api_url, client_id),
+                                              credentials_hash=credentials_hash)
+
+    @property
+    def oauth_token(self) -> str:
+        return self.token_manager.get_token()
+
+    @staticmethod
+    def _build_session(pool_connections : int, pool_maxsize : int, pool_block : bool) -> requests.Session:
+        session = requests.Session()
+        # Retries are not handled by urllib3 - a failed request surfaces as an exception to the caller
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _send(self, method : str, url : str, headers : Optional[dict[str, str]] = None, authorized : bool = True, replay_safe : bool = False, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session, retrying according to self.retry_policy.
+
+        A 401 refreshes the token and replays the request once. Retryable statuses and connection
+        errors are retried with backoff, but only for idempotent methods or replay-safe requests.
+        The response of the last attempt is returned, or its HTTPError raised.
+        """
+        policy = self.retry_policy
+        can_replay = policy.can_replay(method, replay_safe)
+        reauthenticated = False
+        attempt = 0
+
+        while True:
+            attempt += 1
+            request_headers = dict(headers or {})
+            if authorized:
+                token = self.oauth_token
+                request_headers = {"Authorization": f"Bearer {token}", **request_headers}
+
+            try:
+                response : requests.Response = self.session.request(method, url, timeout=self.timeout, headers=request_headers, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                delay = policy.delay_for(attempt) if can_replay and policy.retry_connection_errors else None
+                if delay is None:
+                    raise
+                policy.sleep(delay)
+                continue
+
+            # The request was rejected before it was processed, so replaying it is safe for any method
+            if response.status_code == 401 and authorized and policy.reauthenticate and not reauthenticated:
+                reauthenticated = True
+                attempt -= 1  # Re-authentication does not use up an attempt
+                self.token_manager.refresh(stale_token=token)
+                continue
+
+            if response.status_code in policy.retry_statuses and can_replay:
+                delay = policy.delay_for(attempt, response)
+                if delay is not None:
+                    policy.sleep(delay)
+                    continue
+
+            response.raise_for_status() # Raise an exception if the response is not successful
+            return response
+
+    def post(self, endpoint : str, data : dict, replay_safe : bool = False) -> dict[str, Any]:
+        """POST to the OpenDic API. Set replay_safe if sending the same body twice has no extra effect, so it can be retried."""
         url : str = self.api_url+ "/opendic/v1" + endpoint
-        response : requests.Response = requests.post(url, json=data, headers={"Authorization": f"Bearer {self.oauth_token}", "Content-Type": "application/json"})
-        response.raise_for_status() # Raise an exception if the response is not successful
-        return response.json()    
-    
-    def get(self, endpoint : str):
-        url : str = self.api_url + "/opendic/v1" + endpoint
-        response : requests.Response = requests.get(url, headers={"Authorization": f"Bearer {self.oauth_token}"})
-        response.raise_for_status() # Raise an exception if the response is not successful
+        try:
+            response : requests.Response = self._send("POST", url, json=data, headers={"Content-Type": "application/json"}, replay_safe=replay_safe)
+        finally:
+            self._invalidate_cache(endpoint)
         return response.json()
-    
+
+    # fresh=True skips the response cache (a conditional GET may still answer from the validator cache)
+    def get(self, endpoint : str, fresh : bool = False):
+        if self.cache is not None and not fresh:
+            cached = self.cache.get(endpoint)
+            if cached is not MISSING:
+                return cached
+
+        url : str = self.api_url + "/opendic/v1" + endpoint
+        if self.validators is None:
+            result = self._send("GET", url).json()
+        else:
+            result = self._conditional_get(endpoint, url)
+
+        if self.cache is not None:
+            self.cache.put(endpoint, result)
+        return result
+
+    def stream_get(self, endpoint : str, chunk_size : int = 64 * 1024) -> Iterator[Any]:
+        """
+        GET an endpoint that returns a JSON array and yield its items while the body is still downloading.
+        Memory is bounded by the largest item, not by the response. Streamed responses are not cached.
+        The request is sent right away, so an error status raises its HTTPError here rather than while iterating.
+        """
+        url : str = self.api_url + "/opendic/v1" + endpoint
+        response : requests.Response = self._send("GET", url, stream=True)
+        return self._stream_items(response, chunk_size)
+
+    @staticmethod
+    def _stream_items(response : requests.Response, chunk_size : int) -> Iterator[Any]:
+        try:
+            yield from iter_json_array(response.iter_content(chunk_size=chunk_size))
+        finally:
+            response.close()
+
+    # GET with If-None-Match / If-Modified-Since - on a 304 the stored body is returned
+    def _conditional_get(self, endpoint : str, url : str):
+        entry = self.validators.get(endpoint)
+        response : requests.Response = self._send("GET", url, headers=self.validators.conditional_headers(entry if entry is not MISSING else None))
+
+        if response.status_code == 304 and entry is not MISSING:
+            return self.validators.record_not_modified(entry, response)
+
+        result = response.json()
+        self.validators.store(endpoint, response, result)
+        return result
+
     def put(self, endpoint : str, data : dict) -> dict[str, Any]:
         url : str = self.api_url + "/opendic/v1" + endpoint
-        response : requests.Response = requests.put(url, json=data, headers={"Authorization": f"Bearer {self.oauth_token}"})
-        response.raise_for_status() # Raise an exception if the response is not successful
+        try:
+            response : requests.Response = self._send("PUT", url, json=data)
+        finally:
+            self._invalidate_cache(endpoint)
         return response.json()
-    
+
     def delete(self, endpoint : str) -> dict[str, Any]:
         url : str = self.api_url + "/opendic/v1" + endpoint
-        response : requests.Response = requests.delete(url, headers={"Authorization": f"Bearer {self.oauth_token}"})
-        response.raise_for_status() # Raise an exception if the response is not successful
+        try:
+            response : requests.Response = self._send("DELETE", url)
+        finally:
+            self._invalidate_cache(endpoint)
         return response.json()
-    
-    def refresh_oauth_token(self, credentials:str):
-        self.oauth_token = self.get_polaris_oauth_token(credentials)
+
+    # Even a failed write may have been (partially) applied, so cached listings are always dropped
+    def _invalidate_cache(self, endpoint : str) -> None:
+        if self.cache is not None:
+            self.cache.invalidate_for_write(endpoint)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "OpenDicClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def refresh_oauth_token(self, credentials:Optional[str] = None):
+        # The token manager fetches with the credentials the client was created with
+        self.token_manager.refresh()
 
     # Helper function to get the OAuth token
     def get_polaris_oauth_token(self, credentials:str) -> str:
+        return self.request_oauth_token(credentials)["access_token"]
+
+    # Helper function to get the full OAuth token response (access_token, expires_in, ...)
+    def request_oauth_token(self, credentials:str) -> dict[str, Any]:
         client_id = credentials.split(":")[0]
         client_secret= credentials.split(":")[1]
 
@@ -47,7 +225,24 @@ class OpenDicClient:
             "client_secret": f"{client_secret}",
             "scope": "PRINCIPAL_ROLE:ALL"
         }
-        response : requests.Response = requests.post(url, data=data, headers={"Content-Type": "application/x-www-form-urlencoded"})
-        response.raise_for_status()
+        # Requesting a client-credentials token twice has no side effects, so the call may be replayed
+        response : requests.Response = self._send("POST", url, data=data, headers={"Content-Type": "application/x-www-form-urlencoded"}, authorized=False, replay_safe=True)
+
+        return response.json()
+
+
+def _token_fetcher(api_url : str, credentials : str, timeout : Union[float, tuple[float, float]], retry_policy : RetryPolicy) -> Callable[[], dict[str, Any]]:
+    """
+    A token fetch function for a shared TokenManager that does not depend on any catalog's client.
+    Its small token-only client is created on the first fetch, so clients that find the manager
+    already registered never build one.
+    """
+    token_client : list[OpenDicClient] = []
+
+    def fetch() -> dict[str, Any]:
+        if not token_client:
+            token_client.append(OpenDicClient(api_url, credentials, pool_connections=1, pool_maxsize=1, timeout=timeout,
+                                              share_token=False, retry_policy=retry_policy))
+        return token_client[0].request_oauth_token(credentials)
 
-        return response.json()["access_token"]
+    return fetch
@@ -0,0 +1,256 @@
+import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+# CREATE [OR REPLACE | OR ALTER] [GLOBAL] [TEMPORARY] FUNCTION | VIEW | TABLE [IF NOT EXISTS] <name>
+_DEFINITION = re.compile(
+    r"\s*CREATE\s+(OR\s+(?:REPLACE|ALTER)\s+)?(?:(?:GLOBAL\s+)?TEMP(?:ORARY)?\s+)?(?:MATERIALIZED\s+)?"
+    r"(FUNCTION|VIEW|TABLE)\s+(IF\s+NOT\s+EXISTS\s+)?([\w.`]+)",
+    re.IGNORECASE,
+)
+_IDENTIFIER = re.compile(r"\w+")
+
+# Result statuses of statements whose definition is in place afterwards
+APPLIED = ("executed", "unchanged")
+
+
+class Definition(NamedTuple):
+    kind: str  # "function", "view" or "table"
+    name: str  # unqualified and lower-cased
+    replaces: bool  # OR REPLACE / OR ALTER
+    if_not_exists: bool
+
+
+def parse_definition(sql_text: str) -> Optional[Definition]:
+    """What a CREATE FUNCTION/VIEW/TABLE statement defines, or None for any other statement."""
+    match = _DEFINITION.match(sql_text)
+    if not match:
+        return None
+    replaces, kind, if_not_exists, name = match.groups()
+    return Definition(kind.lower(), name.replace("`", "").rsplit(".", 1)[-1].lower(), bool(replaces), bool(if_not_exists))
+
+
+def defined_name(sql_text: str) -> Optional[str]:
+    """The unqualified, lower-cased name a CREATE FUNCTION/VIEW/TABLE statement defines, or None."""
+    definition = parse_definition(sql_text)
+    return definition.name if definition else None
+
+
+def dependency_graph(sql_texts: list[str]) -> list[set[int]]:
+    """
+    For every statement, the indexes of the earlier statements it depends on: those defining a name it
+    mentions (including earlier definitions of its own name, so the last definition still wins), and for a
+    definition, the other statements mentioning its name (e.g. a DROP FUNCTION f before CREATE FUNCTION f).
+    Only earlier statements count, so running the waves has the effect of running the statements in order.
+    Mentions are matched as whole words, which may over-approximate but never misses a dependency by name.
+    """
+    names = [defined_name(sql_text) for sql_text in sql_texts]
+    definers: dict[str, list[int]] = {}
+    for index, name in enumerate(names):
+        if name:
+            definers.setdefault(name, []).append(index)
+
+    dependencies: list[set[int]] = []
+    mentioned_by: dict[str, list[int]] = {}  # Name -> the statements so far that mention it without defining anything
+    for index, sql_text in enumerate(sql_texts):
+        mentioned = set(_IDENTIFIER.findall(sql_text.lower())) & definers.keys()
+        depends_on = {definer for word in mentioned for definer in definers[word] if definer < index}
+        if names[index]:
+            depends_on.update(mentioned_by.get(names[index], ()))
+        else:
+            for word in mentioned:
+                mentioned_by.setdefault(word, []).append(index)
+        dependencies.append(depends_on)
+    return dependencies
+
+
+def dependency_waves(dependencies: list[set[int]]) -> list[list[int]]:
+    """
+    Group statements into waves: each wave only depends on earlier waves, so its statements can run
+    concurrently. A dependency cycle is broken by running its earliest statement on its own.
+    """
+    dependents: list[list[int]] = [[] for _ in dependencies]
+    waiting_on = [len(depends_on) for depends_on in dependencies]
+    for index, depends_on in enumerate(dependencies):
+        for dependency in depends_on:
+            dependents[dependency].append(index)
+
+    remaining = set(range(len(dependencies)))
+    ready = [index for index in range(len(dependencies)) if not waiting_on[index]]
+    waves: list[list[int]] = []
+
+    while remaining:
+        if not ready:
+            ready = [min(remaining)]
+        waves.append(ready)
+        remaining.difference_update(ready)
+
+        unblocked = set()
+        for index in ready:
+            for dependent in dependents[index]:
+                waiting_on[dependent] -= 1
+                if waiting_on[dependent] <= 0 and dependent in remaining:
+                    unblocked.add(dependent)
+        ready = sorted(unblocked)
+
+    return waves
+
+
+class StatementPolicy:
+    """
+    How run_statements treats failing statements.
+
+    A statement whose error looks transient (a timeout, a lost connection, a metastore lock...) is
+    retried with exponential backoff, up to `max_attempts` attempts in total. Any other error fails the
+    statement at once. With `fail_fast`, the first failed statement stops the run and every statement
+    that has not started yet is reported as skipped; otherwise the remaining statements still run.
+    """
+
+    # Lower-cased fragments of error messages that indicate a transient condition
+    TRANSIENT_ERRORS = (
+        "timeout", "timed out", "connection reset", "connection refused", "broken pipe",
+        "temporarily unavailable", "too many requests", "could not acquire lock", "concurrentmodification",
+    )
+
+    def __init__(self,
+                 max_attempts: int = 1,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 10.0,
+                 fail_fast: bool = False,
+                 is_transient: Optional[Callable[[Exception], bool]] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            max_attempts (int): Total attempts per statement, including the first one.
+            backoff_base (float): Delay in seconds before the first retry; doubled on each further retry.
+            backoff_max (float): Upper bound for a single backoff delay.
+            fail_fast (bool): Stop at the first failed statement instead of continuing with the others.
+            is_transient (Callable[[Exception], bool], optional): Decides which errors are retried,
+                defaults to matching TRANSIENT_ERRORS against the error message.
+            sleep (Callable): Sleep function, replaceable in tests.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.fail_fast = fail_fast
+        self.is_transient = is_transient or self._matches_transient_error
+        self.sleep = sleep
+
+    @classmethod
+    def _matches_transient_error(cls, error: Exception) -> bool:
+        if isinstance(error, (ConnectionError, TimeoutError)):
+            return True
+        message = str(error).lower()
+        return any(fragment in message for fragment in cls.TRANSIENT_ERRORS)
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based)."""
+        return min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+
+
+def run_statements(execute: Callable[[str], Any], sql_texts: Iterable[str], parallelism: int = 1,
+                   unchanged: Optional[Callable[[str], bool]] = None,
+                   policy: Optional[StatementPolicy] = None) -> list[dict[str, Any]]:
+    """
+    Execute statements and return one result per statement, in the original order.
+
+    With parallelism 1 the statements run one after another as they are read from `sql_texts`, so
+    a streamed input starts executing before it is complete. Otherwise all statements are read first
+    and run in dependency waves on a thread pool of that size; a statement whose dependency failed is skipped.
+
+    Args:
+        execute (Callable[[str], Any]): Runs one statement, e.g. SparkSession.sql.
+        sql_texts (Iterable[str]): The statements.
+        parallelism (int): Maximum number of statements running at once.
+        unchanged (Callable[[str], bool], optional): Statements it returns True for are already applied
+            and are reported as "unchanged" without running.
+        policy (StatementPolicy, optional): Retries and fail-fast behaviour - by default every statement
+            runs once and a failure does not stop the others.
+
+    Returns:
+        list[dict]: {"sql", "status": "executed" | "unchanged" | "failed" | "skipped", "seconds", "attempts",
+            "error" (if failed or skipped)}. "seconds" is the wall time including retries.
+    """
+    policy = policy or StatementPolicy()
+    stopped: list[int] = []  # Index of the statement that stopped a fail-fast run
+
+    def skipped(sql_text: str, reason: str) -> dict[str, Any]:
+        return {"sql": sql_text, "status": "skipped", "seconds": 0.0, "attempts": 0, "error": reason}
+
+    def run(index: int, sql_text: str) -> dict[str, Any]:
+        if unchanged is not None and unchanged(sql_text):
+            return {"sql": sql_text, "status": "unchanged", "seconds": 0.0, "attempts": 0}
+        if stopped:
+            return skipped(sql_text, f"Not run - statement {stopped[0]} failed and fail_fast is set")
+
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                execute(sql_text)
+                return {"sql": sql_text, "status": "executed", "seconds": time.perf_counter() - started, "attempts": attempt}
+            except Exception as e:
+                if attempt < policy.max_attempts and policy.is_transient(e):
+                    policy.sleep(policy.backoff(attempt))
+                    continue
+                if policy.fail_fast:
+                    stopped.append(index)
+                return {"sql": sql_text, "status": "failed", "seconds": time.perf_counter() - started, "attempts": attempt, "error": str(e)}
+
+    if parallelism <= 1:
+        return [run(index, sql_text) for index, sql_text in enumerate(sql_texts)]
+
+    sql_texts = list(sql_texts)
+    dependencies = dependency_graph(sql_texts)
+    results: list[Optional[dict[str, Any]]] = [None] * len(sql_texts)
+
+    def run_unless_blocked(index: int) -> dict[str, Any]:
+        failed = sorted(dependency for dependency in dependencies[index]
+                        if results[dependency] is not None and results[dependency]["status"] not in APPLIED)
+        if failed:
+            return skipped(sql_texts[index], f"Depends on statement {failed[0]}, which did not run")
+        return run(index, sql_texts[index])
+
+    with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="opendic-dump") as executor:
+        for wave in dependency_waves(dependencies):
+            for index, result in zip(wave, executor.map(run_unless_blocked, wave)):
+                results[index] = result
+
+    return results
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def execution_summary(results: list[dict[str, Any]], slowest: int = 5) -> dict[str, Any]:
+    """
+    Statistics over run_statements results: counts per status, how many statements needed a retry, and
+    p50/p95/max wall time and the slowest statements among those that ran.
+    """
+    counts = {status: 0 for status in ("executed", "unchanged", "failed", "skipped")}
+    for result in results:
+        counts[result["status"]] += 1
+
+    ran = [result for result in results if result["status"] in ("executed", "failed")]
+    seconds = sorted(result["seconds"] for result in ran)
+    return {
+        "statements": len(results),
+        **counts,
+        "retried": sum(result["attempts"] > 1 for result in ran),
+        "total_seconds": sum(seconds),
+        "p50_seconds": _percentile(seconds, 50) if seconds else None,
+        "p95_seconds": _percentile(seconds, 95) if seconds else None,
+        "max_seconds": seconds[-1] if seconds else None,
+        "slowest": [
+            {"sql": result["sql"], "seconds": result["seconds"], "status": result["status"]}
+            for result in sorted(ran, key=lambda result: result["seconds"], reverse=True)[:slowest]
+        ],
+    }
@@ -0,0 +1,39 @@
+from typing import Any, Iterable, Optional
+
+from pydantic import TypeAdapter
+
+from pyspark_opendic.model.openapi_models import Statement, Udo
+
+# Built once - a TypeAdapter compiles its validator and serializer on construction
+STATEMENT_LIST = TypeAdapter(list[Statement])
+UDO_LIST = TypeAdapter(list[Udo])
+
+# The optional Udo fields and their defaults, in field order, as Udo.model_dump() emits them
+_UDO_DEFAULTS = {name: field.default for name, field in Udo.model_fields.items() if name not in ("type", "name", "props")}
+
+
+def statements_from(items: Any) -> list[Statement]:
+    """
+    The statements of a /pull response, validated as one list in a single call.
+
+    There is no trusted path here: the response comes from the server, and Statement.model_construct
+    is slower than validating the list in one call anyway.
+    """
+    return STATEMENT_LIST.validate_python(items)
+
+
+def udo_dict(object_type: str, name: str, props: Optional[dict[str, Any]], trusted: bool = False) -> dict[str, Any]:
+    """The serialized Udo payload of one object. With `trusted`, the dict is built directly without pydantic."""
+    if trusted:
+        return {"type": object_type, "name": name, "props": props, **_UDO_DEFAULTS}
+    return Udo(type=object_type, name=name, props=props).model_dump()
+
+
+def udo_dicts(object_type: str, named_props: Iterable[tuple[str, Optional[dict[str, Any]]]],
+              trusted: bool = False) -> list[dict[str, Any]]:
+    """Serialized Udo payloads of many objects, validated and dumped as one list instead of one model at a time."""
+    if trusted:
+        return [{"type": object_type, "name": name, "props": props, **_UDO_DEFAULTS} for name, props in named_props]
+    return UDO_LIST.dump_python(UDO_LIST.validate_python(
+        [{"type": object_type, "name": name, "props": props} for name, props in named_props]
+    ))
@@ -0,0 +1,37 @@
+from typing import Optional
+
+# Only the head of a statement is ever scanned for keywords - enough for CREATE OR REPLACE TEMPORARY OPEN <word>
+_HEAD_CHARS = 256
+
+# Optional words between CREATE and OPEN: CREATE [OR REPLACE] [TEMPORARY] OPEN ...
+_CREATE_MODIFIERS = ("or", "replace", "temporary")
+
+# Verbs that start an OpenDic statement when followed by OPEN
+OPENDIC_VERBS = frozenset({"create", "alter", "show", "sync", "define", "drop", "add"})
+
+
+def opendic_head(sql_cleaned: str) -> Optional[tuple[str, Optional[str]]]:
+    """
+    Return (verb, word after OPEN) if the statement starts like an OpenDic command, else None.
+
+    Every grammar rule needs whitespace around OPEN and after the keyword, so splitting the head
+    on whitespace routes exactly like the rules themselves would.
+    """
+    words = sql_cleaned[:_HEAD_CHARS].split(None, 6)
+    if not words:
+        return None
+
+    verb = words[0].lower()
+    if verb not in OPENDIC_VERBS:
+        return None
+
+    position = 1
+    if verb == "create":
+        while position < len(words) and words[position].lower() in _CREATE_MODIFIERS:
+            position += 1
+    if position >= len(words) or words[position].lower() != "open":
+        return None
+
+    keyword = words[position + 1].lower() if position + 1 < len(words) else None
+    return verb, keyword
+
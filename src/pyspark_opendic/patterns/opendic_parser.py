@@ -0,0 +1,522 @@
+import json
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, ClassVar, Iterator, Optional
+
+from pyspark_opendic.model.adapters import udo_dicts
+from pyspark_opendic.model.openapi_models import (
+    CreatePlatformMappingRequest,
+    CreateUdoRequest,
+    DefineUdoRequest,
+    PlatformMapping,
+    Udo,
+)
+from pyspark_opendic.patterns.opendic_dispatcher import opendic_head
+
+_WHITESPACE = re.compile(r"\s*")
+_TERMINATOR = re.compile(r";?\s*\Z")  # A statement may end with a semicolon
+_WORD = re.compile(r"\w+")
+_QUOTED = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_BRACE = re.compile(r"[{}]")
+
+
+class OpenDicSyntaxError(ValueError):
+    """Raised for a statement that starts like an OpenDic command but does not follow its grammar."""
+
+    def __init__(self, message: str, sql: str, position: int):
+        self.position = position
+        self.line = sql.count("\n", 0, position) + 1
+        self.column = position - (sql.rfind("\n", 0, position) + 1) + 1
+        self.msg = message
+        super().__init__(f"{message}: line {self.line} column {self.column} (char {position})")
+
+
+# ---- Command AST ----
+# Commands are immutable so parsed (and validated) commands can be cached and reused. Request payloads
+# are validated through the pydantic models once, on first access, and kept on the command.
+
+def _named_props(objects: list[dict[str, Any]]) -> Iterator[tuple[str, dict[str, Any]]]:
+    # A batch item is its "name" plus props
+    for item in objects:
+        yield item["name"], {key: value for key, value in item.items() if key != "name"}
+
+
+@dataclass(frozen=True)
+class OpenDicCommand:
+    command_type: ClassVar[str]
+
+
+# Syntax: CREATE [OR REPLACE] [TEMPORARY] OPEN <object_type> <name> [IF NOT EXISTS] [AS <alias>] [PROPS { <properties> }]
+@dataclass(frozen=True)
+class CreateCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "create"
+    object_type: str
+    name: str
+    alias: Optional[str] = None
+    properties: Optional[dict[str, Any]] = None
+
+    @cached_property
+    def payload(self) -> dict[str, Any]:
+        udo_object = Udo(type=self.object_type, name=self.name, alias=self.alias, props=self.properties)
+        return CreateUdoRequest(udo=udo_object).model_dump()
+
+
+# Syntax: CREATE [OR REPLACE] OPEN BATCH <object_type> OBJECT[S] [ { "name": ..., <properties> }, ... ]
+@dataclass(frozen=True)
+class CreateBatchCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "create_batch"
+    object_type: str
+    objects: list[dict[str, Any]]
+    # OR REPLACE: only create missing objects and update changed ones
+    upsert: bool = False
+
+    @cached_property
+    def payload(self) -> list[dict[str, Any]]:
+        # The parser guarantees every item has a "name" - everything else are props
+        return udo_dicts(self.object_type, _named_props(self.objects))
+
+
+# Syntax: ALTER OPEN <object_type> <name> [PROPS { <properties> }]
+@dataclass(frozen=True)
+class AlterCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "alter"
+    object_type: str
+    name: str
+    properties: Optional[dict[str, Any]] = None
+
+    @cached_property
+    def payload(self) -> dict[str, Any]:
+        return CreateUdoRequest(udo=Udo(type=self.object_type, name=self.name, props=self.properties)).model_dump()
+
+
+# Syntax: ALTER OPEN BATCH <object_type> OBJECT[S] [ { "name": ..., <properties> }, ... ]
+@dataclass(frozen=True)
+class AlterBatchCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "alter_batch"
+    object_type: str
+    objects: list[dict[str, Any]]
+
+    @cached_property
+    def payload(self) -> list[tuple[str, dict[str, Any]]]:
+        # (name, CreateUdoRequest payload) per object - each one is sent as PUT /objects/<object_type>/<name>
+        return [(udo["name"], {"udo": udo}) for udo in udo_dicts(self.object_type, _named_props(self.objects))]
+
+
+# Syntax: SHOW OPEN TYPES
+@dataclass(frozen=True)
+class ShowTypesCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "show_types"
+
+
+# Syntax: SHOW OPEN PLATFORMS
+@dataclass(frozen=True)
+class ShowPlatformsCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "show_platforms_all"
+
+
+# Syntax: SHOW OPEN MAPPING[S] FOR <platform>
+@dataclass(frozen=True)
+class ShowMappingsForPlatformCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "show_mappings_for_platform"
+    platform: str
+
+
+# Syntax: DROP OPEN MAPPING[S] FOR <platform>
+@dataclass(frozen=True)
+class DropMappingForPlatformCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "drop_mapping_for_platform"
+    platform: str
+
+
+# Syntax: SHOW OPEN <object_type>[s]
+@dataclass(frozen=True)
+class ShowCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "show"
+    object_type: str
+
+
+# Syntax: SHOW OPEN MAPPING <object_type> PLATFORM <platform>
+@dataclass(frozen=True)
+class ShowMappingCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "show_mapping_for_object_and_platform"
+    object_type: str
+    platform: str
+
+
+# Syntax: SHOW OPEN PLATFORMS FOR <object_type>
+@dataclass(frozen=True)
+class ShowPlatformsForObjectCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "show_platforms_for_object"
+    object_type: str
+
+
+# Syntax: SYNC OPEN <object_type> FOR <platform> [FULL] [PLAN]
+@dataclass(frozen=True)
+class SyncCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "sync"
+    object_type: str
+    platform: str
+    # FULL: re-execute every statement, ignoring what earlier syncs already applied
+    full: bool = False
+    # PLAN: only report what would be created, replaced or skipped
+    plan: bool = False
+
+
+# Syntax: SYNC OPEN OBJECTS FOR <platform> [FULL] [PLAN]
+@dataclass(frozen=True)
+class SyncAllCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "sync_all"
+    platform: str
+    full: bool = False
+    plan: bool = False
+
+
+# Syntax: SYNC OPEN <object_type|OBJECTS>[, <object_type> ...] FOR <platform>, <platform>[, ...] [FULL] [PLAN]
+# (also used for several object types with a single platform)
+@dataclass(frozen=True)
+class SyncManyCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "sync_many"
+    # None stands for OBJECTS - every object type of the platform
+    object_types: tuple[Optional[str], ...]
+    platforms: tuple[str, ...]
+    full: bool = False
+    plan: bool = False
+
+
+# Syntax: DEFINE OPEN <udoType> PROPS { <properties> }
+@dataclass(frozen=True)
+class DefineCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "define"
+    udo_type: str
+    properties: Optional[dict[str, Any]] = None
+
+    @cached_property
+    def payload(self) -> dict[str, Any]:
+        return DefineUdoRequest(udoType=self.udo_type, properties=self.properties).model_dump()
+
+
+# Syntax: DROP OPEN <object_type>
+@dataclass(frozen=True)
+class DropCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "drop"
+    object_type: str
+
+
+# Syntax: DROP OPEN BATCH <object_type> OBJECT[S] [ "<name>", ... ]
+@dataclass(frozen=True)
+class DropBatchCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "drop_batch"
+    object_type: str
+    names: list[str]
+
+
+# Syntax: ADD OPEN MAPPING <object_type> PLATFORM <platform> SYNTAX { ... } PROPS { ... }
+@dataclass(frozen=True)
+class AddMappingCommand(OpenDicCommand):
+    command_type: ClassVar[str] = "add_mapping"
+    object_type: str
+    platform: str
+    syntax: str
+    object_dump_map: dict[str, Any]
+
+    @cached_property
+    def payload(self) -> dict[str, Any]:
+        return CreatePlatformMappingRequest(
+            platformMapping=PlatformMapping(
+                typeName=self.object_type,
+                platformName=self.platform,
+                syntax=self.syntax,
+                objectDumpMap=self.object_dump_map,
+            )
+        ).model_dump()
+
+
+# ---- Scanner ----
+
+class _Scanner:
+    """Cursor over the statement. Every method advances monotonically, so parsing is linear in the input."""
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.pos = 0
+
+    def error(self, message: str, position: Optional[int] = None) -> OpenDicSyntaxError:
+        return OpenDicSyntaxError(message, self.sql, self.pos if position is None else position)
+
+    def skip_whitespace(self) -> None:
+        self.pos = _WHITESPACE.match(self.sql, self.pos).end()
+
+    def at_end(self) -> bool:
+        self.skip_whitespace()
+        return _TERMINATOR.match(self.sql, self.pos) is not None
+
+    def peek_word(self) -> Optional[str]:
+        """The next word, lower-cased, without consuming it."""
+        self.skip_whitespace()
+        match = _WORD.match(self.sql, self.pos)
+        return match.group().lower() if match else None
+
+    def word(self, what: str) -> str:
+        self.skip_whitespace()
+        match = _WORD.match(self.sql, self.pos)
+        if not match:
+            raise self.error(f"Expected {what}")
+        self.pos = match.end()
+        return match.group()
+
+    def accept(self, *keywords: str) -> Optional[str]:
+        """Consume the next word if it is one of the keywords and return it."""
+        word = self.peek_word()
+        if word in keywords:
+            self.word(word)
+            return word
+        return None
+
+    def keyword(self, *keywords: str) -> str:
+        word = self.accept(*keywords)
+        if word is None:
+            raise self.error("Expected " + " or ".join(keyword.upper() for keyword in keywords))
+        return word
+
+    def expect_char(self, char: str, what: str) -> None:
+        self.skip_whitespace()
+        if not self.sql.startswith(char, self.pos):
+            raise self.error(f"Expected '{char}' to start {what}")
+        self.pos += 1
+
+    def word_list(self, what: str) -> list[str]:
+        """One or more words separated by commas."""
+        words = [self.word(what)]
+        self.skip_whitespace()
+        while self.sql.startswith(",", self.pos):
+            self.pos += 1
+            words.append(self.word(what))
+            self.skip_whitespace()
+        return words
+
+    def json_object(self, what: str) -> dict[str, Any]:
+        """Decode a JSON object in place (no substring copy). Raises json.JSONDecodeError with absolute positions."""
+        self.skip_whitespace()
+        if not self.sql.startswith("{", self.pos):
+            raise self.error(f"Expected '{{' to start {what}")
+        value, self.pos = self._decoder.raw_decode(self.sql, self.pos)
+        return value
+
+    def json_array_of_named_objects(self, what: str) -> list[dict[str, Any]]:
+        """Decode a JSON array item by item, checking each item is an object with a string "name"."""
+        self.expect_char("[", what)
+        items: list[dict[str, Any]] = []
+        self.skip_whitespace()
+        if self.sql.startswith("]", self.pos):
+            self.pos += 1
+            return items
+
+        while True:
+            self.skip_whitespace()
+            start = self.pos
+            item, self.pos = self._decoder.raw_decode(self.sql, self.pos)
+            if not isinstance(item, dict) or not isinstance(item.get("name"), str):
+                raise self.error(f'Expected an object with a "name" in {what} (item {len(items)})', start)
+            items.append(item)
+
+            self.skip_whitespace()
+            if self.sql.startswith(",", self.pos):
+                self.pos += 1
+            elif self.sql.startswith("]", self.pos):
+                self.pos += 1
+                return items
+            else:
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.sql, self.pos)
+
+    def json_array_of_names(self, what: str) -> list[str]:
+        """Decode a JSON array of object names, given as strings or as objects with a "name"."""
+        self.skip_whitespace()
+        start = self.pos
+        if not self.sql.startswith("[", self.pos):
+            raise self.error(f"Expected '[' to start {what}")
+        items, self.pos = self._decoder.raw_decode(self.sql, self.pos)
+
+        names: list[str] = []
+        for item in items:
+            name = item.get("name") if isinstance(item, dict) else item
+            if not isinstance(name, str):
+                raise self.error(f'Expected a name or an object with a "name" in {what} (item {len(names)})', start)
+            names.append(name)
+        return names
+
+    def syntax_block(self) -> str:
+        """
+        Read SYNTAX { "<template>" } or SYNTAX { <template> }. A quoted template is returned without its quotes
+        (escapes are kept as written); an unquoted one may contain balanced {placeholders}.
+        """
+        self.expect_char("{", "SYNTAX")
+        self.skip_whitespace()
+
+        if self.sql.startswith('"', self.pos):
+            quoted = _QUOTED.match(self.sql, self.pos)
+            if not quoted:
+                raise self.error("Unterminated string in SYNTAX")
+            self.pos = quoted.end()
+            self.expect_char("}", "the end of SYNTAX")
+            return quoted.group()[1:-1].strip()
+
+        start, depth = self.pos, 1
+        for brace in _BRACE.finditer(self.sql, self.pos):
+            depth += 1 if brace.group() == "{" else -1
+            if depth == 0:
+                self.pos = brace.end()
+                return self.sql[start:brace.start()].strip()
+        raise self.error("Unbalanced braces in SYNTAX", start)
+
+    def end(self) -> None:
+        if not self.at_end():
+            raise self.error("Unexpected input")
+
+
+# ---- Parser ----
+
+class OpenDicParser:
+    """
+    Recursive-descent parser for OpenDic statements, producing a typed command in one pass.
+
+    Statements that do not start with `<verb> OPEN` are native SQL and parse to None. Embedded JSON
+    (PROPS, OBJECTS) is decoded in place while scanning, so the text is never re-matched or re-sliced.
+    Grammar errors raise OpenDicSyntaxError and JSON errors json.JSONDecodeError, both with positions.
+    """
+
+    def parse(self, sql_cleaned: str) -> Optional[OpenDicCommand]:
+        head = opendic_head(sql_cleaned)
+        if head is None:
+            return None
+
+        scanner = _Scanner(sql_cleaned)
+        verb = scanner.word("a command")
+        command = getattr(self, f"_parse_{verb.lower()}")(scanner)
+        scanner.end()
+        return command
+
+    def _parse_create(self, s: _Scanner) -> OpenDicCommand:
+        replace = s.accept("or")
+        if replace:
+            s.keyword("replace")
+        s.accept("temporary")
+        s.keyword("open")
+
+        batch_type = self._batch_type(s)
+        if batch_type is not None:
+            return CreateBatchCommand(object_type=batch_type, objects=s.json_array_of_named_objects("OBJECTS"), upsert=bool(replace))
+
+        object_type = s.word("object type")
+        name = s.word("object name")
+        if s.accept("if"):
+            s.keyword("not")
+            s.keyword("exists")
+        alias = s.word("alias") if s.accept("as") else None
+        properties = s.json_object("PROPS") if s.accept("props") else None
+        return CreateCommand(object_type=object_type, name=name, alias=alias, properties=properties)
+
+    @staticmethod
+    def _batch_type(s: _Scanner) -> Optional[str]:
+        """
+        Consume `BATCH <type> OBJECT[S]` and return the type. Anything else leaves the scanner where it was,
+        so "batch" can still be an ordinary object type (e.g. CREATE OPEN batch my_batch).
+        """
+        if s.peek_word() != "batch":
+            return None
+        backtrack = s.pos
+        s.word("BATCH")
+        object_type = s.word("object type") if s.peek_word() else None
+        if object_type and s.accept("objects", "object"):
+            return object_type
+        s.pos = backtrack
+        return None
+
+    def _parse_alter(self, s: _Scanner) -> OpenDicCommand:
+        s.keyword("open")
+        batch_type = self._batch_type(s)
+        if batch_type is not None:
+            return AlterBatchCommand(object_type=batch_type, objects=s.json_array_of_named_objects("OBJECTS"))
+
+        object_type = s.word("object type")
+        name = s.word("object name")
+        properties = s.json_object("PROPS") if s.accept("props") else None
+        return AlterCommand(object_type=object_type, name=name, properties=properties)
+
+    def _parse_show(self, s: _Scanner) -> OpenDicCommand:
+        s.keyword("open")
+        word = s.peek_word()
+
+        if word == "types":
+            s.word("TYPES")
+            return ShowTypesCommand()
+
+        if word == "platforms":
+            s.word("PLATFORMS")
+            if s.accept("for"):
+                return ShowPlatformsForObjectCommand(object_type=s.word("object type"))
+            return ShowPlatformsCommand()
+
+        if word in ("mapping", "mappings"):
+            keyword = s.word("MAPPING")
+            if s.accept("for"):
+                return ShowMappingsForPlatformCommand(platform=s.word("platform"))
+            if word == "mapping" and not s.at_end():
+                object_type = s.word("object type")
+                s.keyword("platform")
+                return ShowMappingCommand(object_type=object_type, platform=s.word("platform"))
+            # SHOW OPEN MAPPING[S] on its own lists objects of a type named "mapping(s)"
+            return ShowCommand(object_type=keyword)
+
+        return ShowCommand(object_type=s.word("object type"))
+
+    def _parse_sync(self, s: _Scanner) -> OpenDicCommand:
+        s.keyword("open")
+        s.skip_whitespace()
+        types_start = s.pos
+        object_types = s.word_list("object type or OBJECTS")
+        s.keyword("for")
+        platforms = s.word_list("platform")
+        full = s.accept("full") is not None
+        plan = s.accept("plan") is not None
+
+        sync_all = any(object_type.lower() == "objects" for object_type in object_types)
+        if sync_all and len(object_types) > 1:
+            raise s.error("OBJECTS already syncs every object type and cannot be combined with others", types_start)
+
+        if len(object_types) == 1 and len(platforms) == 1:
+            if sync_all:
+                return SyncAllCommand(platform=platforms[0], full=full, plan=plan)
+            return SyncCommand(object_type=object_types[0], platform=platforms[0], full=full, plan=plan)
+        return SyncManyCommand(object_types=(None,) if sync_all else tuple(object_types), platforms=tuple(platforms), full=full, plan=plan)
+
+    def _parse_define(self, s: _Scanner) -> OpenDicCommand:
+        s.keyword("open")
+        udo_type = s.word("object type")
+        properties = s.json_object("PROPS") if s.accept("props") else None
+        return DefineCommand(udo_type=udo_type, properties=properties)
+
+    def _parse_drop(self, s: _Scanner) -> OpenDicCommand:
+        s.keyword("open")
+        batch_type = self._batch_type(s)
+        if batch_type is not None:
+            return DropBatchCommand(object_type=batch_type, names=s.json_array_of_names("OBJECTS"))
+
+        object_type = s.word("object type")
+        if object_type.lower() in ("mapping", "mappings") and s.accept("for"):
+            return DropMappingForPlatformCommand(platform=s.word("platform"))
+        return DropCommand(object_type=object_type)
+
+    def _parse_add(self, s: _Scanner) -> OpenDicCommand:
+        s.keyword("open")
+        s.keyword("mapping")
+        object_type = s.word("object type")
+        s.keyword("platform")
+        platform = s.word("platform")
+        s.keyword("syntax")
+        syntax = s.syntax_block()
+        s.keyword("props")
+        object_dump_map = s.json_object("PROPS")
+        return AddMappingCommand(object_type=object_type, platform=platform, syntax=syntax, object_dump_map=object_dump_map)
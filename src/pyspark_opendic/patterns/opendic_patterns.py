@@ -1,3 +1,10 @@
+"""
+The original regular-expression grammar of the OpenDic statements, kept only as the reference grammar.
+
+Statements are routed and parsed by OpenDicParser (opendic_parser.py); nothing in the package matches
+these patterns. They serve as the oracle the parser is checked against in tests/test_opendic_dispatcher.py
+and as the baseline in benchmarks/bench_dispatch.py.
+"""
 import re
 
 
@@ -0,0 +1,91 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Optional
+
+from pyspark_opendic.execution import parse_definition
+
+# Plan actions - only creates and replaces are sent to Spark
+CREATE = "create"
+REPLACE = "replace"
+NO_OP = "no-op"
+
+
+@dataclass
+class PlannedStatement:
+    sql: str
+    action: str
+    reason: str
+    name: Optional[str] = None
+
+
+@dataclass
+class SyncPlan:
+    object_type: Optional[str]
+    platform: str
+    statements: list[PlannedStatement] = field(default_factory=list)
+
+    @property
+    def delta(self) -> list[str]:
+        """The statements that still need to run, in pull order."""
+        return [statement.sql for statement in self.statements if statement.action != NO_OP]
+
+    def summary(self) -> dict[str, int]:
+        counts = {CREATE: 0, REPLACE: 0, NO_OP: 0}
+        for statement in self.statements:
+            counts[statement.action] += 1
+        return {"statements": len(self.statements), **counts}
+
+    def rows(self) -> list[dict[str, Any]]:
+        return [
+            {"name": statement.name, "action": statement.action, "reason": statement.reason, "sql": statement.sql}
+            for statement in self.statements
+        ]
+
+
+def plan_statements(sql_texts: Iterable[str], existing: Callable[[str], set[str]], object_type: Optional[str], platform: str,
+                    unchanged: Optional[Callable[[str], bool]] = None) -> SyncPlan:
+    """
+    Decide, without running anything, what each normalized statement would change in Spark.
+
+        no-op   -> a repeat of an earlier identical statement, already applied by an earlier sync
+                   (per `unchanged`), or CREATE ... IF NOT EXISTS of an object that exists
+        replace -> defines an object that already exists
+        create  -> anything else
+
+    Args:
+        sql_texts (Iterable[str]): Normalized statements, in pull order.
+        existing (Callable[[str], set[str]]): Lower-cased names of the existing objects of a kind
+            ("function", "view" or "table"). Called at most once per kind.
+        unchanged (Callable[[str], bool], optional): True for statements the sync watermark already covers.
+    """
+    plan = SyncPlan(object_type, platform)
+    seen: set[str] = set()
+    existing_by_kind: dict[str, set[str]] = {}
+
+    for sql_text in sql_texts:
+        definition = parse_definition(sql_text)
+        name = definition.name if definition else None
+
+        if sql_text in seen:
+            plan.statements.append(PlannedStatement(sql_text, NO_OP, "duplicate of an earlier statement", name))
+            continue
+        seen.add(sql_text)
+
+        if unchanged is not None and unchanged(sql_text):
+            plan.statements.append(PlannedStatement(sql_text, NO_OP, "unchanged since the last sync", name))
+            continue
+        if definition is None:
+            plan.statements.append(PlannedStatement(sql_text, CREATE, "not a definition - always runs", name))
+            continue
+
+        kind = "function" if definition.kind == "function" else "table"  # views are listed with the tables
+        if kind not in existing_by_kind:
+            existing_by_kind[kind] = existing(kind)
+
+        if name not in existing_by_kind[kind]:
+            plan.statements.append(PlannedStatement(sql_text, CREATE, f"{definition.kind} does not exist", name))
+        elif definition.if_not_exists:
+            plan.statements.append(PlannedStatement(sql_text, NO_OP, f"{definition.kind} exists and IF NOT EXISTS is given", name))
+        else:
+            plan.statements.append(PlannedStatement(sql_text, REPLACE, f"{definition.kind} exists", name))
+
+    return plan
@@ -3,9 +3,16 @@ import json
 class PrettyResponse:
     def __init__(self, data: dict):
         self.data = data
+        self._text = None
+
+    def _json(self) -> str:
+        # Rendered once, on first display - results that are never shown are never serialized
+        if self._text is None:
+            self._text = json.dumps(self.data, indent=4, default=str)
+        return self._text
 
     def _repr_markdown_(self):
-        return f"```json\n{json.dumps(self.data, indent=4)}\n```"
+        return f"```json\n{self._json()}\n```"
 
     def __repr__(self):
-        return json.dumps(self.data, indent=4)
+        return self._json()
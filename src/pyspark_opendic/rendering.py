@@ -0,0 +1,147 @@
+import json
+import re
+import threading
+from typing import Any, Iterable, Optional
+
+from pyspark_opendic.client import OpenDicClient
+from pyspark_opendic.model.openapi_models import PlatformMapping, PlatformMappingObjectDumpMapValue, Statement
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+def _scalar(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def render_prop(value: Any, dump: PlatformMappingObjectDumpMapValue) -> str:
+    """
+    Render one prop with its objectDumpMap entry:
+        list/array  -> every item through `format` (<item>), joined with `delimiter`
+        map/object  -> every entry through `format` (<key>, <value>), joined with `delimiter`
+        other types -> the value through `format` (<value>)
+    """
+    prop_type = dump.propType.lower()
+    if prop_type in ("list", "array"):
+        items = value if isinstance(value, (list, tuple)) else [value]
+        return dump.delimiter.join(dump.format.replace("<item>", _scalar(item)) for item in items)
+    if prop_type in ("map", "object") and isinstance(value, dict):
+        return dump.delimiter.join(
+            dump.format.replace("<key>", _scalar(key)).replace("<value>", _scalar(item)) for key, item in value.items()
+        )
+    return dump.format.replace("<value>", _scalar(value)) if dump.format else _scalar(value)
+
+
+class MappingRenderer:
+    """
+    Renders objects of one type into statements for one platform from its PlatformMapping.
+
+    The syntax template is split into literal text and {placeholders} once, so rendering an object is a
+    single join. {name} and {type} are the object's own fields; any other placeholder is a prop, rendered
+    through its objectDumpMap entry (or as plain text without one). Props missing on an object render as
+    empty text, and placeholders that are neither are kept as written.
+    """
+
+    def __init__(self, mapping: PlatformMapping):
+        self.mapping = mapping
+        # Alternating literal text and placeholder names: [text, name, text, name, ..., text]
+        self._parts = _PLACEHOLDER.split(mapping.syntax)
+
+    def render(self, udo: dict[str, Any]) -> str:
+        props = udo.get("props") or {}
+        rendered = []
+        for position, part in enumerate(self._parts):
+            if position % 2 == 0:
+                rendered.append(part)
+            elif part in ("name", "type"):
+                rendered.append(_scalar(udo.get(part)))
+            elif part in self.mapping.objectDumpMap:
+                rendered.append(render_prop(props[part], self.mapping.objectDumpMap[part]) if part in props else "")
+            elif part in props:
+                rendered.append(_scalar(props[part]))
+            else:
+                rendered.append("{" + part + "}")
+        return "".join(rendered)
+
+    def render_all(self, udos: Iterable[dict[str, Any]]) -> list[Statement]:
+        return [Statement(definition=self.render(udo)) for udo in udos]
+
+
+def _mappings_in(response: Any) -> list[PlatformMapping]:
+    """Mappings from a /platforms/{p} or /objects/{t}/platforms/{p} response, bare or wrapped in "platformMapping"."""
+    items = response if isinstance(response, list) else [response]
+    mappings = []
+    for item in items:
+        if isinstance(item, dict) and "platformMapping" in item:
+            item = item["platformMapping"]
+        if isinstance(item, dict) and "syntax" in item:
+            mappings.append(PlatformMapping.model_validate(item))
+    return mappings
+
+
+class MappingCache:
+    """
+    Platform mappings held on the client, keyed by (object type, platform).
+
+    A mapping is fetched from the server the first time it is needed, or for a whole platform at once
+    with `preload`. The cache can be saved to and loaded from a JSON file, so statements can be rendered
+    without reaching the server at all.
+    """
+
+    def __init__(self, client: Optional[OpenDicClient] = None):
+        self.client = client
+        self._renderers: dict[tuple[str, str], MappingRenderer] = {}
+        self._lock = threading.Lock()
+
+    def add(self, mapping: PlatformMapping) -> MappingRenderer:
+        renderer = MappingRenderer(mapping)
+        with self._lock:
+            self._renderers[(mapping.typeName.lower(), mapping.platformName.lower())] = renderer
+        return renderer
+
+    def preload(self, platform: str) -> int:
+        """Fetch every mapping of a platform in one request. Returns the number of mappings cached."""
+        mappings = _mappings_in(self._require_client().get(f"/platforms/{platform.lower()}"))
+        for mapping in mappings:
+            self.add(mapping)
+        return len(mappings)
+
+    def renderer(self, object_type: str, platform: str) -> MappingRenderer:
+        key = (object_type.lower(), platform.lower())
+        renderer = self._renderers.get(key)
+        if renderer is not None:
+            return renderer
+
+        response = self._require_client().get(f"/objects/{object_type}/platforms/{platform.lower()}")
+        for mapping in _mappings_in(response):
+            self.add(mapping)
+        if key not in self._renderers:
+            raise KeyError(f"No mapping for object type '{object_type}' on platform '{platform}'")
+        return self._renderers[key]
+
+    def invalidate(self, platform: Optional[str] = None) -> None:
+        with self._lock:
+            if platform is None:
+                self._renderers.clear()
+            else:
+                for key in [key for key in self._renderers if key[1] == platform.lower()]:
+                    del self._renderers[key]
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([renderer.mapping.model_dump() for renderer in self._renderers.values()], f)
+
+    def load(self, path: str) -> int:
+        with open(path, encoding="utf-8") as f:
+            mappings = [PlatformMapping.model_validate(item) for item in json.load(f)]
+        for mapping in mappings:
+            self.add(mapping)
+        return len(mappings)
+
+    def _require_client(self) -> OpenDicClient:
+        if self.client is None:
+            raise KeyError("Mapping is not cached and there is no client to fetch it with")
+        return self.client
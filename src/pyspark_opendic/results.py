@@ -0,0 +1,152 @@
+import json
+from typing import Any, Callable, Optional
+
+import pandas as pd
+from pyspark.sql import DataFrame, SparkSession
+
+# How tabular command results are returned: a pandas DataFrame, a Spark DataFrame, a pyarrow.Table,
+# or a LazyResult that builds any of them on first use
+PANDAS = "pandas"
+SPARK = "spark"
+ARROW = "arrow"
+LAZY = "lazy"
+RESULT_MODES = (PANDAS, SPARK, ARROW, LAZY)
+
+_pandas_display_configured = False
+
+_ARROW_ENABLED = "spark.sql.execution.arrow.pyspark.enabled"
+
+
+def configure_pandas_display() -> None:
+    """Show results in full: set the pandas display options once per process, not on every command."""
+    global _pandas_display_configured
+    if _pandas_display_configured:
+        return
+    pd.set_option("display.width", None)  # Auto-detect terminal width
+    pd.set_option("display.max_colwidth", None)  # Show full content of each cell
+    pd.set_option("display.max_rows", None)  # Show all rows
+    pd.set_option("display.expand_frame_repr", False)  # Don't wrap to multiple lines
+    _pandas_display_configured = True
+
+
+def require_pyarrow(result_mode: str):
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(f"The '{result_mode}' result mode requires pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def rows_to_arrow(rows: list[dict[str, Any]]):
+    """
+    Build a pyarrow.Table straight from the JSON rows. Nested objects become structs and lists; when a
+    column mixes types Arrow cannot unify (e.g. a prop that is a string in one object and a map in another),
+    nested values are kept as JSON text instead.
+    """
+    pa = require_pyarrow(ARROW)
+    try:
+        return pa.Table.from_pylist(rows)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.Table.from_pylist([
+            {key: json.dumps(value) if isinstance(value, (dict, list)) else value for key, value in row.items()}
+            for row in rows
+        ])
+
+
+def frame_to_arrow(frame: pd.DataFrame):
+    """A pyarrow.Table of a typed pandas frame; columns of Python lists and dicts Arrow cannot unify become JSON text."""
+    pa = require_pyarrow(ARROW)
+    try:
+        return pa.Table.from_pandas(frame, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        frame = frame.copy()
+        for column in frame.columns[frame.dtypes == object]:
+            frame[column] = frame[column].map(lambda value: json.dumps(value) if isinstance(value, (dict, list)) else value)
+        return pa.Table.from_pandas(frame, preserve_index=False)
+
+
+def rows_to_spark(spark: SparkSession, rows: list[dict[str, Any]]) -> DataFrame:
+    """Build a Spark DataFrame from the JSON rows through Arrow, without a row-by-row schema inference."""
+    return arrow_to_spark(spark, rows_to_arrow(rows))
+
+
+def arrow_to_spark(spark: SparkSession, table) -> DataFrame:
+    import pyspark
+
+    if int(pyspark.__version__.split(".")[0]) >= 4:
+        return spark.createDataFrame(table)
+    # Spark 3.5 only takes Arrow data by way of pandas. The schema is taken from the Arrow table so Spark
+    # infers nothing, and the session's own Arrow setting is put back afterwards.
+    from pyspark.sql.pandas.types import from_arrow_schema
+
+    try:
+        schema = from_arrow_schema(table.schema)
+    except TypeError:
+        schema = None  # An Arrow type Spark 3.5 cannot map - let Spark infer the columns
+    previous = spark.conf.get(_ARROW_ENABLED, None)
+    spark.conf.set(_ARROW_ENABLED, "true")
+    try:
+        return spark.createDataFrame(table.to_pandas(), schema=schema)
+    finally:
+        if previous is None:
+            spark.conf.unset(_ARROW_ENABLED)
+        else:
+            spark.conf.set(_ARROW_ENABLED, previous)
+
+
+class LazyResult:
+    """
+    A tabular command result that keeps the raw JSON rows and only builds a representation when it is
+    asked for - by `to_pandas`, `to_spark`, `to_arrow`, `to_json` or by being displayed. Each
+    representation is built once. A script that runs many commands and drops their results pays for none.
+    """
+
+    def __init__(self, rows: list[dict[str, Any]], spark: Optional[SparkSession] = None,
+                 build_frame: Optional[Callable[[], pd.DataFrame]] = None):
+        """
+        Args:
+            rows (list[dict]): The response objects.
+            spark (SparkSession, optional): Session for to_spark.
+            build_frame (Callable, optional): Builds the pandas frame instead of pd.DataFrame(rows),
+                e.g. a typed projection of the rows.
+        """
+        self.rows = rows
+        self._spark = spark
+        self._build_frame = build_frame
+        self._built: dict[str, Any] = {}
+        # The command's message and summary, copied to the pandas frame
+        self.attrs: dict[str, Any] = {}
+
+    def _once(self, kind: str, build: Callable[[], Any]) -> Any:
+        if kind not in self._built:
+            self._built[kind] = build()
+        return self._built[kind]
+
+    def to_pandas(self) -> pd.DataFrame:
+        configure_pandas_display()
+        frame = self._once(PANDAS, self._build_frame or (lambda: pd.DataFrame(self.rows)))
+        frame.attrs.update(self.attrs)
+        return frame
+
+    def to_arrow(self):
+        if self._build_frame is not None:
+            return self._once(ARROW, lambda: frame_to_arrow(self.to_pandas()))
+        return self._once(ARROW, lambda: rows_to_arrow(self.rows))
+
+    def to_spark(self) -> DataFrame:
+        if self._spark is None:
+            raise ValueError("This result has no Spark session to build a DataFrame with")
+        return self._once(SPARK, lambda: arrow_to_spark(self._spark, self.to_arrow()))
+
+    def to_json(self) -> str:
+        return self._once("json", lambda: json.dumps(self.rows, indent=4, default=str))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _repr_html_(self):
+        return self.to_pandas()._repr_html_()
+
+    def __repr__(self):
+        return repr(self.to_pandas())
+
@@ -0,0 +1,95 @@
+import email.utils
+import random
+import time
+from typing import Callable, Iterable, Optional
+
+import requests
+
+
+class RetryPolicy:
+    """
+    Bounded retry policy for OpenDicClient requests.
+
+    Retryable status codes (429/502/503/504 by default) and connection errors are retried with
+    exponential backoff and full jitter, honoring the server's Retry-After header. Only idempotent
+    methods (GET, PUT, DELETE) or requests explicitly marked replay-safe are retried, so a POST that
+    may already have been applied is never sent twice. A 401 triggers one re-authentication.
+    """
+
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    def __init__(self,
+                 max_attempts: int = 3,
+                 backoff_base: float = 0.2,
+                 backoff_max: float = 5.0,
+                 jitter: bool = True,
+                 retry_statuses: Iterable[int] = (429, 502, 503, 504),
+                 retry_connection_errors: bool = True,
+                 max_retry_after: float = 30.0,
+                 reauthenticate: bool = True,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            max_attempts (int): Total attempts per request, including the first one.
+            backoff_base (float): Delay in seconds before the first retry; doubled on each further retry.
+            backoff_max (float): Upper bound for a single backoff delay.
+            jitter (bool): Sleep a random time in [0, backoff] ("full jitter") to spread out retrying clients.
+            retry_statuses (Iterable[int]): HTTP status codes that are retried.
+            retry_connection_errors (bool): Also retry connection errors and timeouts.
+            max_retry_after (float): Give up instead of waiting if the server asks for a longer Retry-After.
+            reauthenticate (bool): Refresh the OAuth token once and replay the request on a 401.
+            sleep (Callable): Sleep function, replaceable in tests.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_connection_errors = retry_connection_errors
+        self.max_retry_after = max_retry_after
+        self.reauthenticate = reauthenticate
+        self.sleep = sleep
+
+    @classmethod
+    def disabled(cls) -> "RetryPolicy":
+        """A policy that sends every request exactly once (a 401 still re-authenticates)."""
+        return cls(max_attempts=1)
+
+    def can_replay(self, method: str, replay_safe: bool = False) -> bool:
+        return replay_safe or method.upper() in self.IDEMPOTENT_METHODS
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based)."""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    @staticmethod
+    def retry_after(response: requests.Response) -> Optional[float]:
+        """Parse a Retry-After header given either as seconds or as an HTTP date."""
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(retry_at.timestamp() - time.time(), 0.0)
+
+    def delay_for(self, attempt: int, response: Optional[requests.Response] = None) -> Optional[float]:
+        """
+        Return how long to wait before the next attempt, or None if the request should not be retried
+        (attempts exhausted, or the server asked to wait longer than max_retry_after).
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if response is not None:
+            retry_after = self.retry_after(response)
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_retry_after else None
+        return self.backoff(attempt)
@@ -0,0 +1,188 @@
+import datetime
+import json
+import threading
+from typing import Any, Callable, Iterable, Optional
+
+import pandas as pd
+
+from pyspark_opendic.client import OpenDicClient
+
+# Object fields kept as columns next to the props, in this order
+_OBJECT_FIELDS = ("type", "name", "createdTimestamp", "lastUpdatedTimestamp", "entityVersion")
+
+_BOOLEANS = {"true": True, "false": False, "1": True, "0": False, "yes": True, "no": False}
+
+
+def _is_date(value: Any) -> bool:
+    if not isinstance(value, str):
+        return False
+    try:
+        datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+# Which JSON values each declared prop type accepts. variant - and any type not listed - accepts everything.
+_ACCEPTS: dict[str, Callable[[Any], bool]] = {
+    "string": lambda value: isinstance(value, str),
+    "int": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "float": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "double": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "date": _is_date,
+    "array": lambda value: isinstance(value, list),
+    "list": lambda value: isinstance(value, list),
+    "map": lambda value: isinstance(value, dict),
+    "object": lambda value: isinstance(value, dict),
+}
+
+
+class PropsError(ValueError):
+    """Raised for objects whose props do not match their type's schema, before anything is sent."""
+
+    def __init__(self, object_type: str, errors: dict[str, list[str]]):
+        self.object_type = object_type
+        self.errors = errors  # Object name -> its problems
+        super().__init__("; ".join(f"{name}: {', '.join(problems)}" for name, problems in errors.items()))
+
+
+def _typed(values: list[Any], prop_type: str) -> pd.Series:
+    """Convert one column of prop values to the pandas dtype of its declared type. Unparseable values become NA."""
+    column = pd.Series(values, dtype=object)
+    prop_type = prop_type.lower()
+
+    if prop_type == "string":
+        return column.astype("string")
+    if prop_type == "int":
+        numbers = pd.to_numeric(column, errors="coerce")
+        return numbers.where(numbers % 1 == 0).astype("Int64")
+    if prop_type in ("number", "float", "double"):
+        return pd.to_numeric(column, errors="coerce").astype("Float64")
+    if prop_type == "boolean":
+        return column.astype("string").str.lower().map(_BOOLEANS).astype("boolean")
+    if prop_type == "date":
+        return pd.to_datetime(column, errors="coerce", format="mixed")
+    # array, list, map, object and variant values stay Python lists and dicts
+    return column
+
+
+class TypeSchema:
+    """
+    The declared props of one object type, as given to DEFINE OPEN <type> PROPS { ... }.
+
+    `project` turns objects with nested props into a flat table: one column per declared prop, converted
+    to its type column-wise (Int64, Float64, boolean, datetime64, string), after the object's own fields.
+    Props an object has but the type does not declare are kept as untyped columns at the end.
+
+    `check` validates the props of an object against the declared types, with one check function per
+    prop picked when the schema is built.
+    """
+
+    def __init__(self, type_name: str, properties: dict[str, str]):
+        self.type_name = type_name
+        self.properties = {name: prop_type.lower() for name, prop_type in properties.items()}
+        self._checks = {name: _ACCEPTS[prop_type] for name, prop_type in self.properties.items() if prop_type in _ACCEPTS}
+
+    def check(self, props: Optional[dict[str, Any]]) -> list[str]:
+        """
+        The problems with an object's props: declared props whose value has the wrong type.
+        Missing and null props are allowed, and so are props the type does not declare.
+        """
+        if not props:
+            return []
+        return [
+            f"prop '{name}' must be {self.properties[name]}, not {type(value).__name__} {value!r}"
+            for name, value in props.items()
+            if value is not None and name in self._checks and not self._checks[name](value)
+        ]
+
+    def project(self, objects: Iterable[dict[str, Any]]) -> pd.DataFrame:
+        objects = [udo for udo in objects if isinstance(udo, dict)]
+        fields = [field for field in _OBJECT_FIELDS if any(field in udo for udo in objects)]
+        undeclared: dict[str, None] = {}
+        props_per_object = []
+        for udo in objects:
+            props = udo.get("props") or {}
+            props_per_object.append(props)
+            undeclared.update((name, None) for name in props if name not in self.properties)
+
+        columns: dict[str, Any] = {field: [udo.get(field) for udo in objects] for field in fields}
+        if "entityVersion" in columns:
+            columns["entityVersion"] = pd.Series(columns["entityVersion"], dtype="Int64")
+        for name, prop_type in self.properties.items():
+            columns[self._column(name, fields)] = _typed([props.get(name) for props in props_per_object], prop_type)
+        for name in undeclared:
+            columns[self._column(name, fields)] = pd.Series([props.get(name) for props in props_per_object], dtype=object)
+        return pd.DataFrame(columns, index=pd.RangeIndex(len(objects)))
+
+    @staticmethod
+    def _column(prop: str, fields: list[str]) -> str:
+        # A prop named like an object field (e.g. "name") must not overwrite it
+        return f"props.{prop}" if prop in fields else prop
+
+
+def _schemas_in(response: Any) -> list[TypeSchema]:
+    """Type schemas from a GET /objects response: entries with a udoType/type and a properties/schema dict."""
+    items = response.get("objects", []) if isinstance(response, dict) else (response or [])
+    schemas = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        type_name = item.get("udoType") or item.get("type")
+        properties = item.get("properties", item.get("schema"))
+        if isinstance(properties, str):
+            try:
+                properties = json.loads(properties)
+            except ValueError:
+                continue
+        if isinstance(type_name, str) and isinstance(properties, dict):
+            schemas.append(TypeSchema(type_name, {name: str(prop_type) for name, prop_type in properties.items()}))
+    return schemas
+
+
+class SchemaCache:
+    """
+    Type schemas held on the client, keyed by lower-cased type name.
+
+    Schemas are added by DEFINE OPEN commands run through the catalog, or for every type at once from the
+    server with `preload`. Unlike platform mappings they are never fetched on demand, so listing objects of
+    a type that is not cached costs no extra request - its props are simply not flattened.
+    """
+
+    def __init__(self, client: Optional[OpenDicClient] = None):
+        self.client = client
+        self._schemas: dict[str, TypeSchema] = {}
+        self._lock = threading.Lock()
+
+    def add(self, type_name: str, properties: dict[str, str]) -> TypeSchema:
+        schema = TypeSchema(type_name, properties)
+        with self._lock:
+            self._schemas[type_name.lower()] = schema
+        return schema
+
+    def get(self, type_name: str) -> Optional[TypeSchema]:
+        """The schema of a type, also found by its plural as written in SHOW OPEN functions."""
+        type_name = type_name.lower()
+        schema = self._schemas.get(type_name)
+        if schema is None and type_name.endswith("s"):
+            schema = self._schemas.get(type_name[:-1])
+        return schema
+
+    def preload(self) -> int:
+        """Fetch the schema of every type in one request. Returns the number of schemas cached."""
+        if self.client is None:
+            raise KeyError("There is no client to fetch type schemas with")
+        schemas = _schemas_in(self.client.get("/objects"))
+        with self._lock:
+            for schema in schemas:
+                self._schemas[schema.type_name.lower()] = schema
+        return len(schemas)
+
+    def invalidate(self, type_name: Optional[str] = None) -> None:
+        with self._lock:
+            if type_name is None:
+                self._schemas.clear()
+            else:
+                self._schemas.pop(type_name.lower(), None)
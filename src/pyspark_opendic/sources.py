@@ -0,0 +1,108 @@
+import datetime
+import decimal
+import json
+import math
+import os
+from typing import Any, Iterable, Iterator, Optional, Union
+
+import pandas as pd
+from pyspark.sql import DataFrame as SparkDataFrame
+
+from pyspark_opendic.model.adapters import udo_dict
+
+# Rows are read from pandas DataFrames and Parquet files this many at a time
+READ_BATCH_SIZE = 10_000
+
+RecordSource = Union[SparkDataFrame, pd.DataFrame, str, os.PathLike, Iterable[dict[str, Any]]]
+
+
+def iter_records(source: RecordSource, batch_size: int = READ_BATCH_SIZE) -> Iterator[dict[str, Any]]:
+    """
+    Stream rows as dicts from a Spark DataFrame, a pandas DataFrame, a JSONL/Parquet file or an
+    iterable of dicts. Only one read batch (or Spark partition) is held in memory at a time.
+
+    Args:
+        source: The rows. Files are recognised by extension: .jsonl/.ndjson or .parquet.
+        batch_size (int): Rows per read for pandas and Parquet sources.
+    """
+    if isinstance(source, SparkDataFrame):
+        # toLocalIterator pulls one partition at a time to the driver
+        for row in source.toLocalIterator():
+            yield row.asDict(recursive=True)
+
+    elif isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), batch_size):
+            yield from source.iloc[start:start + batch_size].to_dict("records")
+
+    elif isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        extension = os.path.splitext(path)[1].lower()
+
+        if extension in (".jsonl", ".ndjson"):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+        elif extension == ".parquet":
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Reading Parquet files requires pyarrow: pip install pyarrow") from e
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+                yield from batch.to_pylist()
+
+        else:
+            raise ValueError(f"Unsupported file type '{extension}' - expected .jsonl, .ndjson or .parquet")
+
+    else:
+        yield from source
+
+
+def _is_null(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NaT
+
+
+def _jsonable(value: Any) -> Any:
+    """
+    Convert values pandas/Arrow/Spark hand out (timestamps, decimals, numpy scalars and arrays) into
+    JSON-serializable ones, including inside list and struct cells.
+    """
+    if isinstance(value, (datetime.date, datetime.datetime, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    # Arrays before scalars - a numpy array also has .item(), which fails unless it holds one element
+    if hasattr(value, "tolist"):
+        return _jsonable(value.tolist())
+    if hasattr(value, "item") and not isinstance(value, str):
+        return value.item()  # numpy scalar
+    return value
+
+
+def records_to_udos(records: Iterable[dict[str, Any]], object_type: str, name_col: str = "name",
+                    props_cols: Optional[list[str]] = None, trusted: bool = False) -> Iterator[dict[str, Any]]:
+    """
+    Turn rows into serialized Udo payloads, one at a time.
+
+    Args:
+        records (Iterable[dict]): Rows, e.g. from iter_records().
+        object_type (str): Type of the created objects.
+        name_col (str): Column holding the object name.
+        props_cols (list[str], optional): Columns sent as props - defaults to every column except name_col.
+            Null values are left out.
+        trusted (bool): Build the payload dicts directly instead of validating each one through Udo.
+            Safe for these rows, since the names are made strings and the props are made JSON-friendly here.
+    """
+    for position, record in enumerate(records):
+        name = record.get(name_col)
+        if _is_null(name):
+            raise ValueError(f"Row {position} has no value in name column '{name_col}'")
+
+        columns = props_cols if props_cols is not None else [column for column in record if column != name_col]
+        props = {column: _jsonable(record[column]) for column in columns if not _is_null(record.get(column))}
+        yield udo_dict(object_type, str(name), props, trusted)
@@ -0,0 +1,114 @@
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+# Characters that delimit items outside of JSON strings
+_STRUCTURAL = re.compile(r'["\[\]{},]')
+_NON_WHITESPACE = re.compile(r"\S")
+
+
+class JsonArrayDecoder:
+    """
+    Incremental decoder for a top-level JSON array, yielding its items as soon as they are complete.
+
+    Only the current, unfinished item is buffered, so memory is bounded by the largest item rather than
+    by the whole document. The pieces of an item are kept as a list and joined once, when the item is
+    complete, so an item spread over many chunks is not copied again on every chunk. Each byte is scanned
+    once to find item boundaries (strings and nesting are tracked) and each complete item is then decoded
+    with json.loads.
+    """
+
+    def __init__(self):
+        self._pending: list[str] = []  # Pieces of the unfinished item from earlier chunks
+        self._skip = 0  # Characters of the next chunk to skip: an escaped character split from its backslash
+        self._depth = 0
+        self._in_string = False
+        self._started = False
+        self._count = 0
+        self.done = False
+
+    def feed(self, text: str) -> list[Any]:
+        """Add the next piece of the document and return the items completed by it."""
+        if self.done:
+            if _NON_WHITESPACE.search(text):
+                raise ValueError("Unexpected data after the end of the JSON array")
+            return []
+
+        items: list[Any] = []
+        item_start = 0
+
+        if not self._started:
+            match = _NON_WHITESPACE.search(text)
+            if not match:
+                return items
+            if match.group() != "[":
+                raise ValueError(f"Expected a JSON array, got {match.group()!r}")
+            self._started = True
+            item_start = match.end()
+
+        pos = item_start + self._skip
+        while True:
+            if self._in_string:
+                # str.find is much faster than a regex over long string values such as SQL bodies
+                quote = text.find('"', pos)
+                backslash = text.find("\\", pos, quote if quote != -1 else len(text))
+                if backslash != -1:
+                    pos = backslash + 2  # Skip the escaped character, even if it has not arrived yet
+                elif quote != -1:
+                    self._in_string = False
+                    pos = quote + 1
+                else:
+                    break
+                continue
+
+            match = _STRUCTURAL.search(text, pos)
+            if not match:
+                break
+
+            char, pos = match.group(), match.end()
+            if char == '"':
+                self._in_string = True
+            elif char in "[{":
+                self._depth += 1
+            elif char == "]" and self._depth == 0:
+                self._emit(text[item_start:match.start()], items, last=True)
+                self.done = True
+                if _NON_WHITESPACE.search(text, pos):
+                    raise ValueError("Unexpected data after the end of the JSON array")
+                return items
+            elif char in "]}":
+                self._depth -= 1
+            elif char == "," and self._depth == 0:
+                self._emit(text[item_start:match.start()], items)
+                item_start = pos
+
+        # Keep only the unfinished item
+        self._skip = max(pos - len(text), 0)
+        if item_start < len(text):
+            self._pending.append(text[item_start:])
+        return items
+
+    def _emit(self, tail: str, items: list[Any], last: bool = False) -> None:
+        text = "".join(self._pending) + tail if self._pending else tail
+        self._pending = []
+        if text.strip():
+            items.append(json.loads(text))
+            self._count += 1
+        elif not (last and self._count == 0):
+            # Only an empty array "[]" has nothing between its brackets
+            raise ValueError("Empty item in JSON array")
+
+    def close(self) -> None:
+        if not self.done:
+            raise ValueError("Incomplete JSON array: the response ended early")
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Decode a UTF-8 JSON array arriving in byte chunks, yielding each item once it is complete."""
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    decoder = JsonArrayDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(utf8.decode(chunk))
+    yield from decoder.feed(utf8.decode(b"", final=True))
+    decoder.close()
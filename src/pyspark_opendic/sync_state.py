@@ -0,0 +1,66 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Iterable, Optional
+
+# Temporary objects only live as long as the Spark session, so they are re-created on every sync
+_TEMPORARY = re.compile(r"\s*CREATE\s+(?:OR\s+(?:REPLACE|ALTER)\s+)?(?:GLOBAL\s+)?TEMP(?:ORARY)?\s", re.IGNORECASE)
+
+
+def statement_hash(sql_text: str) -> str:
+    return hashlib.sha256(sql_text.encode("utf-8")).hexdigest()
+
+
+def is_session_scoped(sql_text: str) -> bool:
+    return _TEMPORARY.match(sql_text) is not None
+
+
+class SyncState:
+    """
+    Persisted watermark of what a SYNC has already applied, per (object type, platform).
+
+    The watermark is the set of hashes of the statements that executed successfully in the last sync
+    (or were unchanged since). The pull API returns plain statement definitions without timestamps or
+    versions, so a statement counts as changed when its text changes. Files are written atomically;
+    an unreadable file is treated as "nothing synced yet", which falls back to a full sync.
+    """
+
+    def __init__(self, state_dir: str, api_url: str):
+        self.state_dir = os.path.expanduser(state_dir)
+        self.api_url = api_url
+        self._lock = threading.Lock()
+
+    def path_for(self, object_type: Optional[str], platform: str) -> str:
+        # object_type None is SYNC OPEN OBJECTS - every type of the platform
+        key = f"{self.api_url}|{object_type.lower() if object_type else '*'}|{platform.lower()}"
+        return os.path.join(self.state_dir, hashlib.sha256(key.encode()).hexdigest()[:32] + ".json")
+
+    def load(self, object_type: Optional[str], platform: str) -> set[str]:
+        try:
+            with open(self.path_for(object_type, platform)) as f:
+                return set(json.load(f).get("applied", []))
+        except (OSError, ValueError, AttributeError):
+            return set()
+
+    def save(self, object_type: Optional[str], platform: str, applied: Iterable[str]) -> None:
+        path = self.path_for(object_type, platform)
+        with self._lock:
+            os.makedirs(self.state_dir, mode=0o700, exist_ok=True)
+            # Write to a private temp file and rename, so a crashed sync never leaves a partial watermark
+            fd, tmp_path = tempfile.mkstemp(dir=self.state_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump({"object_type": object_type, "platform": platform, "applied": sorted(applied)}, f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def clear(self, object_type: Optional[str], platform: str) -> None:
+        try:
+            os.remove(self.path_for(object_type, platform))
+        except FileNotFoundError:
+            pass
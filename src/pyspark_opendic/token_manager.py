@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class TokenManager:
+    """
+    Keeps a Polaris OAuth token valid for as long as it is needed.
+
+    The token is fetched lazily, its `expires_in` is tracked and a daemon timer refreshes it
+    `refresh_margin` seconds before it expires, so requests never wait on a token round trip
+    in the steady state. For short-lived tokens the margin is capped at half the remaining
+    lifetime, and a refresh is never scheduled sooner than `min_refresh_delay`. All methods are thread-safe; concurrent callers share one fetch.
+
+    Managers are shared per (api_url, client_id, secret) within a process through `shared()`,
+    and can optionally persist the token to a local directory so other processes (e.g.
+    short-lived cluster sessions) reuse it instead of fetching their own.
+    """
+
+    # Process-wide registry used by shared()
+    _registry: dict[str, "TokenManager"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, fetch_token: Callable[[], dict[str, Any]],
+                 refresh_margin: float = 60.0,
+                 min_refresh_delay: float = 5.0,
+                 background_refresh: bool = True,
+                 cache_file: Optional[str] = None,
+                 credentials_hash: Optional[str] = None):
+        """
+        Args:
+            fetch_token (Callable): Returns the raw OAuth token response (access_token, expires_in).
+            refresh_margin (float): Seconds before expiry at which the token is refreshed, at most half its lifetime.
+            min_refresh_delay (float): Shortest delay before a background refresh, so a token that expires
+                almost at once cannot make the timer fetch in a loop.
+            background_refresh (bool): Refresh in a daemon timer instead of on the next request.
+            cache_file (str, optional): JSON file used to share the token across processes.
+            credentials_hash (str, optional): Stored next to the cached token so a file written for other credentials is ignored.
+        """
+        self.fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.min_refresh_delay = min_refresh_delay
+        self.background_refresh = background_refresh
+        self.cache_file = cache_file
+        self.credentials_hash = credentials_hash
+
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._expires_at: float = 0.0
+        # refresh_margin capped to half the lifetime of the current token
+        self._margin: float = refresh_margin
+        self._timer: Optional[threading.Timer] = None
+
+    @staticmethod
+    def credentials_key(api_url: str, credentials: str) -> tuple[str, str]:
+        """Return (client_id, sha256 of api_url + credentials) - the secret itself is never stored."""
+        client_id = credentials.split(":")[0]
+        digest = hashlib.sha256(f"{api_url}|{credentials}".encode()).hexdigest()
+        return client_id, digest
+
+    @classmethod
+    def shared(cls, api_url: str, credentials: str, fetch_token: Callable[[], dict[str, Any]],
+               token_cache_dir: Optional[str] = None, **kwargs) -> "TokenManager":
+        """
+        Return the process-wide manager for these credentials, creating it on first use.
+
+        Args:
+            api_url (str): Base URL of the Polaris server.
+            credentials (str): "<client_id>:<client_secret>".
+            fetch_token (Callable): Used only if the manager does not exist yet. The manager outlives the
+                client that created it, so this should not hold on to that client.
+            token_cache_dir (str, optional): Directory for the on-disk token cache.
+            **kwargs: Passed on to TokenManager.
+        """
+        client_id, digest = cls.credentials_key(api_url, credentials)
+        with cls._registry_lock:
+            manager = cls._registry.get(digest)
+            if manager is None:
+                manager = cls(fetch_token, cache_file=cls.cache_file_for(token_cache_dir, api_url, client_id),
+                              credentials_hash=digest, **kwargs)
+                cls._registry[digest] = manager
+            return manager
+
+    @staticmethod
+    def cache_file_for(token_cache_dir: Optional[str], api_url: str, client_id: str) -> Optional[str]:
+        if token_cache_dir is None:
+            return None
+        name = hashlib.sha256(f"{api_url}|{client_id}".encode()).hexdigest()[:32]
+        return os.path.join(os.path.expanduser(token_cache_dir), f"{name}.json")
+
+    def _is_valid(self, now: float) -> bool:
+        return self._token is not None and now < self._expires_at - self._margin
+
+    def get_token(self) -> str:
+        """Return a valid token, fetching (or loading from the disk cache) only when needed."""
+        if self._is_valid(time.time()):
+            return self._token
+
+        with self._lock:
+            # Another thread may have fetched while we waited for the lock
+            if self._is_valid(time.time()):
+                return self._token
+            if not self._load_from_disk():
+                self._fetch()
+            return self._token
+
+    def refresh(self, stale_token: Optional[str] = None) -> str:
+        """
+        Force a new token, e.g. after a 401.
+
+        Args:
+            stale_token (str, optional): The token the caller saw rejected. If another thread has
+                already replaced it, that newer token is returned without another fetch.
+        """
+        with self._lock:
+            if stale_token is not None and self._token is not None and self._token != stale_token:
+                return self._token
+            self._fetch()
+            return self._token
+
+    def invalidate(self) -> None:
+        """Drop the in-memory token and cancel any pending background refresh."""
+        with self._lock:
+            self._token = None
+            self._expires_at = 0.0
+            self._cancel_timer()
+
+    # Must be called with self._lock held
+    def _fetch(self) -> None:
+        token_response = self.fetch_token()
+        self._set(token_response["access_token"], self._expiry_from(token_response))
+        self._save_to_disk()
+
+    @staticmethod
+    def _expiry_from(token_response: dict[str, Any]) -> float:
+        expires_in = token_response.get("expires_in")
+        # Without expires_in the token is kept until a 401 forces a refresh
+        return time.time() + float(expires_in) if expires_in is not None else float("inf")
+
+    def _set(self, token: str, expires_at: float) -> None:
+        self._token = token
+        self._expires_at = expires_at
+        self._margin = self._margin_for(expires_at - time.time())
+        self._schedule_refresh()
+
+    def _margin_for(self, lifetime: float) -> float:
+        # A token living shorter than the margin would otherwise never count as valid
+        return min(self.refresh_margin, max(lifetime, 0.0) / 2)
+
+    def _schedule_refresh(self) -> None:
+        self._cancel_timer()
+        if not self.background_refresh or self._expires_at == float("inf"):
+            return
+        delay = max(self._expires_at - self._margin - time.time(), self.min_refresh_delay)
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _background_refresh(self) -> None:
+        try:
+            with self._lock:
+                self._fetch()
+        except Exception:
+            # Leave the current token in place - the next get_token() fetches on demand once it expires
+            pass
+
+    def _load_from_disk(self) -> bool:
+        if self.cache_file is None:
+            return False
+        try:
+            with open(self.cache_file) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if cached.get("credentials_hash") != self.credentials_hash:
+            return False
+        expires_at = float(cached.get("expires_at", 0.0))
+        now = time.time()
+        if now >= expires_at - self._margin_for(expires_at - now):
+            return False
+
+        self._set(cached["access_token"], expires_at)
+        return True
+
+    def _save_to_disk(self) -> None:
+        if self.cache_file is None:
+            return
+        directory = os.path.dirname(self.cache_file)
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            # Write to a private temp file and rename, so readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({
+                    "credentials_hash": self.credentials_hash,
+                    "access_token": self._token,
+                    "expires_at": self._expires_at,
+                }, f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError:
+            # The disk cache is an optimization only
+            pass
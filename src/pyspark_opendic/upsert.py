@@ -0,0 +1,142 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+from pyspark_opendic.batch import BatchReport, BatchUploader, ObjectResult, send_each
+from pyspark_opendic.client import OpenDicClient
+from pyspark_opendic.model.openapi_models import CreateUdoRequest, Udo
+
+
+def content_hash(props: Optional[dict[str, Any]]) -> str:
+    """Hash of an object's props that does not depend on key order. Missing and empty props hash the same."""
+    canonical = json.dumps(props or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ServerObject:
+    props_hash: str
+    entity_version: Optional[int]
+
+
+@dataclass
+class UpsertPlan:
+    object_type: str
+    creates: list[dict[str, Any]] = field(default_factory=list)
+    # (name, CreateUdoRequest payload carrying the server's entityVersion)
+    updates: list[tuple[str, dict[str, Any]]] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+
+
+@dataclass
+class UpsertReport:
+    object_type: str
+    created: Optional[BatchReport] = None
+    updated: list[ObjectResult] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    # Objects that failed validation and were neither compared nor sent
+    rejected: list[ObjectResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> bool:
+        return ((self.created is None or self.created.succeeded) and all(result.status == "succeeded" for result in self.updated)
+                and not self.rejected)
+
+    def summary(self) -> dict[str, int]:
+        created = self.created.summary() if self.created else {"objects": 0, "failed_objects": 0}
+        return {
+            "created": created["objects"] - created["failed_objects"],
+            "updated": sum(result.status == "succeeded" for result in self.updated),
+            "unchanged": len(self.unchanged),
+            "failed": created["failed_objects"] + sum(result.status == "failed" for result in self.updated),
+            "rejected": len(self.rejected),
+        }
+
+    def object_rows(self) -> list[dict[str, Any]]:
+        """One row per object with the action taken for it and its outcome."""
+        rows = []
+        if self.created is not None:
+            rows += [{"name": row["name"], "action": "create", "status": row["status"], "error": row["error"]} for row in self.created.object_rows()]
+        rows += [
+            {"name": result.name, "action": "update", "status": result.status, "error": str(result.error) if result.error else None}
+            for result in self.updated
+        ]
+        rows += [{"name": name, "action": "none", "status": "unchanged", "error": None} for name in self.unchanged]
+        rows += [{"name": result.name, "action": "none", "status": result.status, "error": str(result.error)} for result in self.rejected]
+        return rows
+
+
+class ObjectUpserter:
+    """
+    Idempotent upsert of objects of one type.
+
+    The current objects are read with a single GET /objects/{type} and reduced to a props hash and
+    entityVersion per name. Desired objects whose props hash matches are skipped; new ones are created
+    through the chunked BatchUploader and changed ones are updated with concurrent PUTs. Each PUT
+    carries the entityVersion that was read, so the server can reject an object changed in between.
+    """
+
+    def __init__(self, client: OpenDicClient, uploader: BatchUploader, max_in_flight: int = 4):
+        self.client = client
+        self.uploader = uploader
+        self.max_in_flight = max_in_flight
+
+    def current_objects(self, object_type: str) -> dict[str, ServerObject]:
+        # Bypass the response cache - a stale listing would make the diff skip real changes
+        response = self.client.get(f"/objects/{object_type}", fresh=True)
+        objects = response.get("objects", []) if isinstance(response, dict) else (response or [])
+        return {
+            udo["name"]: ServerObject(content_hash(udo.get("props")), udo.get("entityVersion"))
+            for udo in objects
+            if isinstance(udo, dict) and "name" in udo
+        }
+
+    def plan(self, object_type: str, udo_payloads: Iterable[dict[str, Any]]) -> UpsertPlan:
+        """
+        Compare the desired objects with the server. Only the objects that need a write are kept,
+        so a mostly unchanged input does not have to fit in memory. A name given twice uses its last props.
+        """
+        current = self.current_objects(object_type)
+        creates: dict[str, dict[str, Any]] = {}
+        updates: dict[str, dict[str, Any]] = {}
+        unchanged: dict[str, None] = {}
+
+        for udo in udo_payloads:
+            name = udo["name"]
+            for seen in (creates, updates, unchanged):
+                seen.pop(name, None)
+
+            existing = current.get(name)
+            if existing is None:
+                creates[name] = udo
+            elif existing.props_hash == content_hash(udo.get("props")):
+                unchanged[name] = None
+            else:
+                changed = Udo(type=object_type, name=name, props=udo.get("props"), entityVersion=existing.entity_version)
+                updates[name] = CreateUdoRequest(udo=changed).model_dump()
+
+        return UpsertPlan(object_type, list(creates.values()), list(updates.items()), list(unchanged))
+
+    def apply(self, plan: UpsertPlan) -> UpsertReport:
+        endpoint = f"/objects/{plan.object_type}"
+        report = UpsertReport(plan.object_type, unchanged=plan.unchanged)
+        if plan.creates:
+            report.created = self.uploader.upload(plan.object_type, plan.creates)
+        report.updated = send_each(
+            lambda update: self.client.put(f"{endpoint}/{update[0]}", update[1]),
+            ((name, (name, payload)) for name, payload in plan.updates),
+            self.max_in_flight,
+        )
+        return report
+
+    def upsert(self, object_type: str, udo_payloads: Iterable[dict[str, Any]]) -> UpsertReport:
+        """
+        Args:
+            object_type (str): Type of all objects.
+            udo_payloads (Iterable[dict]): Serialized Udo objects, e.g. from records_to_udos().
+
+        Returns:
+            UpsertReport: The action taken for every object and its outcome.
+        """
+        return self.apply(self.plan(object_type, udo_payloads))
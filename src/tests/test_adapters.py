@@ -0,0 +1,26 @@
+import pytest
+from pydantic import ValidationError
+
+from pyspark_opendic.model.adapters import statements_from, udo_dict, udo_dicts
+from pyspark_opendic.model.openapi_models import Statement, Udo
+
+NAMED_PROPS = [("f0", {"language": "sql", "args": {"x": "int"}}), ("f1", None)]
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+def test_udo_payloads_match_the_model_dump(trusted):
+    expected = [Udo(type="function", name=name, props=props).model_dump() for name, props in NAMED_PROPS]
+
+    assert udo_dicts("function", NAMED_PROPS, trusted=trusted) == expected
+    assert [udo_dict("function", name, props, trusted) for name, props in NAMED_PROPS] == expected
+
+
+def test_untrusted_payloads_are_validated():
+    with pytest.raises(ValidationError):
+        udo_dicts("function", [("f0", "not a dict")])
+
+
+def test_statements_are_validated_as_one_list():
+    assert statements_from([{"definition": "SELECT 1"}]) == [Statement(definition="SELECT 1")]
+    with pytest.raises(ValidationError):
+        statements_from([{"definition": "SELECT 1"}, {"sql": "SELECT 2"}])
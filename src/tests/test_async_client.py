@@ -0,0 +1,50 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from pyspark_opendic.async_client import AsyncOpenDicClient
+
+
+def slow_client(delay=0.1):
+    client = MagicMock()
+    client.get.side_effect = lambda endpoint: time.sleep(delay) or {"endpoint": endpoint}
+    return client
+
+
+def test_gathered_requests_run_concurrently_in_order():
+    async_client = AsyncOpenDicClient(slow_client(), max_in_flight=8)
+
+    async def run():
+        return await asyncio.gather(*(async_client.get(f"/objects/type{i}") for i in range(8)))
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    async_client.close()
+
+    assert results == [{"endpoint": f"/objects/type{i}"} for i in range(8)]
+    assert elapsed < 0.5  # Sequentially this takes 0.8s
+
+
+def test_in_flight_limit_is_respected():
+    async_client = AsyncOpenDicClient(slow_client(delay=0.05), max_in_flight=2)
+
+    async def run():
+        return await asyncio.gather(*(async_client.get("/objects") for _ in range(4)))
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    assert time.perf_counter() - start >= 0.1  # Two waves of two requests
+    async_client.close()
+
+
+def test_errors_propagate_to_the_awaiting_caller():
+    client = MagicMock()
+    client.delete.side_effect = RuntimeError("boom")
+    async_client = AsyncOpenDicClient(client)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(async_client.delete("/objects/function"))
+    async_client.close()
@@ -0,0 +1,84 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import requests
+
+from pyspark_opendic.batch import BatchUploader, bounded_map, chunked, send_each
+
+
+def udos(count):
+    return [{"type": "function", "name": f"f{i}", "props": {}} for i in range(count)]
+
+
+def test_chunked_is_lazy():
+    consumed = []
+
+    def source():
+        for i in range(5):
+            consumed.append(i)
+            yield i
+
+    chunks = chunked(source(), 2)
+    assert next(chunks) == [0, 1]
+    assert consumed == [0, 1]
+    assert list(chunks) == [[2, 3], [4]]
+
+
+def test_bounded_map_limits_in_flight_calls():
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def work(item):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.01)
+        with lock:
+            state["running"] -= 1
+        return item * 2
+
+    results = sorted(result for _, result, _ in bounded_map(work, range(20), max_in_flight=3))
+
+    assert results == [i * 2 for i in range(20)]
+    assert state["peak"] <= 3
+
+
+def test_upload_reports_failed_chunks_and_retries_only_those():
+    client = MagicMock()
+    failures = {"f2"}
+
+    def post(endpoint, chunk):
+        if any(udo["name"] in failures for udo in chunk):
+            raise requests.exceptions.HTTPError("413 Payload Too Large")
+        return {"created": len(chunk)}
+
+    client.post.side_effect = post
+    uploader = BatchUploader(client, chunk_size=2, max_in_flight=2)
+
+    report = uploader.upload("function", udos(5))
+
+    assert [chunk.status for chunk in report.chunks] == ["succeeded", "failed", "succeeded"]
+    assert report.summary() == {"chunks": 3, "failed_chunks": 1, "objects": 5, "failed_objects": 2, "rejected_objects": 0}
+    assert report.object_rows()[2] == {"name": "f2", "chunk": 1, "status": "failed", "error": "413 Payload Too Large"}
+    assert report.chunks[0].objects is None  # Payloads of successful chunks are not kept
+
+    failures.clear()
+    client.post.reset_mock()
+    retried = uploader.retry_failed(report)
+
+    assert retried.succeeded
+    client.post.assert_called_once_with("/objects/function/batch", udos(5)[2:4])
+
+
+def test_send_each_keeps_input_order_and_isolates_failures():
+    def work(delay):
+        time.sleep(delay)
+        if delay == 0:
+            raise ValueError("boom")
+        return delay
+
+    results = send_each(work, [("slow", 0.03), ("bad", 0), ("fast", 0.01)], max_in_flight=3)
+
+    assert [(result.name, result.status) for result in results] == [("slow", "succeeded"), ("bad", "failed"), ("fast", "succeeded")]
+    assert results[0].response == 0.03 and isinstance(results[1].error, ValueError)
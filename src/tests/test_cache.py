@@ -0,0 +1,150 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+
+from pyspark_opendic.cache import MISSING, LRUCache, ResponseCache, ValidatorCache
+from pyspark_opendic.client import OpenDicClient
+
+MOCK_API_URL = "https://mock-api-url.com"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used_and_counts_hits():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == 3
+    assert cache.stats() == {"hits": 2, "misses": 1, "size": 2, "maxsize": 2}
+
+
+def test_ttl_is_chosen_by_longest_prefix():
+    clock = FakeClock()
+    cache = ResponseCache(default_ttl=10, ttls={"/objects": 100, "/objects/function/platforms": 0}, clock=clock)
+
+    cache.put("/platforms", ["spark"])
+    cache.put("/objects/function", [])
+    cache.put("/objects/function/platforms", ["spark"])  # TTL 0 - never cached
+
+    clock.now = 50
+    assert cache.get("/platforms") is MISSING
+    assert cache.get("/objects/function") == []
+    assert cache.get("/objects/function/platforms") is MISSING
+
+
+@pytest.mark.parametrize("write_endpoint, invalidated, kept", [
+    ("/objects", {"/objects", "/platforms/spark/pull"}, {"/objects/function", "/platforms"}),
+    ("/objects/function", {"/objects", "/objects/function", "/objects/function/platforms", "/platforms", "/platforms/spark",
+                           "/objects/table/platforms/spark/pull"}, {"/objects/table"}),
+    ("/objects/function/f1", {"/objects", "/objects/function", "/platforms/spark/pull", "/objects/table/platforms/spark/pull"},
+     {"/objects/table", "/platforms", "/platforms/spark"}),
+    ("/objects/function/platforms/spark", {"/objects", "/objects/function/platforms", "/platforms", "/platforms/spark"}, {"/objects/table", "/platforms/snowflake"}),
+    ("/platforms/spark", {"/platforms", "/platforms/spark", "/objects/function/platforms"}, {"/objects", "/objects/function"}),
+])
+def test_writes_invalidate_affected_listings(write_endpoint, invalidated, kept):
+    cache = ResponseCache()
+    for endpoint in invalidated | kept:
+        cache.put(endpoint, endpoint)
+
+    cache.invalidate_for_write(write_endpoint)
+
+    assert {endpoint for endpoint in invalidated | kept if cache.get(endpoint) is not MISSING} == kept
+
+
+@patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "mocked_token", "expires_in": 3600})
+def test_client_serves_repeated_gets_from_cache_until_write(mock_token):
+    client = OpenDicClient(MOCK_API_URL, "s:s", share_token=False, cache=ResponseCache())
+    mock_response = Mock(status_code=200)
+    mock_response.json.return_value = [{"type": "function"}]
+    client.session.request = Mock(return_value=mock_response)
+
+    assert client.get("/objects/function") == [{"type": "function"}]
+    assert client.get("/objects/function") == [{"type": "function"}]
+    assert client.session.request.call_count == 1
+
+    client.put("/objects/function/my_function", {})
+    client.get("/objects/function")
+    assert client.session.request.call_count == 3
+
+    client.get("/objects/function", fresh=True)
+    assert client.session.request.call_count == 4
+
+
+@patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "mocked_token", "expires_in": 3600})
+def test_object_writes_invalidate_cached_pulls(mock_token):
+    client = OpenDicClient(MOCK_API_URL, "s:s", share_token=False, cache=ResponseCache())
+    mock_response = Mock(status_code=200)
+    mock_response.json.return_value = [{"definition": "CREATE FUNCTION f1 AS 'SELECT 1'"}]
+    client.session.request = Mock(return_value=mock_response)
+
+    client.get("/platforms/spark/pull")
+    client.post("/objects/function", {})
+    client.get("/platforms/spark/pull")
+    assert client.session.request.call_count == 3
+
+    client.get("/platforms/spark")
+    client.delete("/objects/function")
+    client.get("/platforms/spark")
+    assert client.session.request.call_count == 6
+
+
+# ---- Conditional requests against a local stand-in server ----
+
+class ETagHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = json.dumps([{"type": "function", "name": f"f{i}"} for i in range(100)]).encode()
+    etag = '"v1"'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(200, json.dumps({"access_token": "token", "expires_in": 3600}).encode())
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == self.etag:
+            self._reply(304, b"")
+        else:
+            self._reply(200, self.body, {"ETag": self.etag})
+
+    def _reply(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ETagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_conditional_get_serves_stored_body_on_304(stand_in_server):
+    validators = ValidatorCache()
+    with OpenDicClient(stand_in_server, "s:s", share_token=False, validators=validators) as client:
+        first = client.get("/objects/function")
+        second = client.get("/objects/function")
+
+    assert first == second == json.loads(ETagHandler.body)
+    assert validators.not_modified == 1
+    assert validators.stats()["bytes_saved"] == len(ETagHandler.body)
@@ -1,6 +1,8 @@
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
 
 from pyspark_opendic.catalog import OpenDicCatalog
 from pyspark_opendic.model.openapi_models import CreatePlatformMappingRequest, CreateUdoRequest, DefineUdoRequest, PlatformMapping, PlatformMappingObjectDumpMapValue, Statement, Udo
@@ -15,7 +17,7 @@ def mock_spark():
     return MagicMock()
 
 @pytest.fixture
-@patch('pyspark_opendic.client.OpenDicClient.get_polaris_oauth_token', return_value="mocked_token")
+@patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "mocked_token", "expires_in": 3600})
 def catalog(mock_get_token, mock_spark):
     """Creates an instance of OpenDicCatalog with mock Spark and mock credentials."""
     mock_spark.conf.get.return_value = "mock_client_id:mock_client_secret"
@@ -126,6 +128,23 @@ def test_create_batch_with_props(mock_post, catalog):
 
 
 
+@patch('pyspark_opendic.client.OpenDicClient.post')
+def test_create_batch_in_chunks_reports_per_object(mock_post, catalog):
+    catalog.batch_uploader.chunk_size = 2
+    mock_post.side_effect = lambda endpoint, chunk: {"created": len(chunk)}
+    objects = ", ".join(f'{{ "name": "f{i}", "definition": "SELECT {i}" }}' for i in range(5))
+
+    response = catalog.sql(f"CREATE OPEN BATCH function OBJECTS [{objects}]")
+
+    assert mock_post.call_count == 3
+    assert isinstance(response, pd.DataFrame)
+    assert list(response["name"]) == [f"f{i}" for i in range(5)]
+    assert list(response["chunk"]) == [0, 0, 1, 1, 2]
+    assert set(response["status"]) == {"succeeded"}
+    assert catalog.last_batch_report.succeeded
+
+
+
 # ---- Tests for Pydantic INVALID JSON ----
 @patch('pyspark_opendic.client.OpenDicClient.post')
 def test_invalid_json_in_props(mock_post, catalog):
@@ -157,6 +176,14 @@ def test_define_pydantic_error(mock_post, catalog):
     assert "error" in str(response)
     assert "validation error" in str(response)
 
+def test_invalid_opendic_syntax_reports_position(catalog, mock_spark):
+    response = catalog.sql("SHOW OPEN MAPPING function PLATFORMX spark")
+
+    assert isinstance(response, PrettyResponse)
+    assert response.data["error"] == "Invalid OpenDic syntax"
+    assert response.data["details"]["column"] == 28
+    mock_spark.sql.assert_not_called()
+
 # ---- Tests for SHOW ----
 @patch('pyspark_opendic.client.OpenDicClient.get')
 def test_show(mock_get, catalog):
@@ -238,9 +265,9 @@ def test_sync_function(mock_get, catalog):
         }]
     }   
 
-    mock_get.assert_called_once_with("/objects/function/platforms/spark/pull")
+    mock_get.assert_called_once_with("/objects/function/platforms/spark/pull", fresh=True)
     #mock_spark.sql.assert_called_once_with("CREATE OR REPLACE FUNCTION my_function AS 'SELECT 1';")
-    assert_catalog_response_equal(response, expected)
+    assert_executions_equal(response, expected)
 
 @patch('pyspark_opendic.client.OpenDicClient.get')
 def test_sync_all_objects_for_platform(mock_get, catalog):
@@ -256,8 +283,194 @@ def test_sync_all_objects_for_platform(mock_get, catalog):
         }]
     }
 
-    mock_get.assert_called_once_with("/platforms/spark/pull")
-    assert_catalog_response_equal(response, expected)
+    mock_get.assert_called_once_with("/platforms/spark/pull", fresh=True)
+    assert_executions_equal(response, expected)
+
+@patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "mocked_token", "expires_in": 3600})
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_incremental_sync_only_runs_changed_statements(mock_get, mock_token, mock_spark, tmp_path):
+    mock_spark.conf.get.return_value = "mock_client_id:mock_client_secret"
+    catalog = OpenDicCatalog(mock_spark, MOCK_API_URL, sync_state_dir=str(tmp_path))
+    f1, f2 = "CREATE OR REPLACE FUNCTION f1 AS 'SELECT 1'", "CREATE OR REPLACE FUNCTION f2 AS 'SELECT 2'"
+    temporary = "CREATE TEMPORARY FUNCTION t AS 'SELECT 3'"
+
+    def statuses(response):
+        return [execution["status"] for execution in response.data["executions"]]
+
+    def fail_f2(sql_text):
+        if sql_text == f2:
+            raise RuntimeError("boom")
+
+    mock_get.return_value = [{"definition": f1}, {"definition": f2}, {"definition": temporary}]
+    mock_spark.sql.side_effect = fail_f2
+    assert statuses(catalog.sql("SYNC OPEN function FOR spark")) == ["executed", "failed", "executed"]
+
+    # f1 is unchanged, f2 failed last time and the temporary function does not outlive the session
+    mock_spark.sql.side_effect = None
+    mock_spark.sql.reset_mock()
+    assert statuses(catalog.sql("SYNC OPEN function FOR spark")) == ["unchanged", "executed", "executed"]
+    assert [call.args[0] for call in mock_spark.sql.call_args_list] == [f2, temporary]
+
+    mock_get.return_value = [{"definition": f1.replace("1", "10")}, {"definition": f2}]
+    assert statuses(catalog.sql("SYNC OPEN function FOR spark")) == ["executed", "unchanged"]
+
+    # FULL ignores the watermark; other types and platforms keep their own
+    assert statuses(catalog.sql("SYNC OPEN function FOR spark FULL")) == ["executed", "executed"]
+    assert statuses(catalog.sql("SYNC OPEN OBJECTS FOR spark")) == ["executed", "executed"]
+
+@patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "mocked_token", "expires_in": 3600})
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_incremental_sync_reruns_statements_whose_object_is_missing(mock_get, mock_token, mock_spark, tmp_path):
+    mock_spark.conf.get.return_value = "mock_client_id:mock_client_secret"
+    f1, v1 = "CREATE OR REPLACE FUNCTION f1 AS 'SELECT 1'", "CREATE OR REPLACE VIEW v1 AS SELECT 1"
+    mock_get.return_value = [{"definition": f1}, {"definition": v1}]
+    OpenDicCatalog(mock_spark, MOCK_API_URL, sync_state_dir=str(tmp_path)).sql("SYNC OPEN function FOR spark")
+
+    # A new session shares the watermark but not the objects, e.g. a local catalog without a metastore
+    mock_spark.catalog.functionExists.return_value = False
+    mock_spark.catalog.tableExists.return_value = True
+    response = OpenDicCatalog(mock_spark, MOCK_API_URL, sync_state_dir=str(tmp_path)).sql("SYNC OPEN function FOR spark")
+
+    assert [execution["status"] for execution in response.data["executions"]] == ["executed", "unchanged"]
+    mock_spark.catalog.functionExists.assert_called_with("f1")
+    mock_spark.catalog.tableExists.assert_called_with("v1")
+
+@patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "mocked_token", "expires_in": 3600})
+@patch('pyspark_opendic.client.OpenDicClient.stream_get')
+def test_streaming_sync_executes_while_reading(mock_stream_get, mock_token, mock_spark):
+    mock_spark.conf.get.return_value = "mock_client_id:mock_client_secret"
+    catalog = OpenDicCatalog(mock_spark, MOCK_API_URL, streaming_pull=True)
+    executed_before_second_item = []
+
+    def pull(endpoint):
+        yield {"definition": "CREATE FUNCTION f1 AS 'SELECT 1'"}
+        executed_before_second_item.extend(call.args[0] for call in mock_spark.sql.call_args_list)
+        yield {"definition": "CREATE FUNCTION f2 AS 'SELECT 2'"}
+        raise ValueError("Incomplete JSON array: the response ended early")
+
+    mock_stream_get.side_effect = pull
+
+    response = catalog.sql("SYNC OPEN OBJECTS FOR spark")
+
+    mock_stream_get.assert_called_once_with("/platforms/spark/pull")
+    assert executed_before_second_item == ["CREATE FUNCTION f1 AS 'SELECT 1'"]
+    assert response.data["error"] == "The pulled statements could not be read completely"
+    assert [execution["status"] for execution in response.data["executions"]] == ["executed", "executed"]
+
+@patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "mocked_token", "expires_in": 3600})
+def test_streaming_sync_reports_http_errors_of_the_pull(mock_token, mock_spark):
+    mock_spark.conf.get.return_value = "mock_client_id:mock_client_secret"
+    catalog = OpenDicCatalog(mock_spark, MOCK_API_URL, streaming_pull=True)
+    error_response = requests.Response()
+    error_response.status_code = 404
+    catalog.client.session.request = MagicMock(return_value=error_response)
+
+    response = catalog.sql("SYNC OPEN function FOR spark")
+
+    assert response.data["error"] == "HTTP Error"
+    mock_spark.sql.assert_not_called()
+
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_sync_many_platforms_concurrently(mock_get, catalog, mock_spark):
+    pulls = {
+        "/platforms/spark/pull": [{"definition": "CREATE FUNCTION f1 AS 'SELECT 1'"}, {"definition": "CREATE FUNCTION f2 AS 'SELECT 2'"}],
+        "/platforms/snowflake/pull": [{"definition": "CREATE OR REPLACE FUNCTION f1() RETURNS INT AS '1'"}],
+    }
+
+    def get(endpoint, fresh=False):
+        if endpoint not in pulls:
+            raise requests.exceptions.HTTPError("404 Client Error")
+        return pulls[endpoint]
+
+    mock_get.side_effect = get
+
+    response = catalog.sql("SYNC OPEN OBJECTS FOR Spark, snowflake, duckdb")
+
+    assert response.data["error"] == "Sync finished with errors on 1 of 3 targets"
+    assert response.data["summary"] == {"targets": 3, "failed_targets": 1}
+    table = pd.DataFrame(response.data["response"])
+    rows = table.set_index("platform")
+    assert list(table["platform"]) == ["spark", "snowflake", "duckdb"]
+    assert (rows.loc["spark", "statements"], rows.loc["spark", "executed"]) == (2, 2)
+    assert rows.loc["spark", "execute_seconds"] >= 0 and rows.loc["snowflake", "pull_seconds"] >= 0
+    assert rows.loc["snowflake", "executed"] == 0
+    assert "404" in rows.loc["duckdb", "error"]
+    assert list(table["status"]) == ["succeeded", "succeeded", "failed"]
+    # Only the Spark statements run locally - the others are kept for their own engines
+    assert mock_spark.sql.call_count == 2
+    assert catalog.last_sync_statements == {(None, "snowflake"): ["CREATE OR REPLACE FUNCTION f1() RETURNS INT AS '1'"]}
+
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_sync_api_with_object_types(mock_get, catalog):
+    mock_get.return_value = [{"definition": "CREATE FUNCTION f1 AS 'SELECT 1'"}]
+
+    response = catalog.sync("spark", object_types=["function", "view"])
+
+    assert sorted(call.args[0] for call in mock_get.call_args_list) == ["/objects/function/platforms/spark/pull", "/objects/view/platforms/spark/pull"]
+    assert list(response["object_type"]) == ["function", "view"]
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_sync_plan_then_apply_only_the_delta(mock_get, catalog, mock_spark):
+    existing = MagicMock()
+    existing.name = "F_OLD"
+    mock_spark.catalog.listFunctions.return_value = [existing]
+    mock_get.return_value = [
+        {"definition": "CREATE OR REPLACE FUNCTION f_new AS 'SELECT 1'"},
+        {"definition": "    CREATE FUNCTION IF NOT EXISTS f_old AS 'SELECT 2'"},
+        {"definition": "CREATE OR REPLACE FUNCTION f_new AS 'SELECT 1'\n"},
+    ]
+
+    response = catalog.sql("SYNC OPEN function FOR spark PLAN")
+
+    assert list(response["action"]) == ["create", "no-op", "no-op"]
+    assert list(response["name"]) == ["f_new", "f_old", "f_new"]
+    assert response.attrs["summary"] == {"statements": 3, "create": 1, "replace": 0, "no-op": 2}
+    mock_spark.sql.assert_not_called()
+
+    result = catalog.apply_sync_plan()
+    mock_spark.sql.assert_called_once_with("CREATE OR REPLACE FUNCTION f_new AS 'SELECT 1'")
+    assert [execution["status"] for execution in result.data["executions"]] == ["executed"]
+
+
+
+# ---- Tests for local rendering ----
+LOCAL_MAPPING = PlatformMapping(
+    typeName="function", platformName="spark", syntax="CREATE OR REPLACE FUNCTION {name} AS '{def}'",
+    objectDumpMap={"def": PlatformMappingObjectDumpMapValue(propType="string", format="<value>", delimiter="")},
+)
+
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_sync_local_renders_without_the_server(mock_get, catalog, mock_spark):
+    catalog.mappings.add(LOCAL_MAPPING)
+    objects = [{"type": "function", "name": "f1", "props": {"def": "SELECT 1"}}]
+
+    response = catalog.sync_local("function", objects=objects)
+
+    mock_get.assert_not_called()
+    mock_spark.sql.assert_called_once_with("CREATE OR REPLACE FUNCTION f1 AS 'SELECT 1'")
+    assert response.data["executions"][0]["status"] == "executed"
+
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_sync_local_verify_compares_with_the_server(mock_get, catalog, mock_spark):
+    catalog.mappings.add(LOCAL_MAPPING)
+    pulls = {
+        "/objects/function": [{"type": "function", "name": "f1", "props": {"def": "SELECT 1"}},
+                              {"type": "function", "name": "f2", "props": {"def": "SELECT 2"}}],
+        "/objects/function/platforms/spark/pull": [{"definition": "CREATE OR REPLACE FUNCTION f2 AS 'SELECT 2'"},
+                                                   {"definition": "    CREATE OR REPLACE FUNCTION f1 AS 'SELECT 1'\n"}],
+    }
+    mock_get.side_effect = lambda endpoint, fresh=False: pulls[endpoint]
+
+    response = catalog.sync_local("function", verify=True)
+
+    assert response.data == {"success": "Local rendering matches the server", "summary": {"local": 2, "server": 2, "differences": 0}}
+    mock_spark.sql.assert_not_called()
+
+    pulls["/objects/function/platforms/spark/pull"][0] = {"definition": "CREATE FUNCTION f2 AS 'SELECT 2'"}
+    response = catalog.sync_local("function", verify=True)
+    assert response.data["error"] == "Local rendering differs from the server"
+    assert response.data["summary"] == {"local": 2, "server": 2, "differences": 2}
+    assert [row["difference"] for row in response.data["response"]] == ["only on server", "only local"]
+    assert [row["definition"] for row in response.data["response"]] == ["CREATE FUNCTION f2 AS 'SELECT 2'", "CREATE OR REPLACE FUNCTION f2 AS 'SELECT 2'"]
 
 
 # ---- Tests for DEFINE ----
@@ -425,6 +638,207 @@ def test_alter_with_props(mock_put, catalog):
         "response": {"success": True}
     })
 
+# ---- Tests for the parsed-command cache ----
+@patch('pyspark_opendic.client.OpenDicClient.post')
+def test_repeated_statements_skip_parsing_and_validation(mock_post, catalog):
+    mock_post.return_value = {"success": True}
+    query = 'DEFINE OPEN function PROPS { "language": "string" }'
+
+    with patch.object(catalog.parser, "parse", wraps=catalog.parser.parse) as mock_parse:
+        catalog.sql(query)
+        catalog.sql("  " + query + "\n")
+
+    assert mock_parse.call_count == 1
+    assert catalog.command_cache_info()["hits"] == 1
+    assert catalog.command_cache_info()["misses"] == 1
+    # The validated payload is built once and reused by the cached command
+    assert mock_post.call_args_list[0].args[1] is mock_post.call_args_list[1].args[1]
+
+def test_native_sql_is_not_cached(catalog):
+    catalog.sql("SELECT 1")
+    catalog.sql("SELECT 1")
+
+    assert catalog.command_cache_info()["size"] == 0
+    assert catalog.command_cache_info()["misses"] == 0
+    assert catalog.sparkSession.sql.call_count == 2
+
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_command_cache_can_be_disabled(mock_get, mock_spark):
+    mock_spark.conf.get.return_value = "mock_client_id:mock_client_secret"
+    catalog = OpenDicCatalog(mock_spark, MOCK_API_URL, command_cache_size=0)
+    mock_get.return_value = {"success": True}
+
+    catalog.sql("SHOW OPEN TYPES")
+
+    assert catalog.command_cache is None
+    assert catalog.command_cache_info()["hits"] == 0
+
+# ---- Tests for bulk registration ----
+@patch('pyspark_opendic.client.OpenDicClient.post')
+def test_create_objects_from_dataframe(mock_post, catalog):
+    mock_post.side_effect = lambda endpoint, chunk: {"created": len(chunk)}
+    df = pd.DataFrame({"name": ["f0", "f1", "f2"], "language": ["sql", "python", None]})
+
+    response = catalog.create_objects_from(df, "function", chunk_size=2)
+
+    assert [call.args[1][0]["name"] for call in mock_post.call_args_list] == ["f0", "f2"]
+    assert mock_post.call_args_list[1].args[1][0]["props"] == {}
+    assert list(response["name"]) == ["f0", "f1", "f2"]
+    assert list(response["status"]) == ["succeeded"] * 3
+
+@patch('pyspark_opendic.client.OpenDicClient.post')
+def test_create_objects_from_reports_bad_rows(mock_post, catalog):
+    mock_post.return_value = {}
+    rows = [{"name": "f0"}, {"name": "f1"}, {"language": "sql"}]
+
+    response = catalog.create_objects_from(rows, "function", chunk_size=2)
+
+    assert isinstance(response, PrettyResponse)
+    assert "Row 2" in response.data["exception message"]
+    assert response.data["summary"]["objects"] == 2  # the rows read before the bad one were still sent
+    assert catalog.last_batch_report.source_error is not None
+
+@patch('pyspark_opendic.client.OpenDicClient.put')
+@patch('pyspark_opendic.client.OpenDicClient.post')
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_create_or_replace_batch_writes_only_changes(mock_get, mock_post, mock_put, catalog):
+    mock_get.return_value = [
+        {"type": "function", "name": "same", "props": {"language": "sql", "version": 1}, "entityVersion": 3},
+        {"type": "function", "name": "changed", "props": {"language": "sql"}, "entityVersion": 7},
+    ]
+    mock_post.return_value = {}
+    mock_put.return_value = {}
+
+    response = catalog.sql("""
+    CREATE OR REPLACE OPEN BATCH function OBJECTS [
+        {"name": "same", "version": 1, "language": "sql"},
+        {"name": "changed", "language": "python"},
+        {"name": "new"}
+    ]""")
+
+    mock_get.assert_called_once_with("/objects/function", fresh=True)
+    assert [udo["name"] for udo in mock_post.call_args.args[1]] == ["new"]
+    endpoint, payload = mock_put.call_args.args
+    assert endpoint == "/objects/function/changed"
+    assert payload["udo"]["entityVersion"] == 7 and payload["udo"]["props"] == {"language": "python"}
+    assert dict(zip(response["name"], response["action"])) == {"new": "create", "changed": "update", "same": "none"}
+    assert response.attrs["summary"] == {"created": 1, "updated": 1, "unchanged": 1, "failed": 0, "rejected": 0}
+
+@patch('pyspark_opendic.client.OpenDicClient.put', side_effect=requests.exceptions.HTTPError("409 Conflict"))
+@patch('pyspark_opendic.client.OpenDicClient.post', return_value={"success": True})
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_upsert_objects_with_a_failed_update_is_reported_as_an_error(mock_get, mock_post, mock_put, catalog):
+    mock_get.return_value = [{"type": "function", "name": "changed", "props": {"language": "sql"}, "entityVersion": 1}]
+    df = pd.DataFrame({"name": ["new", "changed"], "language": ["sql", "python"]})
+
+    response = catalog.upsert_objects(df, "function")
+
+    assert isinstance(response, PrettyResponse)
+    assert response.data["error"] == "Objects upserted with failures"
+    assert response.data["summary"] == {"created": 1, "updated": 0, "unchanged": 0, "failed": 1, "rejected": 0}
+    assert {row["name"]: row["status"] for row in response.data["response"]} == {"new": "succeeded", "changed": "failed"}
+
+@patch('pyspark_opendic.client.OpenDicClient.put')
+@patch('pyspark_opendic.client.OpenDicClient.post')
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_upsert_objects_dry_run_sends_nothing(mock_get, mock_post, mock_put, catalog):
+    mock_get.return_value = {"objects": [{"type": "function", "name": "f0", "props": {"language": "sql"}}]}
+    df = pd.DataFrame({"name": ["f0", "f1"], "language": ["sql", "sql"]})
+
+    response = catalog.upsert_objects(df, "function", dry_run=True)
+
+    assert dict(zip(response["name"], response["action"])) == {"f1": "create", "f0": "none"}
+    mock_post.assert_not_called()
+    mock_put.assert_not_called()
+
+@patch('pyspark_opendic.client.OpenDicClient.put')
+def test_alter_batch_reports_per_object(mock_put, catalog):
+    def put(endpoint, payload):
+        if endpoint.endswith("/f1"):
+            raise requests.exceptions.HTTPError("404 Not Found")
+        return {"altered": payload["udo"]["name"]}
+
+    mock_put.side_effect = put
+
+    response = catalog.sql('ALTER OPEN BATCH function OBJECTS [{"name": "f0", "language": "python"}, {"name": "f1"}, {"name": "f2"}]')
+
+    assert sorted(call.args[0] for call in mock_put.call_args_list) == ["/objects/function/f0", "/objects/function/f1", "/objects/function/f2"]
+    assert response.data["error"] == "Objects altered with 1 failures"
+    assert [(row["name"], row["status"]) for row in response.data["response"]] == [("f0", "succeeded"), ("f1", "failed"), ("f2", "succeeded")]
+
+@patch('pyspark_opendic.client.OpenDicClient.delete')
+def test_drop_objects(mock_delete, catalog):
+    mock_delete.return_value = {}
+
+    response = catalog.drop_objects("function", (f"f{i}" for i in range(20)))
+
+    assert mock_delete.call_count == 20
+    assert list(response["name"]) == [f"f{i}" for i in range(20)]
+    assert set(response["status"]) == {"succeeded"}
+    assert response.attrs["summary"] == {"objects": 20, "failed_objects": 0}
+
+@patch('pyspark_opendic.client.OpenDicClient.delete')
+def test_drop_batch_with_failures_is_reported_as_an_error(mock_delete, catalog):
+    def delete(endpoint):
+        if endpoint.endswith("/f1"):
+            raise requests.exceptions.HTTPError("404 Not Found")
+        return {}
+    mock_delete.side_effect = delete
+
+    response = catalog.sql('DROP OPEN BATCH function OBJECTS ["f0", "f1"]')
+
+    assert isinstance(response, PrettyResponse)
+    assert response.data["error"] == "Objects dropped with 1 failures"
+    assert response.data["summary"] == {"objects": 2, "failed_objects": 1}
+    assert response.data["response"][1] == {"name": "f1", "status": "failed", "error": "404 Not Found"}
+
+# ---- Tests for concurrent execution ----
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_sql_many_returns_results_in_order_with_errors(mock_get, catalog, mock_spark):
+    mock_get.side_effect = lambda endpoint: [{"endpoint": endpoint}]
+    mock_spark.sql.side_effect = RuntimeError("Table or view not found")
+
+    results = catalog.sql_many(["SHOW OPEN function", "SELECT * FROM missing", "SHOW OPEN table"])
+
+    assert list(results[0]["endpoint"]) == ["/objects/function"]
+    assert isinstance(results[1], PrettyResponse)
+    assert results[1].data["details"]["exception_message"] == "Table or view not found"
+    assert list(results[2]["endpoint"]) == ["/objects/table"]
+
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_sql_async(mock_get, catalog):
+    mock_get.return_value = [{"type": "function"}]
+
+    async def run():
+        return await asyncio.gather(catalog.sql_async("SHOW OPEN TYPES"), catalog.sql_async("SHOW OPEN PLATFORMS"))
+
+    types_result, platforms_result = asyncio.run(run())
+
+    assert isinstance(types_result, pd.DataFrame) and isinstance(platforms_result, pd.DataFrame)
+    assert sorted(call.args[0] for call in mock_get.call_args_list) == ["/objects", "/platforms"]
+
+# ---- Tests for HTTP errors ----
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_http_error_is_reported_without_recursing(mock_get, catalog):
+    # The client has already re-authenticated and retried, so the catalog must only report the error
+    error_response = requests.Response()
+    error_response.status_code = 401
+    mock_get.side_effect = requests.exceptions.HTTPError("401 Client Error", response=error_response)
+
+    response = catalog.sql("SHOW OPEN TYPES")
+
+    assert isinstance(response, PrettyResponse)
+    assert response.data["error"] == "HTTP Error"
+    mock_get.assert_called_once_with("/objects")
+
+def test_dump_handler_in_parallel_keeps_statement_order(catalog, mock_spark):
+    statements = [Statement(definition=f"CREATE FUNCTION f{i}(x INT) RETURN x") for i in range(10)]
+
+    result = catalog.dump_handler(statements, parallelism=4)
+
+    assert [execution["sql"] for execution in result.data["executions"]] == [statement.definition for statement in statements]
+    assert mock_spark.sql.call_count == 10
+
 def test_dump_handler_invalid_escaped_sql(catalog):
     # This simulates a Polaris sync returning back a weirdly escaped SQL string
     # (same style as what we saw in the screenshot)
@@ -469,3 +883,127 @@ def assert_catalog_response_equal(actual, expected_dict):
         # Compare their string output
         assert str(actual) == str(expected_df)
 
+
+
+# Helper function to compare executed statements, leaving out the per-statement timings
+def assert_executions_equal(actual, expected_dict):
+    assert isinstance(actual, PrettyResponse)
+    executions = actual.data["executions"]
+    assert [{key: value for key, value in execution.items() if key not in ("seconds", "attempts")} for execution in executions] \
+        == expected_dict["executions"]
+    assert all(execution["seconds"] >= 0 for execution in executions)
+    assert actual.data["summary"]["statements"] == len(expected_dict["executions"])
+
+
+# ---- Result modes ----
+
+@patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "mocked_token", "expires_in": 3600})
+def test_unknown_result_mode_is_rejected(mock_token, mock_spark):
+    mock_spark.conf.get.return_value = "mock_client_id:mock_client_secret"
+
+    with pytest.raises(ValueError, match="result_mode"):
+        OpenDicCatalog(mock_spark, MOCK_API_URL, result_mode="polars")
+
+
+@patch('pyspark_opendic.catalog.rows_to_spark')
+@patch('pyspark_opendic.catalog.require_pyarrow')
+@patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "mocked_token", "expires_in": 3600})
+def test_spark_result_mode_returns_spark_dataframes(mock_token, mock_require, mock_rows_to_spark, mock_spark):
+    mock_spark.conf.get.return_value = "mock_client_id:mock_client_secret"
+    catalog = OpenDicCatalog(mock_spark, MOCK_API_URL, result_mode="spark")
+
+    table = catalog.pretty_print_result({"success": "ok", "response": [{"name": "f0"}]})
+    message = catalog.pretty_print_result({"error": "HTTP Error"})
+
+    mock_rows_to_spark.assert_called_once_with(mock_spark, [{"name": "f0"}])
+    assert table is mock_rows_to_spark.return_value
+    assert isinstance(message, PrettyResponse)
+
+
+# ---- Typed results ----
+
+@patch('pyspark_opendic.client.OpenDicClient.delete', return_value={"success": True})
+@patch('pyspark_opendic.client.OpenDicClient.post', return_value={"success": True})
+@patch('pyspark_opendic.client.OpenDicClient.get')
+def test_show_flattens_props_of_defined_types(mock_get, mock_post, mock_delete, catalog):
+    mock_get.return_value = [{"type": "function", "name": "f0", "props": {"language": "sql", "arity": "2"}}]
+
+    catalog.sql('DEFINE OPEN function PROPS { "language": "string", "arity": "int" }')
+    response = catalog.sql("SHOW OPEN functions")
+
+    assert list(response.columns) == ["type", "name", "language", "arity"]
+    assert str(response["arity"].dtype) == "Int64"
+
+    catalog.sql("DROP OPEN function")
+    assert "props" in catalog.sql("SHOW OPEN functions").columns
+
+
+@patch('pyspark_opendic.client.OpenDicClient.get')
+@patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "mocked_token", "expires_in": 3600})
+def test_lazy_result_mode_defers_building_the_dataframe(mock_token, mock_get, mock_spark):
+    mock_spark.conf.get.return_value = "mock_client_id:mock_client_secret"
+    mock_get.return_value = [{"type": "function", "name": "f0"}]
+    catalog = OpenDicCatalog(mock_spark, MOCK_API_URL, result_mode="lazy")
+
+    with patch('pyspark_opendic.results.pd.DataFrame') as frame:
+        result = catalog.sql("SHOW OPEN functions")
+        frame.assert_not_called()
+
+    assert result.rows == [{"type": "function", "name": "f0"}]
+    assert result.to_pandas()["name"].tolist() == ["f0"]
+
+
+# ---- Local props validation ----
+
+@patch('pyspark_opendic.client.OpenDicClient.post')
+def test_create_with_props_of_the_wrong_type_is_rejected_locally(mock_post, catalog):
+    catalog.type_schemas.add("function", {"language": "string", "version": "int"})
+
+    response = catalog.sql('CREATE OPEN function f0 PROPS { "language": "sql", "version": "2" }')
+
+    assert isinstance(response, PrettyResponse)
+    assert response.data == {"error": "Invalid props", "details": {"f0": ["prop 'version' must be int, not str '2'"]}}
+    mock_post.assert_not_called()
+
+
+@patch('pyspark_opendic.client.OpenDicClient.put', return_value={"success": True})
+@patch('pyspark_opendic.client.OpenDicClient.post', return_value={"success": True})
+def test_batches_send_only_valid_objects_and_report_the_others(mock_post, mock_put, catalog):
+    catalog.type_schemas.add("function", {"version": "int"})
+
+    created = catalog.sql('CREATE OPEN BATCH function OBJECTS [{"name": "f0", "version": 1}, {"name": "f1", "version": "x"}]')
+    altered = catalog.sql('ALTER OPEN BATCH function OBJECTS [{"name": "f0", "version": "x"}, {"name": "f1", "version": 2}]')
+
+    assert [udo["name"] for udo in mock_post.call_args.args[1]] == ["f0"]
+    assert [(row["name"], row["status"]) for row in created.data["response"]] == [("f0", "succeeded"), ("f1", "rejected")]
+    assert catalog.last_batch_report.summary()["rejected_objects"] == 1
+    mock_put.assert_called_once()
+    assert mock_put.call_args.args[0] == "/objects/function/f1"
+    assert [row["status"] for row in altered.data["response"]] == ["succeeded", "rejected"]
+
+
+
+@patch('pyspark_opendic.client.OpenDicClient.post')
+def test_partly_failed_batch_is_reported_as_an_error(mock_post, catalog):
+    def post(endpoint, payload):
+        if payload[0]["name"] == "f2":
+            raise requests.exceptions.HTTPError("500 Server Error")
+        return {"created": len(payload)}
+    mock_post.side_effect = post
+
+    response = catalog.create_objects_from([{"name": f"f{i}"} for i in range(4)], "function", chunk_size=2)
+
+    assert isinstance(response, PrettyResponse)
+    assert response.data["error"] == "Objects created with failed chunks - use retry_failed_batch()"
+    assert response.data["summary"]["failed_objects"] == 2
+    assert [row["status"] for row in response.data["response"]] == ["succeeded", "succeeded", "failed", "failed"]
+    assert "500 Server Error" in repr(response)
+
+
+@patch('pyspark_opendic.client.OpenDicClient.post', return_value={"created": 2})
+def test_successful_batch_keeps_its_summary_on_the_table(mock_post, catalog):
+    response = catalog.create_objects_from([{"name": f"f{i}"} for i in range(4)], "function", chunk_size=2)
+
+    assert isinstance(response, pd.DataFrame)
+    assert response.attrs["success"] == "Objects created"
+    assert response.attrs["summary"]["objects"] == 4
@@ -14,32 +14,33 @@ from pyspark_opendic.model.openapi_models import CreateUdoRequest, Udo
 MOCK_API_URL = "https://mock-api-url.com"
 
 @pytest.fixture
-@patch('pyspark_opendic.client.OpenDicClient.get_polaris_oauth_token', return_value="mocked_token")
-def client(mock_get_token):
-    """Creates an instance of OpenDicClient."""
-    return OpenDicClient(MOCK_API_URL, "s:s")
+def client():
+    """Creates an instance of OpenDicClient with its own (mocked) token manager."""
+    with patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "mocked_token", "expires_in": 3600}):
+        yield OpenDicClient(MOCK_API_URL, "s:s", share_token=False)
 
 
-@patch("requests.post")
-def test_post_function(mock_post : requests.post, client):
+def test_post_function(client):
     """Test if the OpenDicClient correctly sends a POST request."""
 
-    # Fake the API response on the mock object (the requests.post function)
+    # Fake the API response on the mock object (the pooled session's request function)
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.json.return_value = {"success": True}
-    mock_post.return_value = mock_response
+    client.session.request = Mock(return_value=mock_response)
 
     dict_props = {"args": {"arg1": "string", "arg2": "number"}, "language": "sql", "definition": "SELECT * FROM my_table"}
     udo_object = Udo(type = "function", name = "my_function", props = dict_props)
     payload = CreateUdoRequest(udo = udo_object).model_dump()
 
-    # Call the actual function (this normally calls requests.post - which is replaced with mock_post here)
+    # Call the actual function (this normally calls session.request - which is replaced with a mock here)
     response = client.post("/objects/functions", payload)
 
-    # Verify that requests.post was actually called with the right URL & data
-    mock_post.assert_called_with(
+    # Verify that the session was actually called with the right URL & data
+    client.session.request.assert_called_with(
+        "POST",
         f"{MOCK_API_URL}/opendic/v1/objects/functions",
+        timeout = client.timeout,
         json = payload,
         headers = {'Authorization': 'Bearer mocked_token', 'Content-Type': 'application/json'}
     )
@@ -48,24 +49,45 @@ def test_post_function(mock_post : requests.post, client):
     assert response == {"success": True}
 
 # TODO: obs. not sure about the return format of SHOW yet, so this test is a placeholder
-@patch("requests.get")
-def test_get_function(mock_get : requests.get, client):
+def test_get_function(client):
     """Test if OpenDicClient correctly sends a GET request."""
 
-    # Fake the API response on the mock object (the requests.get function)
+    # Fake the API response on the mock object (the pooled session's request function)
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.json.return_value = {"success": True}
-    mock_get.return_value = mock_response
+    client.session.request = Mock(return_value=mock_response)
 
     # Call the actual function
     response = client.get("/objects/functions")
 
-    # Verify that requests.get was actually called with the right URL
-    mock_get.assert_called_with(
+    # Verify that the session was actually called with the right URL
+    client.session.request.assert_called_with(
+        "GET",
         f"{MOCK_API_URL}/opendic/v1/objects/functions",
+        timeout=client.timeout,
         headers={"Authorization": "Bearer mocked_token"}
     )
 
     # Check if we got the expected response
     assert response == {"success": True}
+
+
+def test_verbs_and_oauth_share_one_pool():
+    """Test that the OAuth token call and every verb go through the same pooled session."""
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"access_token": "pooled_token"}
+
+    with patch("requests.Session.request", return_value=mock_response) as mock_request:
+        client = OpenDicClient(MOCK_API_URL, "id:secret", pool_maxsize=4, timeout=2.0, share_token=False)
+        client.get("/objects")
+        client.delete("/objects/function")
+
+    assert mock_request.call_count == 3
+    assert mock_request.call_args_list[0].args == ("POST", f"{MOCK_API_URL}/catalog/v1/oauth/tokens")
+    assert all(call.kwargs["timeout"] == 2.0 for call in mock_request.call_args_list)
+    assert client.oauth_token == "pooled_token"
+
+    adapter = client.session.get_adapter(MOCK_API_URL)
+    assert adapter._pool_maxsize == 4
@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+
+from pyspark_opendic.execution import StatementPolicy, defined_name, dependency_graph, dependency_waves, execution_summary, run_statements
+
+
+@pytest.mark.parametrize("sql_text, name", [
+    ("CREATE FUNCTION foo(a INT) RETURNS INT RETURN a", "foo"),
+    ("create or replace temporary function db.`Foo`(a INT)", "foo"),
+    ("CREATE OR ALTER function bar(arg1 int)", "bar"),
+    ("CREATE VIEW IF NOT EXISTS v AS SELECT 1", "v"),
+    ("SELECT 1", None),
+])
+def test_defined_name(sql_text, name):
+    assert defined_name(sql_text) == name
+
+
+def test_waves_follow_references_and_redefinitions():
+    sql_texts = [
+        "CREATE FUNCTION base(x INT) RETURN x",      # 0
+        "CREATE VIEW v AS SELECT base(x) FROM t",    # 1 -> 0
+        "CREATE FUNCTION other(x INT) RETURN x",     # 2
+        "CREATE OR REPLACE FUNCTION base(x INT) RETURN x + 1",  # 3 -> 0
+        "CREATE VIEW w AS SELECT v.x FROM v",        # 4 -> 1
+    ]
+
+    dependencies = dependency_graph(sql_texts)
+
+    assert dependencies == [set(), {0}, set(), {0}, {1}]
+    assert dependency_waves(dependencies) == [[0, 2], [1, 3], [4]]
+
+
+def test_statements_only_depend_on_earlier_statements():
+    sql_texts = [
+        "DROP FUNCTION IF EXISTS f",       # 0
+        "CREATE FUNCTION f(x INT) RETURN x",  # 1 -> 0
+        "DROP FUNCTION f",                 # 2 -> 1
+        "CREATE FUNCTION f(x INT) RETURN x + 1",  # 3 -> 0, 1, 2
+        "CREATE VIEW v AS SELECT g(1)",    # 4
+        "CREATE FUNCTION g(x INT) RETURN x",  # 5
+    ]
+
+    dependencies = dependency_graph(sql_texts)
+
+    assert dependencies == [set(), {0}, {1}, {0, 1, 2}, set(), set()]
+    assert dependency_waves(dependencies) == [[0, 4, 5], [1], [2], [3]]
+
+
+def test_cycles_are_broken_in_original_order():
+    assert dependency_waves([{1}, {0}, set()]) == [[2], [0], [1]]
+
+
+def test_parallel_run_keeps_original_order_and_respects_dependencies():
+    executed = []
+    lock = threading.Lock()
+
+    def execute(sql_text):
+        time.sleep(0.01 if "slow" in sql_text else 0)
+        with lock:
+            executed.append(defined_name(sql_text))
+
+    sql_texts = ["CREATE FUNCTION slow_fn(x INT) RETURN x", "CREATE FUNCTION f(x INT) RETURN x", "CREATE VIEW v AS SELECT slow_fn(1)"]
+
+    results = run_statements(execute, sql_texts, parallelism=4)
+
+    assert [result["sql"] for result in results] == sql_texts
+    assert all(result["status"] == "executed" for result in results)
+    assert executed.index("slow_fn") < executed.index("v")
+
+
+def test_dependents_of_a_failed_statement_are_skipped():
+    def execute(sql_text):
+        if "broken" in sql_text and sql_text.startswith("CREATE FUNCTION"):
+            raise RuntimeError("syntax error")
+
+    results = run_statements(execute, ["CREATE FUNCTION broken(x INT)", "CREATE VIEW v AS SELECT broken(1)"], parallelism=2)
+
+    assert [result["status"] for result in results] == ["failed", "skipped"]
+    assert results[0]["error"] == "syntax error"
+    assert "statement 0" in results[1]["error"]
+
+
+def test_parallelism_runs_statements_concurrently():
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def execute(sql_text):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.01)
+        with lock:
+            state["running"] -= 1
+
+    run_statements(execute, [f"CREATE FUNCTION f{i}(x INT) RETURN x" for i in range(8)], parallelism=4)
+
+    assert state["peak"] == 4
+
+
+def test_transient_errors_are_retried_with_backoff():
+    attempts = {"flaky": 0}
+    sleeps = []
+
+    def execute(sql_text):
+        if sql_text == "flaky":
+            attempts["flaky"] += 1
+            if attempts["flaky"] < 3:
+                raise RuntimeError("Timed out waiting for metastore")
+        elif sql_text == "broken":
+            raise RuntimeError("PARSE_SYNTAX_ERROR")
+
+    policy = StatementPolicy(max_attempts=3, backoff_base=0.1, sleep=sleeps.append)
+    results = run_statements(execute, ["flaky", "broken"], policy=policy)
+
+    assert [(result["status"], result["attempts"]) for result in results] == [("executed", 3), ("failed", 1)]
+    assert sleeps == [0.1, 0.2]
+
+
+@pytest.mark.parametrize("parallelism", [1, 2])
+def test_fail_fast_skips_statements_that_have_not_started(parallelism):
+    def execute(sql_text):
+        if sql_text == "CREATE FUNCTION bad(x INT)":
+            raise RuntimeError("syntax error")
+
+    sql_texts = ["CREATE FUNCTION bad(x INT)", "CREATE VIEW v AS SELECT bad(1)", "CREATE VIEW w AS SELECT v.x FROM v"]
+    results = run_statements(execute, sql_texts, parallelism=parallelism, policy=StatementPolicy(fail_fast=True))
+
+    assert [result["status"] for result in results] == ["failed", "skipped", "skipped"]
+
+
+def test_execution_summary():
+    results = [{"sql": f"s{i}", "status": "executed", "seconds": float(i), "attempts": 1} for i in range(1, 21)]
+    results += [
+        {"sql": "retried", "status": "failed", "seconds": 0.5, "attempts": 2, "error": "boom"},
+        {"sql": "same", "status": "unchanged", "seconds": 0.0, "attempts": 0},
+    ]
+
+    summary = execution_summary(results, slowest=2)
+
+    assert (summary["statements"], summary["executed"], summary["failed"], summary["unchanged"]) == (22, 20, 1, 1)
+    assert summary["retried"] == 1
+    assert (summary["p50_seconds"], summary["p95_seconds"], summary["max_seconds"]) == (10.0, 19.0, 20.0)
+    assert [row["sql"] for row in summary["slowest"]] == ["s20", "s19"]
+    assert execution_summary([])["p50_seconds"] is None
@@ -0,0 +1,64 @@
+import pytest
+
+from pyspark_opendic.patterns.opendic_dispatcher import opendic_head
+from pyspark_opendic.patterns.opendic_patterns import OpenDicPatterns
+
+STATEMENTS = [
+    'CREATE OPEN function my_function PROPS { "language": "sql" }',
+    "CREATE OR REPLACE TEMPORARY OPEN function my_function AS my_alias",
+    "create or replace open batch my_function",
+    'CREATE OPEN BATCH function OBJECTS [{ "name": "f1" }]',
+    "CREATE OPEN batch my_function",
+    'ALTER OPEN function my_function PROPS { "version": "2.0" }',
+    "SHOW OPEN TYPES",
+    "SHOW OPEN PLATFORMS",
+    "SHOW OPEN PLATFORMS FOR function",
+    "SHOW OPEN functions",
+    "SHOW OPEN mapping",
+    "SHOW OPEN MAPPING function PLATFORM spark",
+    "SHOW OPEN MAPPINGS FOR spark",
+    "SHOW OPEN MAPPING FOR spark",
+    "SYNC OPEN function FOR spark",
+    "SYNC OPEN OBJECTS FOR spark",
+    'DEFINE OPEN function PROPS { "language": "string" }',
+    "DEFINE OPEN function",
+    "DROP OPEN function",
+    "DROP OPEN MAPPINGS FOR spark",
+    'ADD OPEN MAPPING function PLATFORM spark SYNTAX { "CREATE {name}" } PROPS { "def": {} }',
+    # Native Spark SQL and near misses
+    "SELECT * FROM open",
+    "CREATE TABLE open (id INT)",
+    "SHOW TABLES",
+    "SHOW OPEN",
+    "SHOW OPEN function;",
+    "show open platforms for",
+    "",
+]
+
+
+def sequential_dispatch(sql_cleaned):
+    for command_type, pattern in OpenDicPatterns.compiled_patterns():
+        match = pattern.match(sql_cleaned)
+        if match:
+            return command_type
+    return None
+
+
+@pytest.mark.parametrize("statement", STATEMENTS)
+def test_head_never_rejects_a_statement_a_grammar_rule_matches(statement):
+    if sequential_dispatch(statement) is not None:
+        assert opendic_head(statement) is not None
+
+
+@pytest.mark.parametrize("statement", ["SELECT 1", "INSERT INTO t VALUES (1)", "CREATE TABLE t (id INT)", "DROP TABLE t", ""])
+def test_native_sql_has_no_opendic_head(statement):
+    assert opendic_head(statement) is None
+
+
+@pytest.mark.parametrize("statement, head", [
+    ("SYNC OPEN function FOR spark", ("sync", "function")),
+    ("create or replace temporary open batch f", ("create", "batch")),
+    ("SHOW OPEN", ("show", None)),
+])
+def test_head_is_the_verb_and_the_word_after_open(statement, head):
+    assert opendic_head(statement) == head
@@ -0,0 +1,156 @@
+import json
+import time
+
+import pytest
+
+from pyspark_opendic.patterns.opendic_parser import (
+    AddMappingCommand,
+    AlterBatchCommand,
+    AlterCommand,
+    CreateBatchCommand,
+    CreateCommand,
+    DefineCommand,
+    DropBatchCommand,
+    DropCommand,
+    DropMappingForPlatformCommand,
+    OpenDicParser,
+    OpenDicSyntaxError,
+    ShowCommand,
+    ShowMappingCommand,
+    ShowMappingsForPlatformCommand,
+    ShowPlatformsCommand,
+    ShowPlatformsForObjectCommand,
+    ShowTypesCommand,
+    SyncAllCommand,
+    SyncCommand,
+    SyncManyCommand,
+)
+
+
+@pytest.fixture
+def parser():
+    return OpenDicParser()
+
+
+@pytest.mark.parametrize("statement, expected", [
+    ('CREATE OPEN function my_function PROPS { "language": "sql" }',
+     CreateCommand(object_type="function", name="my_function", properties={"language": "sql"})),
+    ("create or replace temporary open function f if not exists as f_alias",
+     CreateCommand(object_type="function", name="f", alias="f_alias")),
+    ("CREATE OPEN batch my_function", CreateCommand(object_type="batch", name="my_function")),
+    ('CREATE OPEN BATCH function OBJECTS [{ "name": "f1", "language": "sql" }, { "name": "f2" }]',
+     CreateBatchCommand(object_type="function", objects=[{"name": "f1", "language": "sql"}, {"name": "f2"}])),
+    ('CREATE OR REPLACE OPEN BATCH function OBJECTS [{ "name": "f1" }]',
+     CreateBatchCommand(object_type="function", objects=[{"name": "f1"}], upsert=True)),
+    ('ALTER OPEN BATCH function OBJECTS [{ "name": "f1", "language": "python" }]',
+     AlterBatchCommand(object_type="function", objects=[{"name": "f1", "language": "python"}])),
+    ('DROP OPEN BATCH function OBJECTS ["f1", {"name": "f2"}]', DropBatchCommand(object_type="function", names=["f1", "f2"])),
+    ("DROP OPEN batch", DropCommand(object_type="batch")),
+    ('ALTER OPEN function f PROPS {"version": "2.0"}', AlterCommand(object_type="function", name="f", properties={"version": "2.0"})),
+    ("SHOW OPEN TYPES", ShowTypesCommand()),
+    ("SHOW OPEN PLATFORMS", ShowPlatformsCommand()),
+    ("SHOW OPEN PLATFORMS FOR function", ShowPlatformsForObjectCommand(object_type="function")),
+    ("SHOW OPEN functions", ShowCommand(object_type="functions")),
+    ("SHOW OPEN mapping", ShowCommand(object_type="mapping")),
+    ("SHOW OPEN MAPPING function PLATFORM spark", ShowMappingCommand(object_type="function", platform="spark")),
+    ("SHOW OPEN MAPPINGS FOR spark", ShowMappingsForPlatformCommand(platform="spark")),
+    ("SYNC OPEN function FOR Spark", SyncCommand(object_type="function", platform="Spark")),
+    ("SYNC OPEN OBJECTS FOR spark", SyncAllCommand(platform="spark")),
+    ("SYNC OPEN function FOR spark FULL", SyncCommand(object_type="function", platform="spark", full=True)),
+    ("SYNC OPEN OBJECTS FOR spark full", SyncAllCommand(platform="spark", full=True)),
+    ("SYNC OPEN OBJECTS FOR spark, snowflake", SyncManyCommand(object_types=(None,), platforms=("spark", "snowflake"))),
+    ("SYNC OPEN function FOR spark FULL PLAN", SyncCommand(object_type="function", platform="spark", full=True, plan=True)),
+    ("SYNC OPEN OBJECTS FOR spark PLAN", SyncAllCommand(platform="spark", plan=True)),
+    ("SYNC OPEN function ,view FOR spark FULL", SyncManyCommand(object_types=("function", "view"), platforms=("spark",), full=True)),
+    ('DEFINE OPEN function PROPS {"language": "string"}', DefineCommand(udo_type="function", properties={"language": "string"})),
+    ("DEFINE OPEN function", DefineCommand(udo_type="function")),
+    ("DROP OPEN function", DropCommand(object_type="function")),
+    ("DROP OPEN MAPPING FOR spark", DropMappingForPlatformCommand(platform="spark")),
+])
+def test_parse_commands(parser, statement, expected):
+    assert parser.parse(statement) == expected
+
+
+@pytest.mark.parametrize("statement, expected", [
+    ('CREATE OPEN function f PROPS {"a": "b"};', CreateCommand(object_type="function", name="f", properties={"a": "b"})),
+    ("DROP OPEN function ; \n", DropCommand(object_type="function")),
+    ("SHOW OPEN MAPPING;", ShowCommand(object_type="MAPPING")),
+    ("SYNC OPEN OBJECTS FOR spark FULL;", SyncAllCommand(platform="spark", full=True)),
+])
+def test_trailing_semicolon_is_accepted(parser, statement, expected):
+    assert parser.parse(statement) == expected
+
+
+@pytest.mark.parametrize("statement", ["DROP OPEN function;;", "DROP OPEN function; DROP OPEN view", "SHOW OPEN ;"])
+def test_only_one_trailing_semicolon_ends_a_statement(parser, statement):
+    with pytest.raises(OpenDicSyntaxError):
+        parser.parse(statement)
+
+
+def test_parse_add_mapping_keeps_template_placeholders(parser):
+    statement = """ADD OPEN MAPPING function PLATFORM spark
+    SYNTAX { "CREATE FUNCTION {name} ({params}) AS $$ {def} $$" }
+    PROPS { "params": { "propType": "list", "format": "<item>", "delimiter": ", " } }"""
+
+    command = parser.parse(statement)
+
+    assert command == AddMappingCommand(
+        object_type="function", platform="spark",
+        syntax="CREATE FUNCTION {name} ({params}) AS $$ {def} $$",
+        object_dump_map={"params": {"propType": "list", "format": "<item>", "delimiter": ", "}},
+    )
+    unquoted = parser.parse('ADD OPEN MAPPING function PLATFORM spark SYNTAX { CREATE {name} } PROPS {}')
+    assert unquoted.syntax == "CREATE {name}"
+
+
+@pytest.mark.parametrize("statement", ["SELECT * FROM open", "CREATE TABLE t (id INT)", "SHOW TABLES", ""])
+def test_native_sql_parses_to_none(parser, statement):
+    assert parser.parse(statement) is None
+
+
+def test_syntax_error_reports_position(parser):
+    with pytest.raises(OpenDicSyntaxError) as error:
+        parser.parse("SHOW OPEN MAPPING function\n  PLATFORMX spark")
+
+    assert (error.value.line, error.value.column) == (2, 3)
+    assert "Expected PLATFORM" in str(error.value)
+
+
+def test_json_error_reports_absolute_position(parser):
+    statement = 'CREATE OPEN function f PROPS { "language" "sql" }'
+
+    with pytest.raises(json.JSONDecodeError) as error:
+        parser.parse(statement)
+
+    assert error.value.pos == statement.index('"sql"')
+
+
+def test_batch_item_without_name_is_rejected(parser):
+    with pytest.raises(OpenDicSyntaxError) as error:
+        parser.parse('CREATE OPEN BATCH function OBJECTS [{"name": "f1"}, {"language": "sql"}]')
+
+    assert "item 1" in str(error.value)
+
+
+def test_sync_objects_cannot_be_combined_with_types(parser):
+    with pytest.raises(OpenDicSyntaxError, match="OBJECTS"):
+        parser.parse("SYNC OPEN OBJECTS, function FOR spark")
+
+
+def test_drop_batch_rejects_non_names(parser):
+    with pytest.raises(OpenDicSyntaxError, match="item 1"):
+        parser.parse('DROP OPEN BATCH function OBJECTS ["f1", 2]')
+
+
+def test_large_and_malformed_batches_parse_in_linear_time(parser):
+    objects = [{"name": f"f{i}", "definition": "SELECT " + "x" * 100} for i in range(20000)]
+    statement = "CREATE OPEN BATCH function OBJECTS " + json.dumps(objects)
+
+    start = time.perf_counter()
+    command = parser.parse(statement)
+    assert len(command.objects) == 20000
+
+    # Unterminated JSON used to make the [\s\S]* patterns backtrack over the whole text
+    with pytest.raises(json.JSONDecodeError):
+        parser.parse('CREATE OPEN function f PROPS {"a": "' + "}" * 200000)
+    assert time.perf_counter() - start < 2
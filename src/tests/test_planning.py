@@ -0,0 +1,28 @@
+from pyspark_opendic.planning import CREATE, NO_OP, REPLACE, plan_statements
+
+
+def test_plan_actions():
+    existing = {"function": {"f_old", "f_keep"}, "table": {"v_old"}}
+    listed = []
+
+    def list_existing(kind):
+        listed.append(kind)
+        return existing[kind]
+
+    sql_texts = [
+        "CREATE OR REPLACE FUNCTION f_new AS 'SELECT 1'",
+        "CREATE OR REPLACE FUNCTION f_old AS 'SELECT 2'",
+        "CREATE FUNCTION IF NOT EXISTS f_keep AS 'SELECT 3'",
+        "CREATE OR REPLACE VIEW v_old AS SELECT 1",
+        "CREATE OR REPLACE FUNCTION f_new AS 'SELECT 1'",
+        "CREATE OR REPLACE FUNCTION f_applied AS 'SELECT 4'",
+        "SET spark.sql.ansi.enabled = true",
+    ]
+
+    plan = plan_statements(sql_texts, list_existing, "function", "spark", unchanged=lambda sql_text: "f_applied" in sql_text)
+
+    assert [statement.action for statement in plan.statements] == [CREATE, REPLACE, NO_OP, REPLACE, NO_OP, NO_OP, CREATE]
+    assert plan.statements[4].reason == "duplicate of an earlier statement"
+    assert plan.delta == [sql_texts[0], sql_texts[1], sql_texts[3], sql_texts[6]]
+    assert plan.summary() == {"statements": 7, CREATE: 2, REPLACE: 2, NO_OP: 3}
+    assert sorted(listed) == ["function", "table"]
@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pyspark_opendic.model.openapi_models import PlatformMapping, PlatformMappingObjectDumpMapValue
+from pyspark_opendic.rendering import MappingCache, MappingRenderer, render_prop
+
+MAPPING = {
+    "typeName": "function",
+    "platformName": "spark",
+    "syntax": "CREATE OR REPLACE FUNCTION {name}({args}) RETURNS {return_type} LANGUAGE {language} {unknown} AS $$ {def} $$",
+    "objectDumpMap": {
+        "args": {"propType": "map", "format": "<key> <value>", "delimiter": ", "},
+        "def": {"propType": "string", "format": "<value>", "delimiter": ""},
+        "language": {"propType": "string", "format": "<value>", "delimiter": ""},
+    },
+}
+
+
+def dump(prop_type, format, delimiter=""):
+    return PlatformMappingObjectDumpMapValue(propType=prop_type, format=format, delimiter=delimiter)
+
+
+@pytest.mark.parametrize("value, dump_value, rendered", [
+    (["a", "b"], dump("list", "'<item>'", ", "), "'a', 'b'"),
+    ("a", dump("list", "<item>", ", "), "a"),
+    ({"x": "INT", "y": "STRING"}, dump("map", "<key> <value>", ", "), "x INT, y STRING"),
+    (True, dump("boolean", "<value>"), "true"),
+    (3, dump("number", "v=<value>"), "v=3"),
+])
+def test_render_prop(value, dump_value, rendered):
+    assert render_prop(value, dump_value) == rendered
+
+
+def test_renderer_fills_the_syntax_template():
+    renderer = MappingRenderer(PlatformMapping.model_validate(MAPPING))
+    udo = {"type": "function", "name": "add", "props": {"args": {"a": "INT", "b": "INT"}, "def": "a + b", "return_type": "INT"}}
+
+    assert renderer.render(udo) == "CREATE OR REPLACE FUNCTION add(a INT, b INT) RETURNS INT LANGUAGE  {unknown} AS $$ a + b $$"
+
+
+def test_mapping_cache_fetches_once_and_round_trips_to_disk(tmp_path):
+    client = MagicMock()
+    client.get.return_value = {"platformMapping": MAPPING}
+    cache = MappingCache(client)
+
+    assert cache.renderer("function", "Spark") is cache.renderer("FUNCTION", "spark")
+    client.get.assert_called_once_with("/objects/function/platforms/spark")
+
+    cache.save(str(tmp_path / "mappings.json"))
+    offline = MappingCache()
+    assert offline.load(str(tmp_path / "mappings.json")) == 1
+    assert offline.renderer("function", "spark").mapping.syntax == MAPPING["syntax"]
+
+    cache.invalidate("spark")
+    with pytest.raises(KeyError):
+        MappingCache().renderer("function", "spark")
+
+
+def test_preload_caches_every_mapping_of_a_platform():
+    client = MagicMock()
+    client.get.return_value = [MAPPING, dict(MAPPING, typeName="view", syntax="CREATE VIEW {name} AS {query}")]
+    cache = MappingCache(client)
+
+    assert cache.preload("spark") == 2
+    cache.renderer("view", "spark")
+    client.get.assert_called_once_with("/platforms/spark")
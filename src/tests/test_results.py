@@ -0,0 +1,93 @@
+import json
+import sys
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from pyspark_opendic import results
+from pyspark_opendic.results import LazyResult, configure_pandas_display, rows_to_arrow, rows_to_spark
+
+ROWS = [
+    {"name": "f0", "props": {"language": "sql", "args": {"x": "int"}}},
+    {"name": "f1", "props": {"language": "python"}},
+]
+
+
+def test_pandas_display_options_are_set_once(monkeypatch):
+    monkeypatch.setattr(results, "_pandas_display_configured", False)
+
+    with patch("pandas.set_option") as set_option:
+        configure_pandas_display()
+        configure_pandas_display()
+
+    assert set_option.call_count == 4
+
+
+def test_missing_pyarrow_is_reported(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        rows_to_arrow(ROWS)
+
+
+def test_rows_to_arrow_keeps_nested_objects():
+    pytest.importorskip("pyarrow")
+
+    table = rows_to_arrow(ROWS)
+
+    assert table.column_names == ["name", "props"]
+    assert table.to_pylist()[1]["props"]["language"] == "python"
+
+
+def test_rows_to_arrow_falls_back_to_json_for_mixed_types():
+    pytest.importorskip("pyarrow")
+
+    table = rows_to_arrow([{"name": "a", "args": "x int"}, {"name": "b", "args": {"x": "int"}}])
+
+    assert table.column("args").to_pylist() == ["x int", '{"x": "int"}']
+
+
+@patch("pyspark.__version__", "4.0.0")
+def test_rows_to_spark_passes_an_arrow_table():
+    pa = pytest.importorskip("pyarrow")
+    spark = MagicMock()
+
+    rows_to_spark(spark, ROWS)
+
+    assert isinstance(spark.createDataFrame.call_args.args[0], pa.Table)
+
+
+@patch("pyspark.__version__", "3.5.5")
+def test_spark_3_goes_through_pandas_and_restores_the_arrow_setting():
+    pytest.importorskip("pyarrow")
+    spark = MagicMock()
+    spark.conf.get.return_value = "false"
+
+    rows_to_spark(spark, ROWS)
+
+    frame = spark.createDataFrame.call_args.args[0]
+    assert isinstance(frame, pd.DataFrame) and list(frame["name"]) == ["f0", "f1"]
+    assert spark.createDataFrame.call_args.kwargs["schema"].fieldNames() == list(frame.columns)
+    assert spark.conf.set.call_args_list[-1].args == ("spark.sql.execution.arrow.pyspark.enabled", "false")
+
+
+def test_lazy_result_builds_each_representation_once():
+    built = []
+
+    def build_frame():
+        built.append("frame")
+        return pd.DataFrame(ROWS)
+
+    result = LazyResult(ROWS, build_frame=build_frame)
+    assert built == [] and len(result) == 2
+
+    assert result.to_pandas() is result.to_pandas()
+    assert "f1" in repr(result) and "<table" in result._repr_html_()
+    assert built == ["frame"]
+    assert json.loads(result.to_json()) == ROWS
+
+
+def test_lazy_result_without_a_session_cannot_build_spark_dataframes():
+    with pytest.raises(ValueError, match="Spark session"):
+        LazyResult(ROWS).to_spark()
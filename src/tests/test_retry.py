@@ -0,0 +1,99 @@
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from pyspark_opendic.client import OpenDicClient
+from pyspark_opendic.retry import RetryPolicy
+
+MOCK_API_URL = "https://mock-api-url.com"
+
+
+def make_response(status_code, body=None, headers=None):
+    """Build a real requests.Response so raise_for_status() behaves as in production."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body if body is not None else {}).encode()
+    response.headers.update(headers or {})
+    response.url = MOCK_API_URL
+    return response
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def client(sleeps):
+    tokens = iter([{"access_token": f"token-{i}", "expires_in": 3600} for i in range(1, 10)])
+    policy = RetryPolicy(max_attempts=3, jitter=False, sleep=sleeps.append)
+    with patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', side_effect=lambda credentials: next(tokens)):
+        yield OpenDicClient(MOCK_API_URL, "s:s", share_token=False, retry_policy=policy)
+
+
+def test_get_is_retried_and_returns_retried_result(client, sleeps):
+    client.session.request = Mock(side_effect=[make_response(503), make_response(200, {"objects": []})])
+
+    assert client.get("/objects") == {"objects": []}
+    assert client.session.request.call_count == 2
+    assert sleeps == [0.2]
+
+
+def test_retry_after_header_is_honored(client, sleeps):
+    client.session.request = Mock(side_effect=[make_response(429, headers={"Retry-After": "2"}), make_response(200, {"ok": True})])
+
+    assert client.delete("/objects/function") == {"ok": True}
+    assert sleeps == [2.0]
+
+
+def test_retry_after_longer_than_limit_gives_up(client, sleeps):
+    client.session.request = Mock(return_value=make_response(503, headers={"Retry-After": "3600"}))
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get("/objects")
+    assert client.session.request.call_count == 1
+    assert sleeps == []
+
+
+def test_attempts_are_capped_with_exponential_backoff(client, sleeps):
+    client.session.request = Mock(return_value=make_response(503))
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.put("/objects/function/f", {})
+    assert client.session.request.call_count == 3
+    assert sleeps == [0.2, 0.4]
+
+
+def test_post_is_not_replayed_unless_marked_safe(client, sleeps):
+    client.session.request = Mock(side_effect=[make_response(503), make_response(200, {"ok": True})])
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.post("/objects/function", {})
+    assert client.session.request.call_count == 1
+
+    client.session.request = Mock(side_effect=[make_response(503), make_response(200, {"ok": True})])
+    assert client.post("/objects/function", {}, replay_safe=True) == {"ok": True}
+
+
+def test_connection_errors_are_retried_for_idempotent_calls(client, sleeps):
+    client.session.request = Mock(side_effect=[requests.exceptions.ConnectionError(), make_response(200, {"ok": True})])
+
+    assert client.get("/platforms") == {"ok": True}
+    assert len(sleeps) == 1
+
+
+def test_401_reauthenticates_once(client):
+    client.session.request = Mock(side_effect=[make_response(401), make_response(200, {"ok": True})])
+
+    # A POST is replayed too: a 401 means the request was never processed
+    assert client.post("/objects/function", {}) == {"ok": True}
+    first_auth = client.session.request.call_args_list[0].kwargs["headers"]["Authorization"]
+    second_auth = client.session.request.call_args_list[1].kwargs["headers"]["Authorization"]
+    assert (first_auth, second_auth) == ("Bearer token-1", "Bearer token-2")
+
+    client.session.request = Mock(return_value=make_response(401))
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get("/objects")
+    assert client.session.request.call_count == 2
+
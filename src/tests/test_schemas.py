@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from pyspark_opendic.schemas import SchemaCache, TypeSchema
+
+OBJECTS = [
+    {"type": "function", "name": "f0", "entityVersion": 1,
+     "props": {"language": "sql", "arity": 2, "cost": "1.5", "pure": "true", "released": "2024-05-01", "args": {"x": "int"}}},
+    {"type": "function", "name": "f1", "entityVersion": 3,
+     "props": {"language": "python", "arity": "3", "pure": False, "released": "not a date", "owner": "ann"}},
+]
+
+SCHEMA = TypeSchema("function", {"language": "string", "arity": "int", "cost": "double", "pure": "boolean",
+                                 "released": "date", "args": "map"})
+
+
+def test_props_are_flattened_into_typed_columns():
+    frame = SCHEMA.project(OBJECTS)
+
+    assert list(frame.columns) == ["type", "name", "entityVersion", "language", "arity", "cost", "pure", "released", "args", "owner"]
+    assert str(frame["entityVersion"].dtype) == "Int64"
+    assert frame["arity"].tolist() == [2, 3] and str(frame["arity"].dtype) == "Int64"
+    assert frame["cost"].iloc[0] == 1.5 and frame["cost"].isna().iloc[1]
+    assert frame["pure"].tolist() == [True, False]
+    assert frame["released"].iloc[0] == pd.Timestamp("2024-05-01") and pd.isna(frame["released"].iloc[1])
+    assert frame["args"].iloc[0] == {"x": "int"}
+    assert frame["owner"].tolist() == [None, "ann"]
+
+
+def test_props_named_like_object_fields_do_not_overwrite_them():
+    frame = TypeSchema("t", {"name": "string"}).project([{"name": "a", "props": {"name": "display name"}}])
+
+    assert frame[["name", "props.name"]].values.tolist() == [["a", "display name"]]
+
+
+def test_no_objects_gives_the_declared_columns():
+    assert list(SCHEMA.project([]).columns) == ["language", "arity", "cost", "pure", "released", "args"]
+
+
+def test_cache_finds_plural_types_and_preloads_from_the_server():
+    client = MagicMock()
+    client.get.return_value = {"objects": [
+        {"udoType": "Function", "properties": {"language": "string"}},
+        {"type": "table", "schema": '{"rows": "int"}'},
+        {"type": "view", "schema": "{schema}"},
+    ]}
+    cache = SchemaCache(client)
+
+    assert cache.preload() == 2
+    assert cache.get("functions").properties == {"language": "string"}
+    assert cache.get("TABLE").properties == {"rows": "int"}
+
+    cache.invalidate("function")
+    assert cache.get("function") is None and cache.get("table") is not None
+
+
+def test_check_reports_props_of_the_wrong_type():
+    problems = SCHEMA.check({"language": 1, "arity": True, "cost": 2, "pure": "yes", "released": "2024-13-01",
+                             "args": {"x": "int"}, "undeclared": object(), "owner": None})
+
+    assert problems == [
+        "prop 'language' must be string, not int 1",
+        "prop 'arity' must be int, not bool True",
+        "prop 'pure' must be boolean, not str 'yes'",
+        "prop 'released' must be date, not str '2024-13-01'",
+    ]
+    assert SCHEMA.check(None) == [] and SCHEMA.check({"released": "2024-05-01T10:00:00"}) == []
@@ -0,0 +1,64 @@
+import json
+
+import pandas as pd
+import pytest
+
+from pyspark_opendic.sources import iter_records, records_to_udos
+
+
+def test_pandas_rows_drop_null_props():
+    df = pd.DataFrame({"name": ["a", "b"], "language": ["sql", None], "version": [1.0, float("nan")]})
+
+    udos = list(records_to_udos(iter_records(df, batch_size=1), "function"))
+
+    assert udos[0]["name"] == "a" and udos[0]["props"] == {"language": "sql", "version": 1.0}
+    assert udos[1]["props"] == {}
+    assert all(udo["type"] == "function" for udo in udos)
+
+
+def test_jsonl_file(tmp_path):
+    path = tmp_path / "objects.jsonl"
+    path.write_text("\n".join(json.dumps({"name": f"f{i}", "language": "sql"}) for i in range(3)) + "\n\n")
+
+    udos = list(records_to_udos(iter_records(path), "function", props_cols=["language"]))
+
+    assert [udo["name"] for udo in udos] == ["f0", "f1", "f2"]
+    assert udos[0]["props"] == {"language": "sql"}
+
+
+def test_iterable_of_dicts_with_custom_name_column():
+    rows = iter([{"fn": "x", "definition": "SELECT 1"}])
+
+    (udo,) = records_to_udos(iter_records(rows), "function", name_col="fn")
+
+    assert (udo["name"], udo["props"]) == ("x", {"definition": "SELECT 1"})
+
+
+def test_missing_name_raises():
+    with pytest.raises(ValueError, match="Row 1"):
+        list(records_to_udos([{"name": "a"}, {"name": None}], "function"))
+
+
+def test_unsupported_file_type_raises(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        list(iter_records(tmp_path / "objects.csv"))
+
+
+def test_array_and_decimal_cells_become_json_values():
+    import decimal
+
+    import numpy as np
+
+    df = pd.DataFrame({
+        "name": ["a", "b"],
+        "tags": [np.array(["x", "y"]), np.array([], dtype=object)],
+        "args": [{"sizes": np.array([1, 2])}, None],
+        "price": [decimal.Decimal("1.50"), decimal.Decimal("3")],
+        "count": np.array([1, 2], dtype=np.int64),
+    })
+
+    udos = list(records_to_udos(iter_records(df), "function"))
+
+    assert udos[0]["props"] == {"tags": ["x", "y"], "args": {"sizes": [1, 2]}, "price": 1.5, "count": 1}
+    assert udos[1]["props"] == {"tags": [], "price": 3, "count": 2}
+    json.dumps(udos)
@@ -0,0 +1,109 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from pyspark_opendic.client import OpenDicClient
+from pyspark_opendic.retry import RetryPolicy
+from pyspark_opendic.streaming import JsonArrayDecoder, iter_json_array
+
+ITEMS = [
+    {"definition": "CREATE FUNCTION f(x) AS 'a \\\" ] } , [ {'\n" + "é" * i, "nested": [1, {"a": "]\\\\"}]}
+    for i in range(20)
+] + [1, "x", None, [], {}]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+def test_items_are_decoded_across_any_chunk_boundary(chunk_size):
+    raw = json.dumps(ITEMS, ensure_ascii=False).encode()
+
+    assert list(iter_json_array(raw[i:i + chunk_size] for i in range(0, len(raw), chunk_size))) == ITEMS
+
+
+def test_items_are_yielded_as_soon_as_they_are_complete():
+    decoder = JsonArrayDecoder()
+
+    assert decoder.feed(' [{"definition": "a"}, {"defin') == [{"definition": "a"}]
+    assert decoder.feed('ition": "b"}') == []
+    assert decoder.feed("]") == [{"definition": "b"}]
+    assert decoder.done
+
+
+def test_long_item_is_joined_once_when_complete():
+    decoder = JsonArrayDecoder()
+    pieces = ['["SELECT \\', "", '"', " 1", '"', "]"]
+
+    assert [decoder.feed(piece) for piece in pieces[:-1]] == [[]] * 5
+    assert decoder._pending == ['"SELECT \\', '"', " 1", '"']
+    assert decoder.feed(pieces[-1]) == ['SELECT " 1']
+    assert decoder._pending == []
+
+
+@pytest.mark.parametrize("raw", [b"[1,]", b"[,1]", b"[1", b'{"a": 1}', b"[1] 2", b'["unterminated'])
+def test_malformed_arrays_are_rejected(raw):
+    with pytest.raises(ValueError):
+        list(iter_json_array([raw]))
+
+
+def test_empty_array():
+    assert list(iter_json_array([b" [ ", b"] "])) == []
+
+
+# ---- Streaming GET against a local stand-in server ----
+
+class SlowPullHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    release = threading.Event()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._chunk(b'[{"definition": "first"},')
+        # The rest of the body is only sent once the client has seen the first item
+        SlowPullHandler.release.wait(5)
+        self._chunk(b'{"definition": "second"}]')
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def slow_server():
+    SlowPullHandler.release.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowPullHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    SlowPullHandler.release.set()
+    server.shutdown()
+
+
+@patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "token", "expires_in": 3600})
+def test_stream_get_yields_items_before_the_body_is_complete(mock_token, slow_server):
+    with OpenDicClient(slow_server, "s:s", share_token=False) as client:
+        items = client.stream_get("/platforms/spark/pull", chunk_size=16)
+
+        assert next(items) == {"definition": "first"}
+        SlowPullHandler.release.set()
+        assert list(items) == [{"definition": "second"}]
+
+
+@patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "token", "expires_in": 3600})
+def test_stream_get_raises_http_errors_before_iterating(mock_token):
+    client = OpenDicClient("http://localhost:8181", "s:s", share_token=False, retry_policy=RetryPolicy(max_attempts=1))
+    error_response = requests.Response()
+    error_response.status_code = 404
+    client.session.request = Mock(return_value=error_response)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.stream_get("/platforms/spark/pull")
+    client.session.request.assert_called_once()
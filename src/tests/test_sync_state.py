@@ -0,0 +1,28 @@
+from pyspark_opendic.sync_state import SyncState, is_session_scoped, statement_hash
+
+
+def test_watermark_round_trip_per_type_and_platform(tmp_path):
+    state = SyncState(str(tmp_path / "state"), "https://polaris")
+
+    state.save("function", "spark", {statement_hash("a"), statement_hash("b")})
+
+    assert state.load("FUNCTION", "Spark") == {statement_hash("a"), statement_hash("b")}
+    assert state.load(None, "spark") == set()
+    assert SyncState(str(tmp_path / "state"), "https://other").load("function", "spark") == set()
+
+    state.clear("function", "spark")
+    assert state.load("function", "spark") == set()
+
+
+def test_unreadable_watermark_means_full_sync(tmp_path):
+    state = SyncState(str(tmp_path), "https://polaris")
+    with open(state.path_for("function", "spark"), "w") as f:
+        f.write("{not json")
+
+    assert state.load("function", "spark") == set()
+
+
+def test_session_scoped_statements():
+    assert is_session_scoped("CREATE OR REPLACE TEMPORARY FUNCTION f AS 'x'")
+    assert is_session_scoped("create global temp view v as select 1")
+    assert not is_session_scoped("CREATE OR REPLACE FUNCTION temporary_f AS 'x'")
@@ -0,0 +1,140 @@
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from pyspark_opendic.client import OpenDicClient
+from pyspark_opendic.token_manager import TokenManager
+
+MOCK_API_URL = "https://mock-api-url.com"
+
+
+def counting_fetcher(expires_in=3600, delay=0.0):
+    """Returns a fetch function handing out token-1, token-2, ... and recording its calls."""
+    calls = []
+
+    def fetch():
+        time.sleep(delay)
+        calls.append(1)
+        return {"access_token": f"token-{len(calls)}", "expires_in": expires_in}
+
+    return fetch, calls
+
+
+def test_token_is_fetched_lazily_and_reused():
+    fetch, calls = counting_fetcher()
+    manager = TokenManager(fetch, background_refresh=False)
+
+    assert calls == []
+    assert manager.get_token() == "token-1"
+    assert manager.get_token() == "token-1"
+    assert len(calls) == 1
+
+
+def test_token_close_to_expiry_is_refreshed():
+    fetch, calls = counting_fetcher(expires_in=3600)
+    manager = TokenManager(fetch, refresh_margin=60, background_refresh=False)
+
+    assert manager.get_token() == "token-1"
+    manager._expires_at = time.time() + 30  # Now inside the refresh margin
+    assert manager.get_token() == "token-2"
+
+
+def test_token_shorter_lived_than_the_margin_is_reused():
+    # expires_in is inside the refresh margin, which is capped to half the token's lifetime
+    fetch, calls = counting_fetcher(expires_in=30)
+    manager = TokenManager(fetch, refresh_margin=60)
+
+    assert [manager.get_token() for _ in range(100)] == ["token-1"] * 100
+    time.sleep(0.2)
+    assert len(calls) == 1
+    manager.invalidate()
+
+
+def test_background_refresh_of_an_expiring_token_waits_the_minimum_delay():
+    fetch, calls = counting_fetcher(expires_in=0)
+    manager = TokenManager(fetch, min_refresh_delay=0.1)
+
+    manager.get_token()
+    time.sleep(0.25)
+    assert 2 <= len(calls) <= 4
+    manager.invalidate()
+
+
+def test_background_refresh_replaces_token_before_expiry():
+    fetch, calls = counting_fetcher(expires_in=0.2)
+    manager = TokenManager(fetch, refresh_margin=0.1, min_refresh_delay=0.0)
+
+    assert manager.get_token() == "token-1"
+    time.sleep(0.3)
+    assert len(calls) >= 2
+    manager.invalidate()
+
+
+def test_concurrent_callers_share_one_fetch():
+    fetch, calls = counting_fetcher(delay=0.05)
+    manager = TokenManager(fetch, background_refresh=False)
+
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(manager.get_token())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert set(tokens) == {"token-1"}
+
+
+def test_refresh_with_stale_token_skips_duplicate_fetch():
+    fetch, calls = counting_fetcher()
+    manager = TokenManager(fetch, background_refresh=False)
+
+    stale = manager.get_token()
+    assert manager.refresh(stale_token=stale) == "token-2"
+    # A second caller that saw the same rejected token gets the already refreshed one
+    assert manager.refresh(stale_token=stale) == "token-2"
+    assert len(calls) == 2
+
+
+def test_disk_cache_is_shared_between_managers(tmp_path):
+    cache_file = TokenManager.cache_file_for(str(tmp_path), MOCK_API_URL, "client")
+    _, credentials_hash = TokenManager.credentials_key(MOCK_API_URL, "client:secret")
+
+    fetch, calls = counting_fetcher()
+    first = TokenManager(fetch, background_refresh=False, cache_file=cache_file, credentials_hash=credentials_hash)
+    assert first.get_token() == "token-1"
+
+    other_fetch = Mock()
+    second = TokenManager(other_fetch, background_refresh=False, cache_file=cache_file, credentials_hash=credentials_hash)
+    assert second.get_token() == "token-1"
+    other_fetch.assert_not_called()
+
+    # A cache file written for other credentials is ignored
+    _, other_hash = TokenManager.credentials_key(MOCK_API_URL, "client:other-secret")
+    third = TokenManager(lambda: {"access_token": "own-token"}, background_refresh=False, cache_file=cache_file, credentials_hash=other_hash)
+    assert third.get_token() == "own-token"
+
+
+def test_clients_with_same_credentials_share_a_token():
+    with patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "shared", "expires_in": 3600}) as mock_fetch:
+        first = OpenDicClient(MOCK_API_URL, "shared-id:secret")
+        second = OpenDicClient(MOCK_API_URL, "shared-id:secret")
+
+        assert first.token_manager is second.token_manager
+        assert first.oauth_token == second.oauth_token == "shared"
+        assert mock_fetch.call_count == 1
+
+
+def test_shared_manager_does_not_keep_the_first_client_alive():
+    import gc
+    import weakref
+
+    with patch('pyspark_opendic.client.OpenDicClient.request_oauth_token', return_value={"access_token": "t", "expires_in": 3600}):
+        first = OpenDicClient(MOCK_API_URL, "weak-id:secret")
+        first.oauth_token
+        manager, first_ref = first.token_manager, weakref.ref(first)
+        del first
+        gc.collect()
+
+        assert first_ref() is None
+        assert OpenDicClient(MOCK_API_URL, "weak-id:secret").token_manager is manager
@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock
+
+import requests
+
+from pyspark_opendic.batch import BatchUploader
+from pyspark_opendic.upsert import ObjectUpserter, content_hash
+
+
+def upserter(server_objects):
+    client = MagicMock()
+    client.get.return_value = server_objects
+    client.post.return_value = {}
+    client.put.return_value = {}
+    return ObjectUpserter(client, BatchUploader(client, chunk_size=2), max_in_flight=2), client
+
+
+def udo(name, **props):
+    return {"type": "function", "name": name, "props": props}
+
+
+def test_content_hash_ignores_key_order_and_empty_props():
+    assert content_hash({"a": 1, "b": {"c": 2, "d": 3}}) == content_hash({"b": {"d": 3, "c": 2}, "a": 1})
+    assert content_hash(None) == content_hash({})
+    assert content_hash({"a": 1}) != content_hash({"a": "1"})
+
+
+def test_plan_classifies_objects():
+    upsert, _ = upserter([udo("same", x=1), dict(udo("changed", x=1), entityVersion=4)])
+
+    plan = upsert.plan("function", [udo("same", x=1), udo("changed", x=2), udo("new")])
+
+    assert [item["name"] for item in plan.creates] == ["new"]
+    assert [name for name, _ in plan.updates] == ["changed"]
+    assert plan.updates[0][1]["udo"]["entityVersion"] == 4
+    assert plan.unchanged == ["same"]
+
+
+def test_last_occurrence_of_a_name_wins():
+    upsert, _ = upserter([udo("a", x=1)])
+
+    plan = upsert.plan("function", [udo("a", x=2), udo("a", x=1)])
+
+    assert (plan.creates, plan.updates, plan.unchanged) == ([], [], ["a"])
+
+
+def test_rerun_with_same_input_writes_nothing():
+    upsert, client = upserter([udo(f"f{i}", i=i) for i in range(5)])
+
+    report = upsert.upsert("function", (udo(f"f{i}", i=i) for i in range(5)))
+
+    assert report.summary() == {"created": 0, "updated": 0, "unchanged": 5, "failed": 0, "rejected": 0}
+    client.post.assert_not_called()
+    client.put.assert_not_called()
+
+
+def test_failed_update_is_reported_per_object():
+    upsert, client = upserter([udo("a"), udo("b")])
+
+    def put(endpoint, payload):
+        if endpoint.endswith("/a"):
+            raise requests.exceptions.HTTPError("409 Conflict")
+        return {}
+
+    client.put.side_effect = put
+
+    report = upsert.upsert("function", [udo("a", x=1), udo("b", x=1), udo("c")])
+
+    assert not report.succeeded
+    assert report.summary() == {"created": 1, "updated": 1, "unchanged": 0, "failed": 1, "rejected": 0}
+    rows = {row["name"]: row for row in report.object_rows()}
+    assert rows["a"]["status"] == "failed" and "409" in rows["a"]["error"]
+    assert rows["c"]["action"] == "create"